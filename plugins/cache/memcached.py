@@ -11,6 +11,7 @@ name: memcached
 short_description: Use memcached DB for cache
 description:
   - This cache uses JSON formatted, per host records saved in memcached.
+  - The records can optionally be compressed or stored as MessagePack, see O(_codec).
 requirements:
   - memcache (python lib)
 options:
@@ -44,19 +45,45 @@ options:
     ini:
       - key: fact_caching_timeout
         section: defaults
+  _codec:
+    description:
+      - Serialization format used for new cache entries.
+      - V(legacy) lets the memcached client pickle and compress the values, as earlier versions of this plugin did.
+      - V(json) stores compact JSON, V(zlib) and V(zstd) store compressed compact JSON, and V(msgpack) stores MessagePack.
+      - All formats except V(legacy) prefix each value with a version header. Entries are always read according to their header,
+        so changing this option does not invalidate existing cache entries.
+      - V(zstd) requires the C(zstandard) Python library, and V(msgpack) requires the C(msgpack) Python library.
+    type: string
+    default: legacy
+    choices:
+      - legacy
+      - json
+      - zlib
+      - zstd
+      - msgpack
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_CODEC
+    ini:
+      - key: fact_caching_codec
+        section: defaults
+    version_added: 12.2.0
 """
 
 import collections
 import os
 import time
+import zlib
 from multiprocessing import Lock
 from itertools import chain
 
 from ansible.errors import AnsibleError
+from ansible.module_utils.common.text.converters import to_bytes
 from collections.abc import MutableSet
 from ansible.plugins.cache import BaseCacheModule
 from ansible.utils.display import Display
 
+from ansible_collections.community.general.plugins.plugin_utils import cache_codec
+
 try:
     import memcache
 
@@ -140,40 +167,111 @@ class CacheModuleKeys(MutableSet):
     """
     A set subclass that keeps track of insertion time and persists
     the set in memcached.
+
+    The keys are spread by hash over BUCKETS memcached items, so adding or
+    removing a key only rewrites one small item instead of the whole set.
+    Buckets are updated with check-and-set, so that concurrent writers do
+    not lose each other's updates.
     """
 
     PREFIX = "ansible_cache_keys"
+    BUCKETS = 256
+    CAS_RETRIES = 20
 
-    def __init__(self, cache, *args, **kwargs):
+    def __init__(self, cache):
         self._cache = cache
-        self._keyset = dict(*args, **kwargs)
+        self._bucket_names = [f"{self.PREFIX}_{i}" for i in range(self.BUCKETS)]
+        self._buckets = {}
+        # oldest timestamp per bucket, so that expiry only has to look at the buckets
+        self._oldest = {}
+        self._refresh()
+
+        legacy = self._cache.get(self.PREFIX)
+        if legacy:
+            self._migrate(legacy)
+
+    def _migrate(self, legacy):
+        by_bucket = collections.defaultdict(dict)
+        for key, timestamp in legacy.items():
+            by_bucket[self._bucket_name(key)][key] = timestamp
+        for name, entries in by_bucket.items():
+            self._update_bucket(name, lambda bucket, entries=entries: bucket.update(entries))
+        self._cache.delete(self.PREFIX)
+
+    def _bucket_name(self, key):
+        return self._bucket_names[zlib.crc32(to_bytes(key)) % self.BUCKETS]
+
+    def _update_bucket(self, name, update):
+        """
+        Apply ``update`` to the dict stored in bucket ``name`` with check-and-set,
+        retrying when another writer changed the bucket in the meantime.
+        """
+        conn = self._cache.get_connection()
+        try:
+            for dummy in range(self.CAS_RETRIES):
+                bucket = conn.gets(name)
+                if bucket is None:
+                    bucket = {}
+                    update(bucket)
+                    stored = conn.add(name, bucket)
+                else:
+                    update(bucket)
+                    stored = conn.cas(name, bucket)
+                if stored:
+                    break
+            else:
+                raise AnsibleError(f"Could not update memcached key index {name} after {self.CAS_RETRIES} attempts")
+        finally:
+            conn.reset_cas()
+            self._cache.release_connection(conn)
+
+        # this also picks up what other writers changed in the bucket
+        self._set_bucket(name, bucket)
+
+    def _refresh(self):
+        """
+        Read all buckets in one round trip, picking up what other writers
+        stored since they were last read.
+        """
+        stored = self._cache.get_multi(self._bucket_names)
+        for name in self._bucket_names:
+            self._set_bucket(name, stored.get(name) or {})
+
+    def _set_bucket(self, name, bucket):
+        self._buckets[name] = bucket
+        self._oldest[name] = min(bucket.values(), default=float("inf"))
 
     def __contains__(self, key):
-        return key in self._keyset
+        return key in self._buckets[self._bucket_name(key)]
 
     def __iter__(self):
-        return iter(self._keyset)
+        return chain.from_iterable(self._buckets.values())
 
     def __len__(self):
-        return len(self._keyset)
+        return sum(len(bucket) for bucket in self._buckets.values())
 
     def add(self, value):
-        self._keyset[value] = time.time()
-        self._cache.set(self.PREFIX, self._keyset)
+        timestamp = time.time()
+        self._update_bucket(self._bucket_name(value), lambda bucket: bucket.__setitem__(value, timestamp))
 
     def discard(self, value):
-        del self._keyset[value]
-        self._cache.set(self.PREFIX, self._keyset)
+        self._update_bucket(self._bucket_name(value), lambda bucket: bucket.pop(value, None))
 
     def remove_by_timerange(self, s_min, s_max):
-        for k in list(self._keyset.keys()):
-            t = self._keyset[k]
-            if s_min < t < s_max:
-                del self._keyset[k]
-        self._cache.set(self.PREFIX, self._keyset)
+        def expire(bucket):
+            for k in [k for k, t in bucket.items() if s_min < t < s_max]:
+                del bucket[k]
+
+        # the oldest timestamps are only valid for the bucket contents they were computed from
+        self._refresh()
+        for name, oldest in list(self._oldest.items()):
+            if oldest < s_max:
+                self._update_bucket(name, expire)
 
 
 class CacheModule(BaseCacheModule):
+    _get_multi_chunk_size = 1000
+
     def __init__(self, *args, **kwargs):
         connection = ["127.0.0.1:11211"]
 
@@ -182,13 +280,15 @@ class CacheModule(BaseCacheModule):
             connection = self.get_option("_uri")
         self._timeout = self.get_option("_timeout")
         self._prefix = self.get_option("_prefix")
+        self._codec = self.get_option("_codec")
 
         if not HAS_MEMCACHE:
             raise AnsibleError("python-memcached is required for the memcached fact cache")
+        cache_codec.check_codec(self._codec)
 
         self._cache = {}
-        self._db = ProxyClientPool(connection, debug=0)
-        self._keys = CacheModuleKeys(self._db, self._db.get(CacheModuleKeys.PREFIX) or [])
+        self._db = ProxyClientPool(connection, debug=0, cache_cas=True)
+        self._keys = CacheModuleKeys(self._db)
 
     def _make_key(self, key):
         return f"{self._prefix}{key}"
@@ -207,12 +307,20 @@ class CacheModule(BaseCacheModule):
             if value is None:
                 self.delete(key)
                 raise KeyError
+            if cache_codec.is_encoded(value):
+                value = cache_codec.decode(value)
             self._cache[key] = value
 
         return self._cache.get(key)
 
     def set(self, key, value):
-        self._db.set(self._make_key(key), value, time=self._timeout, min_compress_len=1)
+        if self._codec == "legacy":
+            self._db.set(self._make_key(key), value, time=self._timeout, min_compress_len=1)
+        else:
+            # the codecs compress on their own, so keep the client from compressing again
+            self._db.set(
+                self._make_key(key), cache_codec.encode(value, self._codec), time=self._timeout, min_compress_len=0
+            )
         self._cache[key] = value
         self._keys.add(key)
 
@@ -225,7 +333,7 @@ class CacheModule(BaseCacheModule):
         return key in self._keys
 
     def delete(self, key):
-        del self._cache[key]
+        self._cache.pop(key, None)
         self._db.delete(self._make_key(key))
         self._keys.discard(key)
 
@@ -234,7 +342,25 @@ class CacheModule(BaseCacheModule):
             self.delete(key)
 
     def copy(self):
-        return self._keys.copy()
+        keys = self.keys()
+        missing = [key for key in keys if key not in self._cache]
+        stale = []
+        for i in range(0, len(missing), self._get_multi_chunk_size):
+            chunk = missing[i : i + self._get_multi_chunk_size]
+            values = self._db.get_multi(chunk, key_prefix=self._prefix)
+            for key in chunk:
+                value = values.get(key)
+                if value is None:
+                    stale.append(key)
+                    continue
+                if cache_codec.is_encoded(value):
+                    value = cache_codec.decode(value)
+                self._cache[key] = value
+
+        for key in stale:
+            self.delete(key)
+
+        return {key: self._cache[key] for key in keys if key in self._cache}
 
     def __getstate__(self):
         return dict()
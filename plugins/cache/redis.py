@@ -10,6 +10,7 @@ name: redis
 short_description: Use Redis DB for cache
 description:
   - This cache uses JSON formatted, per host records saved in Redis.
+  - The records can optionally be compressed or stored as MessagePack, see O(_codec).
 requirements:
   - redis>=2.4.5 (python lib)
 options:
@@ -64,6 +65,28 @@ options:
     ini:
       - key: fact_caching_timeout
         section: defaults
+  _codec:
+    description:
+      - Serialization format used for new cache entries.
+      - V(legacy) stores indented JSON, as earlier versions of this plugin did.
+      - V(json) stores compact JSON, V(zlib) and V(zstd) store compressed compact JSON, and V(msgpack) stores MessagePack.
+      - All formats except V(legacy) prefix each value with a version header. Entries are always read according to their header,
+        so changing this option does not invalidate existing cache entries.
+      - V(zstd) requires the C(zstandard) Python library, and V(msgpack) requires the C(msgpack) Python library.
+    type: string
+    default: legacy
+    choices:
+      - legacy
+      - json
+      - zlib
+      - zstd
+      - msgpack
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_CODEC
+    ini:
+      - key: fact_caching_codec
+        section: defaults
+    version_added: 12.2.0
 """
 
 import re
@@ -71,10 +94,13 @@ import time
 import json
 
 from ansible.errors import AnsibleError
+from ansible.module_utils.common.text.converters import to_text
 from ansible.parsing.ajson import AnsibleJSONEncoder, AnsibleJSONDecoder
 from ansible.plugins.cache import BaseCacheModule
 from ansible.utils.display import Display
 
+from ansible_collections.community.general.plugins.plugin_utils import cache_codec
+
 try:
     from redis import StrictRedis, VERSION
 
@@ -93,9 +119,14 @@ class CacheModule(BaseCacheModule):
     when they are inserted. This allows for the usage of 'zremrangebyscore'
     to expire keys. This mechanism is used or a pattern matched 'scan' for
     performance.
+
+    Commands that belong together are sent in a single pipeline, and bulk
+    reads use MGET in chunks of C(_mget_chunk_size) keys, so that the number
+    of network round trips does not grow with the number of commands.
     """
 
     _sentinel_service_name = None
+    _mget_chunk_size = 1000
     re_url_conn = re.compile(r"^([^:]+|\[[^]]+\]):(\d+):(\d+)(?::(.*))?$")
     re_sent_conn = re.compile(r"^(.*):(\d+)$")
 
@@ -109,13 +140,16 @@ class CacheModule(BaseCacheModule):
         self._prefix = self.get_option("_prefix")
         self._keys_set = self.get_option("_keyset_name")
         self._sentinel_service_name = self.get_option("_sentinel_service_name")
+        self._codec = self.get_option("_codec")
 
         if not HAS_REDIS:
             raise AnsibleError(
                 "The 'redis' python module (version 2.4.5 or newer) is required for the redis fact cache, 'pip install redis'"
             )
+        cache_codec.check_codec(self._codec)
 
         self._cache = {}
+        self._last_expired = float("-inf")
         kw = {}
 
         # tls connection
@@ -177,6 +211,33 @@ class CacheModule(BaseCacheModule):
     def _make_key(self, key):
         return self._prefix + key
 
+    def _load(self, value):
+        if cache_codec.is_encoded(value):
+            return cache_codec.decode(value)
+        return json.loads(value, cls=AnsibleJSONDecoder)
+
+    def _dump(self, value):
+        if self._codec == "legacy":
+            return json.dumps(value, cls=AnsibleJSONEncoder, sort_keys=True, indent=4)
+        return cache_codec.encode(value, self._codec)
+
+    def _expiry_age(self):
+        if self._timeout > 0:
+            return time.time() - self._timeout
+        return None
+
+    def _queue_expire_keys(self, pipe):
+        """
+        Queue the removal of expired keys from the keyset.
+
+        The removal runs at most once per tenth of the timeout; reads filter out
+        expired keys by their score in the meantime.
+        """
+        expiry_age = self._expiry_age()
+        if expiry_age is not None and expiry_age - self._last_expired >= self._timeout / 10:
+            self._last_expired = expiry_age
+            pipe.zremrangebyscore(self._keys_set, 0, expiry_age)
+
     def get(self, key):
         if key not in self._cache:
             value = self._db.get(self._make_key(key))
@@ -186,50 +247,82 @@ class CacheModule(BaseCacheModule):
             if value is None:
                 self.delete(key)
                 raise KeyError
-            self._cache[key] = json.loads(value, cls=AnsibleJSONDecoder)
+            self._cache[key] = self._load(value)
 
         return self._cache.get(key)
 
+    def get_many(self, keys):
+        """
+        Return a dict with the cached values of ``keys``.
+
+        Values not yet in the in-memory cache are fetched with MGET, one round
+        trip per C(_mget_chunk_size) keys. Keys whose value has vanished are
+        removed from the keyset and left out of the result.
+        """
+        missing = [key for key in keys if key not in self._cache]
+        stale = []
+        for i in range(0, len(missing), self._mget_chunk_size):
+            chunk = missing[i : i + self._mget_chunk_size]
+            values = self._db.mget([self._make_key(key) for key in chunk])
+            for key, value in zip(chunk, values):
+                if value is None:
+                    stale.append(key)
+                else:
+                    self._cache[key] = self._load(value)
+
+        if stale:
+            self._delete_many(stale)
+
+        return {key: self._cache[key] for key in keys if key in self._cache}
+
     def set(self, key, value):
-        value2 = json.dumps(value, cls=AnsibleJSONEncoder, sort_keys=True, indent=4)
+        value2 = self._dump(value)
+        pipe = self._db.pipeline()
         if self._timeout > 0:  # a timeout of 0 is handled as meaning 'never expire'
-            self._db.setex(self._make_key(key), int(self._timeout), value2)
+            pipe.setex(self._make_key(key), int(self._timeout), value2)
         else:
-            self._db.set(self._make_key(key), value2)
+            pipe.set(self._make_key(key), value2)
 
         if VERSION[0] == 2:
-            self._db.zadd(self._keys_set, time.time(), key)
+            pipe.zadd(self._keys_set, time.time(), key)
         else:
-            self._db.zadd(self._keys_set, {key: time.time()})
+            pipe.zadd(self._keys_set, {key: time.time()})
+        pipe.execute()
         self._cache[key] = value
 
-    def _expire_keys(self):
-        if self._timeout > 0:
-            expiry_age = time.time() - self._timeout
-            self._db.zremrangebyscore(self._keys_set, 0, expiry_age)
-
     def keys(self):
-        self._expire_keys()
-        return self._db.zrange(self._keys_set, 0, -1)
+        pipe = self._db.pipeline()
+        self._queue_expire_keys(pipe)
+        expiry_age = self._expiry_age()
+        pipe.zrangebyscore(self._keys_set, "-inf" if expiry_age is None else f"({expiry_age}", "+inf")
+        return [to_text(key) for key in pipe.execute()[-1]]
 
     def contains(self, key):
-        self._expire_keys()
-        return self._db.zrank(self._keys_set, key) is not None
+        pipe = self._db.pipeline()
+        self._queue_expire_keys(pipe)
+        pipe.zscore(self._keys_set, key)
+        score = pipe.execute()[-1]
+        expiry_age = self._expiry_age()
+        return score is not None and (expiry_age is None or score > expiry_age)
+
+    def _delete_many(self, keys):
+        pipe = self._db.pipeline()
+        for key in keys:
+            self._cache.pop(key, None)
+            pipe.delete(self._make_key(key))
+        pipe.zrem(self._keys_set, *keys)
+        pipe.execute()
 
     def delete(self, key):
-        if key in self._cache:
-            del self._cache[key]
-        self._db.delete(self._make_key(key))
-        self._db.zrem(self._keys_set, key)
+        self._delete_many([key])
 
     def flush(self):
-        for key in list(self.keys()):
-            self.delete(key)
+        keys = self.keys()
+        if keys:
+            self._delete_many(keys)
 
     def copy(self):
-        # TODO: there is probably a better way to do this in redis
-        ret = {k: self.get(k) for k in self.keys()}
-        return ret
+        return self.get_many(self.keys())
 
     def __getstate__(self):
         return dict()
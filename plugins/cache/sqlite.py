@@ -0,0 +1,224 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+DOCUMENTATION = r"""
+author: agent (@agent)
+name: sqlite
+short_description: Use a SQLite database file for cache
+version_added: 12.2.0
+description:
+  - This cache stores per host records in a single SQLite database file.
+  - Unlike the file based cache plugins, it does not create one file per host. Expired entries are removed with a single
+    indexed delete, and bulk reads need a single query.
+  - The database is opened in write-ahead logging mode, so that forks of the same controller can read and write it concurrently.
+options:
+  _uri:
+    required: true
+    description:
+      - Path to the SQLite database file. It is created if it does not exist.
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_CONNECTION
+    ini:
+      - key: fact_caching_connection
+        section: defaults
+    type: path
+  _prefix:
+    description: User defined prefix to use when creating the DB entries.
+    default: ansible_facts
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_PREFIX
+    ini:
+      - key: fact_caching_prefix
+        section: defaults
+    type: string
+  _timeout:
+    default: 86400
+    description: Expiration timeout in seconds for the cache plugin data. Set to 0 to never expire.
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_TIMEOUT
+    ini:
+      - key: fact_caching_timeout
+        section: defaults
+    type: float
+  _codec:
+    description:
+      - Serialization format used for new cache entries.
+      - V(json) stores compact JSON, V(zlib) and V(zstd) store compressed compact JSON, and V(msgpack) stores MessagePack.
+      - Entries are always read according to the format they were written with, so changing this option does not invalidate
+        existing cache entries.
+      - V(zstd) requires the C(zstandard) Python library, and V(msgpack) requires the C(msgpack) Python library.
+    type: string
+    default: json
+    choices:
+      - json
+      - zlib
+      - zstd
+      - msgpack
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_CODEC
+    ini:
+      - key: fact_caching_codec
+        section: defaults
+  _busy_timeout:
+    description:
+      - How long, in seconds, to wait for a lock held by another process before failing.
+    default: 30
+    env:
+      - name: ANSIBLE_CACHE_SQLITE_BUSY_TIMEOUT
+    ini:
+      - key: fact_caching_sqlite_busy_timeout
+        section: defaults
+    type: float
+"""
+
+import os
+import sqlite3
+import time
+
+from ansible.errors import AnsibleError
+from ansible.plugins.cache import BaseCacheModule
+from ansible.utils.display import Display
+
+from ansible_collections.community.general.plugins.plugin_utils import cache_codec
+
+display = Display()
+
+
+class CacheModule(BaseCacheModule):
+    """
+    A caching module backed by a SQLite database.
+
+    All records live in one table together with the time they were written.
+    The timestamp column is indexed, so that expiring old records is a single
+    range delete.
+    """
+
+    # SQLite limits the number of host parameters in a single statement
+    _select_chunk_size = 500
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._path = self.get_option("_uri")
+        self._prefix = self.get_option("_prefix")
+        self._timeout = float(self.get_option("_timeout"))
+        self._codec = self.get_option("_codec")
+        self._busy_timeout = float(self.get_option("_busy_timeout"))
+        cache_codec.check_codec(self._codec)
+
+        self._cache = {}
+        self._pid = None
+        self._conn = None
+        self._connect()
+        self._expire_keys()
+
+    def _connect(self):
+        try:
+            directory = os.path.dirname(self._path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            conn = sqlite3.connect(self._path, timeout=self._busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, timestamp REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_timestamp ON cache (timestamp)")
+        except (OSError, sqlite3.Error) as exc:
+            raise AnsibleError(f"Could not open the SQLite cache database {self._path!r}: {exc}") from exc
+        self._conn = conn
+        self._pid = os.getpid()
+        display.vv(f"SQLite cache database: {self._path}")
+
+    def _db(self):
+        # SQLite connections must not be shared with forked workers
+        if self._pid != os.getpid():
+            self._connect()
+        return self._conn
+
+    def _make_key(self, key):
+        return self._prefix + key
+
+    def _cutoff(self):
+        if self._timeout > 0:  # a timeout of 0 is handled as meaning 'never expire'
+            return time.time() - self._timeout
+        return 0
+
+    def _expire_keys(self):
+        if self._timeout > 0:
+            self._db().execute("DELETE FROM cache WHERE timestamp < ?", (self._cutoff(),))
+
+    def get(self, key):
+        if key not in self._cache:
+            row = (
+                self._db()
+                .execute(
+                    "SELECT value FROM cache WHERE key = ? AND timestamp >= ?", (self._make_key(key), self._cutoff())
+                )
+                .fetchone()
+            )
+            if row is None:
+                raise KeyError
+            self._cache[key] = cache_codec.decode(row[0])
+
+        return self._cache.get(key)
+
+    def get_many(self, keys):
+        """
+        Return a dict with the cached values of ``keys``, skipping keys that are not cached.
+        """
+        missing = [key for key in keys if key not in self._cache]
+        prefix_length = len(self._prefix)
+        for i in range(0, len(missing), self._select_chunk_size):
+            chunk = [self._make_key(key) for key in missing[i : i + self._select_chunk_size]]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._db().execute(
+                f"SELECT key, value FROM cache WHERE key IN ({placeholders}) AND timestamp >= ?",
+                chunk + [self._cutoff()],
+            )
+            for db_key, value in rows:
+                self._cache[db_key[prefix_length:]] = cache_codec.decode(value)
+
+        return {key: self._cache[key] for key in keys if key in self._cache}
+
+    def set(self, key, value):
+        self._db().execute(
+            "INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)",
+            (self._make_key(key), cache_codec.encode(value, self._codec), time.time()),
+        )
+        self._cache[key] = value
+
+    def keys(self):
+        prefix_length = len(self._prefix)
+        rows = self._db().execute(
+            "SELECT key FROM cache WHERE substr(key, 1, ?) = ? AND timestamp >= ?",
+            (prefix_length, self._prefix, self._cutoff()),
+        )
+        return [row[0][prefix_length:] for row in rows]
+
+    def contains(self, key):
+        row = (
+            self._db()
+            .execute("SELECT 1 FROM cache WHERE key = ? AND timestamp >= ?", (self._make_key(key), self._cutoff()))
+            .fetchone()
+        )
+        return row is not None
+
+    def delete(self, key):
+        self._cache.pop(key, None)
+        self._db().execute("DELETE FROM cache WHERE key = ?", (self._make_key(key),))
+
+    def flush(self):
+        self._cache = {}
+        self._db().execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(self._prefix), self._prefix))
+
+    def copy(self):
+        return self.get_many(self.keys())
+
+    def __getstate__(self):
+        return dict()
+
+    def __setstate__(self, data):
+        self.__init__()
@@ -43,24 +43,65 @@ options:
         # TODO: determine whether it is OK to change to: type: float
 """
 
+import copy
 import os
+import typing as t
+from collections import OrderedDict
 
 import yaml
 
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader  # type: ignore
+
 from ansible.parsing.yaml.loader import AnsibleLoader
 from ansible.parsing.yaml.dumper import AnsibleDumper
 from ansible.plugins.cache import BaseFileCacheModule
 
+# Parsed cache files of this controller process, keyed by path and validated
+# against the file's inode, modification and change times, and size. The least
+# recently used entries are dropped beyond _LOADED_MAX entries.
+_LOADED: OrderedDict[str, tuple[tuple[int, int, int, int], t.Any]] = OrderedDict()
+_LOADED_MAX = 1024
+
 
 class CacheModule(BaseFileCacheModule):
     """
     A caching module backed by yaml files.
+
+    Plain data is read and written with the (libyaml based, if available)
+    safe loader and dumper. The Ansible loader and dumper are only used for
+    data that needs Ansible specific YAML tags.
     """
 
     def _load(self, filepath):
-        with open(os.path.abspath(filepath), "r", encoding="utf-8") as f:
-            return AnsibleLoader(f).get_single_data()
+        filepath = os.path.abspath(filepath)
+        st = os.stat(filepath)
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+        cached = _LOADED.get(filepath)
+        if cached is not None and cached[0] == stamp:
+            _LOADED.move_to_end(filepath)
+            return copy.deepcopy(cached[1])
+
+        with open(filepath, "r", encoding="utf-8") as f:
+            data = f.read()
+        try:
+            value = yaml.load(data, Loader=SafeLoader)
+        except yaml.constructor.ConstructorError:
+            value = AnsibleLoader(data).get_single_data()
+
+        _LOADED[filepath] = (stamp, value)
+        _LOADED.move_to_end(filepath)
+        if len(_LOADED) > _LOADED_MAX:
+            _LOADED.popitem(last=False)
+        return copy.deepcopy(value)
 
     def _dump(self, value, filepath):
+        try:
+            data = yaml.dump(value, Dumper=SafeDumper, default_flow_style=False)
+        except yaml.representer.RepresenterError:
+            data = yaml.dump(value, Dumper=AnsibleDumper, default_flow_style=False)
         with open(os.path.abspath(filepath), "w", encoding="utf-8") as f:
-            yaml.dump(value, f, Dumper=AnsibleDumper, default_flow_style=False)
+            f.write(data)
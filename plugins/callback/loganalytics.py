@@ -35,6 +35,41 @@ options:
     ini:
       - section: callback_loganalytics
         key: shared_key
+  send_async:
+    description:
+      - Whether to send events from a background thread instead of sending every event before the playbook continues.
+      - Events are sent in batches, as a JSON array of events per request, over a persistent connection. Failed requests
+        are retried a few times. All pending events are sent when the playbook finishes.
+    env:
+      - name: LOGANALYTICS_SEND_ASYNC
+    ini:
+      - section: callback_loganalytics
+        key: send_async
+    type: bool
+    default: false
+    version_added: 12.2.0
+  async_batch_size:
+    description:
+      - Maximum number of events sent in one request when O(send_async=true).
+    env:
+      - name: LOGANALYTICS_ASYNC_BATCH_SIZE
+    ini:
+      - section: callback_loganalytics
+        key: async_batch_size
+    type: int
+    default: 100
+    version_added: 12.2.0
+  async_flush_interval:
+    description:
+      - Maximum time in seconds an event waits for more events to batch with when O(send_async=true).
+    env:
+      - name: LOGANALYTICS_ASYNC_FLUSH_INTERVAL
+    ini:
+      - section: callback_loganalytics
+        key: async_flush_interval
+    type: float
+    default: 1.0
+    version_added: 12.2.0
 """
 
 EXAMPLES = r"""
@@ -69,6 +104,7 @@ from ansible.plugins.callback import CallbackBase
 from ansible_collections.community.general.plugins.module_utils.datetime import (
     now,
 )
+from ansible_collections.community.general.plugins.plugin_utils.event_sender import BatchingEventSender
 
 
 class AzureLogAnalyticsSource:
@@ -79,6 +115,7 @@ class AzureLogAnalyticsSource:
         self.host = socket.gethostname()
         self.user = getpass.getuser()
         self.extra_vars = ""
+        self.sender = None
 
     def __build_signature(self, date, workspace_id, shared_key, content_length):
         # Build authorisation signature for Azure log analytics API call
@@ -96,6 +133,35 @@ class AzureLogAnalyticsSource:
     def __rfc1123date(self):
         return now().strftime("%a, %d %b %Y %H:%M:%S GMT")
 
+    def __build_headers(self, workspace_id, shared_key, content_length):
+        rfc1123date = self.__rfc1123date()
+        return {
+            "content-type": "application/json",
+            "Authorization": self.__build_signature(rfc1123date, workspace_id, shared_key, content_length),
+            "Log-Type": "ansible_playbook",
+            "x-ms-date": rfc1123date,
+        }
+
+    def start_sender(self, workspace_id, shared_key, batch_size, flush_interval):
+        self.stop_sender()
+
+        def build_request(events, group):
+            # The Data Collector API accepts a JSON array of records
+            body = b"[" + b",".join(events) + b"]"
+            return body, self.__build_headers(workspace_id, shared_key, len(body))
+
+        self.sender = BatchingEventSender(
+            self.__build_workspace_url(workspace_id),
+            build_request,
+            max_batch_size=batch_size,
+            flush_interval=flush_interval,
+        )
+
+    def stop_sender(self):
+        if self.sender is not None:
+            self.sender.close()
+            self.sender = None
+
     def send_event(self, workspace_id, shared_key, state, result, runtime):
         if result._task_fields["args"].get("_ansible_check_mode") is True:
             self.ansible_check_mode = True
@@ -131,20 +197,18 @@ class AzureLogAnalyticsSource:
 
         # Preparing the playbook logs as JSON format and send to Azure log analytics
         jsondata = json.dumps({"event": data}, cls=AnsibleJSONEncoder, sort_keys=True)
+
+        if self.sender is not None:
+            self.sender.send(jsondata.encode("utf-8"))
+            return
+
         content_length = len(jsondata)
-        rfc1123date = self.__rfc1123date()
-        signature = self.__build_signature(rfc1123date, workspace_id, shared_key, content_length)
         workspace_url = self.__build_workspace_url(workspace_id)
 
         open_url(
             workspace_url,
             jsondata,
-            headers={
-                "content-type": "application/json",
-                "Authorization": signature,
-                "Log-Type": "ansible_playbook",
-                "x-ms-date": rfc1123date,
-            },
+            headers=self.__build_headers(workspace_id, shared_key, content_length),
             method="POST",
         )
 
@@ -169,6 +233,13 @@ class CallbackModule(CallbackBase):
         super().set_options(task_keys=task_keys, var_options=var_options, direct=direct)
         self.workspace_id = self.get_option("workspace_id")
         self.shared_key = self.get_option("shared_key")
+        if self.get_option("send_async"):
+            self.loganalytics.start_sender(
+                self.workspace_id,
+                self.shared_key,
+                self.get_option("async_batch_size"),
+                self.get_option("async_flush_interval"),
+            )
 
     def v2_playbook_on_play_start(self, play):
         vm = play.get_variable_manager()
@@ -178,6 +249,9 @@ class CallbackModule(CallbackBase):
     def v2_playbook_on_start(self, playbook):
         self.loganalytics.ansible_playbook = basename(playbook._file_name)
 
+    def v2_playbook_on_stats(self, stats):
+        self.loganalytics.stop_sender()
+
     def v2_playbook_on_task_start(self, task, is_conditional):
         self.start_datetimes[task._uuid] = now()
 
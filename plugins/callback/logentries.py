@@ -71,6 +71,32 @@ options:
     ini:
       - section: callback_logentries
         key: flatten
+  send_async:
+    description:
+      - Whether to send events from a background thread over a persistent connection, instead of opening a new connection
+        for every event before the playbook continues.
+      - Events that are waiting to be sent are kept in a buffer of O(async_buffer_size) events. When the buffer is full, for
+        example because Logentries cannot be reached, the oldest events are dropped and a warning is shown at the end of the
+        playbook.
+    type: boolean
+    default: false
+    env:
+      - name: LOGENTRIES_SEND_ASYNC
+    ini:
+      - section: callback_logentries
+        key: send_async
+    version_added: 12.2.0
+  async_buffer_size:
+    description:
+      - Maximum number of events waiting to be sent when O(send_async=true).
+    type: int
+    default: 10000
+    env:
+      - name: LOGENTRIES_ASYNC_BUFFER_SIZE
+    ini:
+      - section: callback_logentries
+        key: async_buffer_size
+    version_added: 12.2.0
 """
 
 EXAMPLES = r"""
@@ -118,6 +144,8 @@ except ImportError:
 from ansible.module_utils.common.text.converters import to_bytes, to_text
 from ansible.plugins.callback import CallbackBase
 
+from ansible_collections.community.general.plugins.plugin_utils.stream_appender import BufferedStreamAppender
+
 # Todo:
 #  * Better formatting of output before sending out to logentries data/api nodes.
 
@@ -136,10 +164,19 @@ class PlainTextSocketAppender:
 
         self._display = display
         self._conn = None
+        self._writer = None
+
+    def create_connection(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.connect((self.LE_API, self.LE_PORT))
+        return sock
 
     def open_connection(self):
-        self._conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self._conn.connect((self.LE_API, self.LE_PORT))
+        self._conn = self.create_connection()
+
+    def start_writer(self, max_records):
+        """Send data from a background thread over a persistent connection from now on."""
+        self._writer = BufferedStreamAppender(self.create_connection, max_records=max_records)
 
     def reopen_connection(self):
         self.close_connection()
@@ -167,6 +204,14 @@ class PlainTextSocketAppender:
     def close_connection(self):
         if self._conn is not None:
             self._conn.close()
+        if self._writer is not None:
+            writer = self._writer
+            self._writer = None
+            writer.close(timeout=self.MAX_DELAY)
+            if writer.dropped_records:
+                self._display.warning(
+                    f"Could not send {writer.dropped_records} event(s) to Logentries: {writer.last_error or 'buffer full'}"
+                )
 
     def put(self, data):
         # Replace newlines with Unicode line separator
@@ -174,6 +219,9 @@ class PlainTextSocketAppender:
         data = to_text(data, errors="surrogate_or_strict")
         multiline = data.replace("\n", self.LINE_SEP)
         multiline += "\n"
+        if self._writer is not None:
+            self._writer.put(to_bytes(multiline, errors="surrogate_or_strict"))
+            return
         # Send data, reconnect if needed
         while True:
             try:
@@ -196,7 +244,7 @@ except ImportError:  # for systems without TLS support.
 else:
 
     class TLSSocketAppender(PlainTextSocketAppender):
-        def open_connection(self):
+        def create_connection(self):
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             context = ssl.create_default_context(
                 purpose=ssl.Purpose.SERVER_AUTH,
@@ -208,7 +256,7 @@ else:
                 suppress_ragged_eofs=True,
             )
             sock.connect((self.LE_API, self.LE_TLS_PORT))
-            self._conn = sock
+            return sock
 
     SocketAppender = TLSSocketAppender  # type: ignore
 
@@ -248,6 +296,8 @@ class CallbackModule(CallbackBase):
             self.api_tls_port = self.get_option("tls_port")
             self.use_tls = self.get_option("use_tls")
             self.flatten = self.get_option("flatten")
+            self.send_async = self.get_option("send_async")
+            self.async_buffer_size = self.get_option("async_buffer_size")
         except KeyError as e:
             self._display.warning(f"Missing option for Logentries callback plugin: {e}")
             self.disabled = True
@@ -280,7 +330,10 @@ class CallbackModule(CallbackBase):
                 self._appender = PlainTextSocketAppender(
                     display=self._display, LE_API=self.api_url, LE_PORT=self.api_port
                 )
-            self._appender.reopen_connection()
+            if self.send_async:
+                self._appender.start_writer(self.async_buffer_size)
+            else:
+                self._appender.reopen_connection()
 
     def emit_formatted(self, record):
         if self.flatten:
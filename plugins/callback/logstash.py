@@ -68,6 +68,31 @@ options:
     choices:
       - v1
       - v2
+  send_async:
+    description:
+      - Whether to send events from a background thread, instead of sending every event before the playbook continues.
+      - Events that are waiting to be sent are kept in a buffer of O(async_buffer_size) events. When the buffer is full, for
+        example because Logstash cannot be reached, the oldest events are dropped and a warning is shown at the end of the
+        playbook.
+    type: bool
+    default: false
+    version_added: 12.2.0
+    ini:
+      - section: callback_logstash
+        key: send_async
+    env:
+      - name: LOGSTASH_SEND_ASYNC
+  async_buffer_size:
+    description:
+      - Maximum number of events waiting to be sent when O(send_async=true).
+    type: int
+    default: 10000
+    version_added: 12.2.0
+    ini:
+      - section: callback_logstash
+        key: async_buffer_size
+    env:
+      - name: LOGSTASH_ASYNC_BUFFER_SIZE
 """
 
 EXAMPLES = r"""
@@ -113,6 +138,32 @@ from ansible.plugins.callback import CallbackBase
 from ansible_collections.community.general.plugins.module_utils.datetime import (
     now,
 )
+from ansible_collections.community.general.plugins.plugin_utils.stream_appender import BufferedStreamAppender
+
+
+class BufferedLogstashHandler(logging.Handler):
+    """
+    Format records like the wrapped python-logstash TCP handler, but write them
+    from a background thread over a persistent connection.
+    """
+
+    def __init__(self, handler, max_records, timeout=10):
+        super().__init__()
+        self.handler = handler
+        self.appender = BufferedStreamAppender(
+            lambda: socket.create_connection((handler.host, handler.port), timeout=timeout),
+            max_records=max_records,
+        )
+
+    def emit(self, record):
+        try:
+            self.appender.put(self.handler.makePickle(record))
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.appender.close()
+        super().close()
 
 
 class CallbackModule(CallbackBase):
@@ -138,6 +189,8 @@ class CallbackModule(CallbackBase):
             self.handler = logstash.TCPLogstashHandler(
                 self.ls_server, self.ls_port, version=1, message_type=self.ls_type
             )
+            if self.ls_send_async:
+                self.handler = BufferedLogstashHandler(self.handler, self.ls_async_buffer_size)
 
             self.logger.addHandler(self.handler)
             self.hostname = socket.gethostname()
@@ -163,6 +216,8 @@ class CallbackModule(CallbackBase):
         self.ls_type = self.get_option("type")
         self.ls_pre_command = self.get_option("pre_command")
         self.ls_format_version = self.get_option("format_version")
+        self.ls_send_async = self.get_option("send_async")
+        self.ls_async_buffer_size = self.get_option("async_buffer_size")
 
         self._init_plugin()
 
@@ -200,6 +255,15 @@ class CallbackModule(CallbackBase):
         else:
             self.logger.info("ansible stats", extra=data)
 
+        if isinstance(self.handler, BufferedLogstashHandler):
+            self.logger.removeHandler(self.handler)
+            self.handler.close()
+            appender = self.handler.appender
+            if appender.dropped_records:
+                self._display.warning(
+                    f"Could not send {appender.dropped_records} event(s) to Logstash: {appender.last_error or 'buffer full'}"
+                )
+
     def v2_playbook_on_play_start(self, play):
         self.play_id = str(play._uuid)
 
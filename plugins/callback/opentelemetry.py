@@ -109,6 +109,20 @@ options:
       - section: callback_opentelemetry
         key: otel_exporter_otlp_traces_protocol
     version_added: 9.0.0
+  export_spans_incrementally:
+    default: false
+    type: bool
+    description:
+      - Export the spans of a task when the next task starts, instead of keeping all task results in memory until the end
+        of the playbook. When a host reports several results for a task, the span shows the last one.
+      - This bounds the memory used by this callback for long playbook runs with many hosts, and keeps the telemetry of runs
+        that were interrupted.
+    env:
+      - name: ANSIBLE_OPENTELEMETRY_EXPORT_SPANS_INCREMENTALLY
+    ini:
+      - section: callback_opentelemetry
+        key: export_spans_incrementally
+    version_added: 12.2.0
 requirements:
   - opentelemetry-api (Python library)
   - opentelemetry-exporter-otlp (Python library)
@@ -179,12 +193,12 @@ class TaskData:
         self.args = args
         self.dump = None
 
-    def add_host(self, host):
+    def add_host(self, host, keep_last=False):
         if host.uuid in self.host_data:
             if host.status == "included":
                 # concatenate task include output from multiple items
                 host.result = f"{self.host_data[host.uuid].result}\n{host.result}"
-            else:
+            elif not keep_last:
                 return
 
         self.host_data[host.uuid] = host
@@ -195,11 +209,12 @@ class HostData:
     Data about an individual host.
     """
 
-    def __init__(self, uuid, name, status, result):
+    def __init__(self, uuid, name, status, result, dump=None):
         self.uuid = uuid
         self.name = name
         self.status = status
         self.result = result
+        self.dump = dump
         self.finish = time_ns()
 
 
@@ -213,6 +228,9 @@ class OpenTelemetrySource:
         except Exception:
             self.ip_address = None
         self.user = getpass.getuser()
+        self.tracer_provider = None
+        self.tracer = None
+        self.playbook_span = None
 
         self._display = display
 
@@ -239,7 +257,7 @@ class OpenTelemetrySource:
 
         tasks_data[uuid] = TaskData(uuid, name, path, play_name, action, args)
 
-    def finish_task(self, tasks_data, status, result, dump):
+    def finish_task(self, tasks_data, status, result, dump, keep_last=False):
         """record the results of a task for a single host"""
 
         task_uuid = result._task._uuid
@@ -254,7 +272,76 @@ class OpenTelemetrySource:
         task = tasks_data[task_uuid]
 
         task.dump = dump
-        task.add_host(HostData(host_uuid, host_name, status, result))
+        # each host keeps its own dump when the spans are exported incrementally
+        host_dump = dump if keep_last else None
+        task.add_host(HostData(host_uuid, host_name, status, result, host_dump), keep_last=keep_last)
+
+    def init_tracer(self, otel_service_name, otel_exporter_otlp_traces_protocol, store_spans_in_file):
+        """create the tracer provider and exporter, and return the exporter"""
+
+        self.tracer_provider = TracerProvider(resource=Resource.create({SERVICE_NAME: otel_service_name}))
+        trace.set_tracer_provider(self.tracer_provider)
+
+        otel_exporter = None
+        if store_spans_in_file:
+            otel_exporter = InMemorySpanExporter()
+            processor = SimpleSpanProcessor(otel_exporter)
+        else:
+            if otel_exporter_otlp_traces_protocol == "grpc":
+                otel_exporter = GRPCOTLPSpanExporter()
+            else:
+                otel_exporter = HTTPOTLPSpanExporter()
+            processor = BatchSpanProcessor(otel_exporter)
+
+        self.tracer_provider.add_span_processor(processor)
+        self.tracer = self.tracer_provider.get_tracer(__name__)
+
+        return otel_exporter
+
+    def set_playbook_span_attributes(self, parent, status=None):
+        """populate the trace metadata attributes of the playbook span"""
+
+        if status is not None:
+            parent.set_status(status)
+        parent.set_attribute("ansible.version", ansible_version)
+        parent.set_attribute("ansible.session", self.session)
+        parent.set_attribute("ansible.host.name", self.host)
+        if self.ip_address is not None:
+            parent.set_attribute("ansible.host.ip", self.ip_address)
+        parent.set_attribute("ansible.host.user", self.user)
+
+    def start_playbook_span(
+        self, otel_service_name, ansible_playbook, traceparent, otel_exporter_otlp_traces_protocol, store_spans_in_file
+    ):
+        """open the playbook span, for exporting the task spans as they finish"""
+
+        otel_exporter = self.init_tracer(otel_service_name, otel_exporter_otlp_traces_protocol, store_spans_in_file)
+        self.playbook_span = self.tracer.start_span(
+            ansible_playbook,
+            context=self.traceparent_context(traceparent),
+            kind=SpanKind.SERVER,
+        )
+        self.set_playbook_span_attributes(self.playbook_span)
+        return otel_exporter
+
+    def export_tasks(self, tasks_data, disable_logs, disable_attributes_in_logs, keep=None):
+        """export the spans of the recorded tasks except the one with uuid ``keep``, and drop their data"""
+
+        for task_uuid in [task_uuid for task_uuid in tasks_data if task_uuid != keep]:
+            task = tasks_data.pop(task_uuid)
+            for host_data in task.host_data.values():
+                task.dump = host_data.dump
+                span = self.tracer.start_span(
+                    task.name, context=trace.set_span_in_context(self.playbook_span), start_time=task.start
+                )
+                self.update_span_data(task, host_data, span, disable_logs, disable_attributes_in_logs)
+
+    def end_playbook_span(self, status):
+        """close the playbook span and flush the spans not exported yet"""
+
+        self.playbook_span.set_status(status)
+        self.playbook_span.end()
+        self.tracer_provider.force_flush()
 
     def generate_distributed_traces(
         self,
@@ -277,20 +364,7 @@ class OpenTelemetrySource:
                 parent_start_time = task.start
             tasks.append(task)
 
-        trace.set_tracer_provider(TracerProvider(resource=Resource.create({SERVICE_NAME: otel_service_name})))
-
-        otel_exporter = None
-        if store_spans_in_file:
-            otel_exporter = InMemorySpanExporter()
-            processor = SimpleSpanProcessor(otel_exporter)
-        else:
-            if otel_exporter_otlp_traces_protocol == "grpc":
-                otel_exporter = GRPCOTLPSpanExporter()
-            else:
-                otel_exporter = HTTPOTLPSpanExporter()
-            processor = BatchSpanProcessor(otel_exporter)
-
-        trace.get_tracer_provider().add_span_processor(processor)
+        otel_exporter = self.init_tracer(otel_service_name, otel_exporter_otlp_traces_protocol, store_spans_in_file)
 
         tracer = trace.get_tracer(__name__)
 
@@ -300,14 +374,8 @@ class OpenTelemetrySource:
             start_time=parent_start_time,
             kind=SpanKind.SERVER,
         ) as parent:
-            parent.set_status(status)
             # Populate trace metadata attributes
-            parent.set_attribute("ansible.version", ansible_version)
-            parent.set_attribute("ansible.session", self.session)
-            parent.set_attribute("ansible.host.name", self.host)
-            if self.ip_address is not None:
-                parent.set_attribute("ansible.host.ip", self.ip_address)
-            parent.set_attribute("ansible.host.user", self.user)
+            self.set_playbook_span_attributes(parent, status)
             for task in tasks:
                 for host_data in task.host_data.values():
                     with tracer.start_as_current_span(task.name, start_time=task.start, end_on_exit=False) as span:
@@ -501,6 +569,8 @@ class CallbackModule(CallbackBase):
         self.traceparent = False
         self.store_spans_in_file = False
         self.otel_exporter_otlp_traces_protocol = None
+        self.export_spans_incrementally = False
+        self.otel_exporter = None
 
         if OTEL_LIBRARY_IMPORT_ERROR:
             raise AnsibleError(
@@ -539,6 +609,8 @@ class CallbackModule(CallbackBase):
 
         self.otel_exporter_otlp_traces_protocol = self.get_option("otel_exporter_otlp_traces_protocol")
 
+        self.export_spans_incrementally = self.get_option("export_spans_incrementally")
+
     def dump_results(self, task, result):
         """dump the results if disable_logs is not enabled"""
         if self.disable_logs:
@@ -553,23 +625,53 @@ class CallbackModule(CallbackBase):
             save.pop("content")
         return self._dump_results(save)
 
+    def _start_task(self, task):
+        if self.export_spans_incrementally:
+            self.opentelemetry.export_tasks(
+                self.tasks_data, self.disable_logs, self.disable_attributes_in_logs, keep=task._uuid
+            )
+        self.opentelemetry.start_task(self.tasks_data, self.hide_task_arguments, self.play_name, task)
+
+    def _task_data(self, task):
+        # when exporting incrementally, a result can arrive after its task was exported (for example
+        # with the free strategy); it is then recorded for a new span of the task
+        self.opentelemetry.start_task(self.tasks_data, self.hide_task_arguments, self.play_name, task)
+        return self.tasks_data[task._uuid]
+
+    def _finish_task(self, status, result, dump):
+        self._task_data(result._task)
+        self.opentelemetry.finish_task(self.tasks_data, status, result, dump, keep_last=self.export_spans_incrementally)
+
+    def _store_spans_in_file(self):
+        spans = [json.loads(span.to_json()) for span in self.otel_exporter.get_finished_spans()]
+        with open(self.store_spans_in_file, "w", encoding="utf-8") as output:
+            json.dump({"spans": spans}, output, indent=4)
+
     def v2_playbook_on_start(self, playbook):
         self.ansible_playbook = basename(playbook._file_name)
+        if self.export_spans_incrementally:
+            self.otel_exporter = self.opentelemetry.start_playbook_span(
+                self.otel_service_name,
+                self.ansible_playbook,
+                self.traceparent,
+                self.otel_exporter_otlp_traces_protocol,
+                self.store_spans_in_file,
+            )
 
     def v2_playbook_on_play_start(self, play):
         self.play_name = play.get_name()
 
     def v2_runner_on_no_hosts(self, task):
-        self.opentelemetry.start_task(self.tasks_data, self.hide_task_arguments, self.play_name, task)
+        self._start_task(task)
 
     def v2_playbook_on_task_start(self, task, is_conditional):
-        self.opentelemetry.start_task(self.tasks_data, self.hide_task_arguments, self.play_name, task)
+        self._start_task(task)
 
     def v2_playbook_on_cleanup_task_start(self, task):
-        self.opentelemetry.start_task(self.tasks_data, self.hide_task_arguments, self.play_name, task)
+        self._start_task(task)
 
     def v2_playbook_on_handler_task_start(self, task):
-        self.opentelemetry.start_task(self.tasks_data, self.hide_task_arguments, self.play_name, task)
+        self._start_task(task)
 
     def v2_runner_on_failed(self, result, ignore_errors=False):
         if ignore_errors:
@@ -578,29 +680,30 @@ class CallbackModule(CallbackBase):
             status = "failed"
             self.errors += 1
 
-        self.opentelemetry.finish_task(
-            self.tasks_data, status, result, self.dump_results(self.tasks_data[result._task._uuid], result)
-        )
+        self._finish_task(status, result, self.dump_results(self._task_data(result._task), result))
 
     def v2_runner_on_ok(self, result):
-        self.opentelemetry.finish_task(
-            self.tasks_data, "ok", result, self.dump_results(self.tasks_data[result._task._uuid], result)
-        )
+        self._finish_task("ok", result, self.dump_results(self._task_data(result._task), result))
 
     def v2_runner_on_skipped(self, result):
-        self.opentelemetry.finish_task(
-            self.tasks_data, "skipped", result, self.dump_results(self.tasks_data[result._task._uuid], result)
-        )
+        self._finish_task("skipped", result, self.dump_results(self._task_data(result._task), result))
 
     def v2_playbook_on_include(self, included_file):
-        self.opentelemetry.finish_task(self.tasks_data, "included", included_file, "")
+        self._finish_task("included", included_file, "")
 
     def v2_playbook_on_stats(self, stats):
         if self.errors == 0:
             status = Status(status_code=StatusCode.OK)
         else:
             status = Status(status_code=StatusCode.ERROR)
-        otel_exporter = self.opentelemetry.generate_distributed_traces(
+        if self.export_spans_incrementally:
+            self.opentelemetry.export_tasks(self.tasks_data, self.disable_logs, self.disable_attributes_in_logs)
+            self.opentelemetry.end_playbook_span(status)
+            if self.store_spans_in_file:
+                self._store_spans_in_file()
+            return
+
+        self.otel_exporter = self.opentelemetry.generate_distributed_traces(
             self.otel_service_name,
             self.ansible_playbook,
             self.tasks_data,
@@ -613,9 +716,7 @@ class CallbackModule(CallbackBase):
         )
 
         if self.store_spans_in_file:
-            spans = [json.loads(span.to_json()) for span in otel_exporter.get_finished_spans()]
-            with open(self.store_spans_in_file, "w", encoding="utf-8") as output:
-                json.dump({"spans": spans}, output, indent=4)
+            self._store_spans_in_file()
 
     def v2_runner_on_async_failed(self, result, **kwargs):
         self.errors += 1
@@ -67,6 +67,41 @@ options:
         key: batch
     type: str
     version_added: 3.3.0
+  send_async:
+    description:
+      - Whether to send events from a background thread instead of sending every event before the playbook continues.
+      - Events are sent in batches, with several events concatenated in one request to the HTTP collector, over a persistent
+        connection. Failed requests are retried a few times. All pending events are sent when the playbook finishes.
+    env:
+      - name: SPLUNK_SEND_ASYNC
+    ini:
+      - section: callback_splunk
+        key: send_async
+    type: bool
+    default: false
+    version_added: 12.2.0
+  async_batch_size:
+    description:
+      - Maximum number of events sent in one request when O(send_async=true).
+    env:
+      - name: SPLUNK_ASYNC_BATCH_SIZE
+    ini:
+      - section: callback_splunk
+        key: async_batch_size
+    type: int
+    default: 100
+    version_added: 12.2.0
+  async_flush_interval:
+    description:
+      - Maximum time in seconds an event waits for more events to batch with when O(send_async=true).
+    env:
+      - name: SPLUNK_ASYNC_FLUSH_INTERVAL
+    ini:
+      - section: callback_splunk
+        key: async_flush_interval
+    type: float
+    default: 1.0
+    version_added: 12.2.0
 """
 
 EXAMPLES = r"""
@@ -98,6 +133,7 @@ from ansible.plugins.callback import CallbackBase
 from ansible_collections.community.general.plugins.module_utils.datetime import (
     now,
 )
+from ansible_collections.community.general.plugins.plugin_utils.event_sender import BatchingEventSender
 
 
 class SplunkHTTPCollectorSource:
@@ -108,6 +144,28 @@ class SplunkHTTPCollectorSource:
         self.host = socket.gethostname()
         self.ip_address = socket.gethostbyname(socket.gethostname())
         self.user = getpass.getuser()
+        self.sender = None
+
+    def start_sender(self, url, authtoken, validate_certs, batch_size, flush_interval):
+        self.stop_sender()
+        headers = {"Content-type": "application/json", "Authorization": f"Splunk {authtoken}"}
+
+        def build_request(events, group):
+            # HEC accepts several events concatenated in one request
+            return b"\n".join(events), headers
+
+        self.sender = BatchingEventSender(
+            url,
+            build_request,
+            validate_certs=validate_certs,
+            max_batch_size=batch_size,
+            flush_interval=flush_interval,
+        )
+
+    def stop_sender(self):
+        if self.sender is not None:
+            self.sender.close()
+            self.sender = None
 
     def send_event(self, url, authtoken, validate_certs, include_milliseconds, batch, state, result, runtime):
         if result._task_fields["args"].get("_ansible_check_mode") is True:
@@ -149,6 +207,10 @@ class SplunkHTTPCollectorSource:
         # This wraps the json payload in and outer json event needed by Splunk
         jsondata = json.dumps({"event": data}, cls=AnsibleJSONEncoder, sort_keys=True)
 
+        if self.sender is not None:
+            self.sender.send(jsondata.encode("utf-8"))
+            return
+
         open_url(
             url,
             jsondata,
@@ -210,9 +272,21 @@ class CallbackModule(CallbackBase):
 
         self.batch = self.get_option("batch")
 
+        if self.get_option("send_async") and not self.disabled:
+            self.splunk.start_sender(
+                self.url,
+                self.authtoken,
+                self.validate_certs,
+                self.get_option("async_batch_size"),
+                self.get_option("async_flush_interval"),
+            )
+
     def v2_playbook_on_start(self, playbook):
         self.splunk.ansible_playbook = basename(playbook._file_name)
 
+    def v2_playbook_on_stats(self, stats):
+        self.splunk.stop_sender()
+
     def v2_playbook_on_task_start(self, task, is_conditional):
         self.start_datetimes[task._uuid] = now()
 
@@ -24,6 +24,41 @@ options:
     ini:
       - section: callback_sumologic
         key: url
+  send_async:
+    description:
+      - Whether to send events from a background thread instead of sending every event before the playbook continues.
+      - Events of the same host are sent in batches, with one event per line, over a persistent connection. Failed requests
+        are retried a few times. All pending events are sent when the playbook finishes.
+    env:
+      - name: SUMOLOGIC_SEND_ASYNC
+    ini:
+      - section: callback_sumologic
+        key: send_async
+    type: bool
+    default: false
+    version_added: 12.2.0
+  async_batch_size:
+    description:
+      - Maximum number of events sent in one request when O(send_async=true).
+    env:
+      - name: SUMOLOGIC_ASYNC_BATCH_SIZE
+    ini:
+      - section: callback_sumologic
+        key: async_batch_size
+    type: int
+    default: 100
+    version_added: 12.2.0
+  async_flush_interval:
+    description:
+      - Maximum time in seconds an event waits for more events to batch with when O(send_async=true).
+    env:
+      - name: SUMOLOGIC_ASYNC_FLUSH_INTERVAL
+    ini:
+      - section: callback_sumologic
+        key: async_flush_interval
+    type: float
+    default: 1.0
+    version_added: 12.2.0
 """
 
 EXAMPLES = r"""
@@ -55,6 +90,7 @@ from ansible.plugins.callback import CallbackBase
 from ansible_collections.community.general.plugins.module_utils.datetime import (
     now,
 )
+from ansible_collections.community.general.plugins.plugin_utils.event_sender import BatchingEventSender
 
 
 class SumologicHTTPCollectorSource:
@@ -65,6 +101,21 @@ class SumologicHTTPCollectorSource:
         self.host = socket.gethostname()
         self.ip_address = socket.gethostbyname(socket.gethostname())
         self.user = getpass.getuser()
+        self.sender = None
+
+    def start_sender(self, url, batch_size, flush_interval):
+        self.stop_sender()
+
+        def build_request(events, ansible_host):
+            # The collector source takes one event per line
+            return b"\n".join(events), {"Content-type": "application/json", "X-Sumo-Host": ansible_host}
+
+        self.sender = BatchingEventSender(url, build_request, max_batch_size=batch_size, flush_interval=flush_interval)
+
+    def stop_sender(self):
+        if self.sender is not None:
+            self.sender.close()
+            self.sender = None
 
     def send_event(self, url, state, result, runtime):
         if result._task_fields["args"].get("_ansible_check_mode") is True:
@@ -95,9 +146,15 @@ class SumologicHTTPCollectorSource:
         data["ansible_task"] = result._task_fields
         data["ansible_result"] = result._result
 
+        jsondata = json.dumps(data, cls=AnsibleJSONEncoder, sort_keys=True)
+
+        if self.sender is not None:
+            self.sender.send(jsondata.encode("utf-8"), data["ansible_host"])
+            return
+
         open_url(
             url,
-            data=json.dumps(data, cls=AnsibleJSONEncoder, sort_keys=True),
+            data=jsondata,
             headers={"Content-type": "application/json", "X-Sumo-Host": data["ansible_host"]},
             method="POST",
         )
@@ -132,10 +189,17 @@ class CallbackModule(CallbackBase):
                 "`SUMOLOGIC_URL` environment variable or "
                 "in the ansible.cfg file."
             )
+        elif self.get_option("send_async"):
+            self.sumologic.start_sender(
+                self.url, self.get_option("async_batch_size"), self.get_option("async_flush_interval")
+            )
 
     def v2_playbook_on_start(self, playbook):
         self.sumologic.ansible_playbook = basename(playbook._file_name)
 
+    def v2_playbook_on_stats(self, stats):
+        self.sumologic.stop_sender()
+
     def v2_playbook_on_task_start(self, task, is_conditional):
         self.start_datetimes[task._uuid] = now()
 
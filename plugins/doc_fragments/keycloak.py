@@ -78,6 +78,19 @@ options:
     type: str
     default: Ansible
     version_added: 5.4.0
+
+  token_cache_file:
+    description:
+      - Path of a file in which access tokens obtained with O(auth_username) and O(auth_password), or with O(auth_client_id)
+        and O(auth_client_secret), are cached.
+      - When set, a cached access token is reused by all tasks using the same credentials against the same Keycloak realm
+        until it expires. After that, the cached refresh token is used to obtain a new access token, and only when this fails
+        are the credentials used again.
+      - The file is created readable and writable by its owner only, and is locked while it is in use. It contains
+        tokens which give access to Keycloak, so it must not be placed in a location that other users can read.
+      - Has no effect when O(token) is used.
+    type: path
+    version_added: 12.2.0
 """
 
     ACTIONGROUP_KEYCLOAK = r"""
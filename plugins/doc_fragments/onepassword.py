@@ -61,6 +61,16 @@ options:
     env:
       - name: OP_SERVICE_ACCOUNT_TOKEN
         version_added: 8.2.0
+  cache_ttl:
+    description:
+      - Number of seconds the session and the items fetched from 1Password are kept in memory of the process running the
+        lookup, and reused by all 1Password lookups in that process for the same account, vault and item.
+      - When this is set and a lookup requests more than one item with C(op) version 2, the items are fetched together
+        with one C(op item list) and one C(op item get) call.
+      - V(0) disables the cache.
+    type: int
+    default: 0
+    version_added: 12.2.0
 notes:
   - This lookup uses an existing 1Password session if one exists. If not, and you have already performed an initial sign in
     (meaning C(~/.op/config), C(~/.config/op/config) or C(~/.config/.op/config) exists), then only the O(master_password)
@@ -30,4 +30,17 @@ options:
       - The available ciphers is dependent on the Python and OpenSSL/LibreSSL versions.
     type: list
     elements: str
+  session_cache_file:
+    description:
+      - Path of a file in which Redfish sessions created with O(username) and O(password) are cached.
+      - When set, the module creates a session on the first request and sends its C(X-Auth-Token) instead of basic authentication.
+        The session is reused by all tasks using the same credentials against the same service, until the service rejects
+        it. A new session is then created.
+      - Cached sessions are not deleted when a task ends. They expire according to the session timeout of the service.
+      - When the service does not support sessions, basic authentication is used.
+      - The file is created readable and writable by its owner only, and is locked while it is in use. It contains
+        tokens which give access to the service, so it must not be placed in a location that other users can read.
+      - Has no effect when an authentication token is provided.
+    type: path
+    version_added: 12.2.0
 """
@@ -105,6 +105,8 @@ _value:
   type: any
 """
 
+from functools import lru_cache
+
 from ansible.errors import AnsibleError, AnsibleFilterError
 
 try:
@@ -115,6 +117,33 @@ except ImportError:
     HAS_LIB = False
 
 
+# Hack to handle Ansible Unsafe text, AnsibleMapping and AnsibleSequence
+# See issues https://github.com/ansible-collections/community.general/issues/320
+# and https://github.com/ansible/ansible/issues/85600.
+ANSIBLE_TYPE_NAMES = {
+    "string": ("AnsibleUnicode", "AnsibleUnsafeText", "_AnsibleTaggedStr"),
+    "array": ("AnsibleSequence", "_AnsibleLazyTemplateList"),
+    "object": ("AnsibleMapping", "_AnsibleLazyTemplateDict"),
+}
+
+
+def _register_ansible_types():
+    reverse_types_map = jmespath.functions.REVERSE_TYPES_MAP
+    for jmespath_type, type_names in ANSIBLE_TYPE_NAMES.items():
+        missing = tuple(name for name in type_names if name not in reverse_types_map[jmespath_type])
+        if missing:
+            reverse_types_map[jmespath_type] = reverse_types_map[jmespath_type] + missing
+
+
+@lru_cache(maxsize=256)
+def _compile(expr):
+    return jmespath.compile(expr)
+
+
+if HAS_LIB:
+    _register_ansible_types()
+
+
 def json_query(data, expr):
     """Query data using jmespath query language ( http://jmespath.org ). Example:
     - ansible.builtin.debug: msg="{{ instance | json_query(tagged_instances[*].block_device_mapping.*.volume_id') }}"
@@ -122,24 +151,8 @@ def json_query(data, expr):
     if not HAS_LIB:
         raise AnsibleError('You need to install "jmespath" prior to running json_query filter')
 
-    # Hack to handle Ansible Unsafe text, AnsibleMapping and AnsibleSequence
-    # See issues https://github.com/ansible-collections/community.general/issues/320
-    # and https://github.com/ansible/ansible/issues/85600.
-    jmespath.functions.REVERSE_TYPES_MAP["string"] = jmespath.functions.REVERSE_TYPES_MAP["string"] + (
-        "AnsibleUnicode",
-        "AnsibleUnsafeText",
-        "_AnsibleTaggedStr",
-    )
-    jmespath.functions.REVERSE_TYPES_MAP["array"] = jmespath.functions.REVERSE_TYPES_MAP["array"] + (
-        "AnsibleSequence",
-        "_AnsibleLazyTemplateList",
-    )
-    jmespath.functions.REVERSE_TYPES_MAP["object"] = jmespath.functions.REVERSE_TYPES_MAP["object"] + (
-        "AnsibleMapping",
-        "_AnsibleLazyTemplateDict",
-    )
     try:
-        return jmespath.search(expr, data)
+        return _compile(expr).search(data)
     except jmespath.exceptions.JMESPathError as e:
         raise AnsibleFilterError(f"JMESPathError in json_query filter plugin:\n{e}") from e
     except Exception as e:
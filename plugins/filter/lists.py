@@ -4,27 +4,63 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+
 from ansible.errors import AnsibleFilterError
 from ansible.module_utils.common.collections import is_sequence
 
 
+# Tags of the hashable representation of unhashable lists, tuples and dictionaries
+_LIST = object()
+_TUPLE = object()
+_DICT = object()
+_SCALAR_TYPES = frozenset([str, int, float, bool, type(None)])
+
+
+def _canonical(item):
+    """Return a hashable value which is equal to _canonical(other) exactly when item == other.
+
+    Hashable values are returned as they are. Dictionaries, lists and tuples with unhashable
+    elements, and sets are converted recursively. Raises TypeError for other unhashable values.
+    """
+    cls = type(item)
+    if cls in _SCALAR_TYPES:
+        return item
+    if cls is dict or isinstance(item, Mapping):
+        return _DICT, frozenset([(key, _canonical(value)) for key, value in item.items()])
+    if isinstance(item, list):
+        return _LIST, tuple([_canonical(value) for value in item])
+    if isinstance(item, tuple):
+        try:
+            hash(item)
+            return item
+        except TypeError:
+            return _TUPLE, tuple([_canonical(value) for value in item])
+    if isinstance(item, set):
+        return frozenset(item)
+    hash(item)
+    return item
+
+
 def remove_duplicates(lst):
+    try:
+        keys = [_canonical(item) for item in lst]
+    except TypeError:
+        # This happens for unhashable values `item` which cannot be
+        # converted. Compare them one by one instead.
+        result = []
+        for item in lst:
+            if item not in result:
+                result.append(item)
+        return result
+
     seen = set()
     seen_add = seen.add
     result = []
-    for item in lst:
-        try:
-            if item not in seen:
-                seen_add(item)
-                result.append(item)
-        except TypeError:
-            # This happens for unhashable values `item`. If this happens,
-            # convert `seen` to a list and continue.
-            seen = list(seen)
-            seen_add = seen.append
-            if item not in seen:
-                seen_add(item)
-                result.append(item)
+    for key, item in zip(keys, lst):
+        if key not in seen:
+            seen_add(key)
+            result.append(item)
     return result
 
 
@@ -96,8 +132,8 @@ def lists_intersect(*args, **kwargs):
 def do_intersect(a, b):
     isect = []
     try:
-        other = set(b)
-        isect = [item for item in a if item in other]
+        other = {_canonical(item) for item in b}
+        isect = [item for item in a if _canonical(item) in other]
     except TypeError:
         # This happens for unhashable values,
         # use a list instead and redo.
@@ -132,8 +168,8 @@ def lists_difference(*args, **kwargs):
 def do_difference(a, b):
     diff = []
     try:
-        other = set(b)
-        diff = [item for item in a if item not in other]
+        other = {_canonical(item) for item in b}
+        diff = [item for item in a if _canonical(item) not in other]
     except TypeError:
         # This happens for unhashable values,
         # use a list instead and redo.
@@ -167,14 +203,20 @@ def lists_symmetric_difference(*args, **kwargs):
 
 def do_symmetric_difference(a, b):
     sym_diff = []
-    union = lists_union(a, b)
     try:
-        isect = set(a) & set(b)
-        sym_diff = [item for item in union if item not in isect]
+        keys_a = [_canonical(item) for item in a]
+        keys_b = [_canonical(item) for item in b]
+        # Items of the union which are in both `a` and `b` are skipped
+        seen = set(keys_a) & set(keys_b)
+        for key, item in zip(keys_a + keys_b, do_union(a, b)):
+            if key not in seen:
+                seen.add(key)
+                sym_diff.append(item)
     except TypeError:
         # This happens for unhashable values,
         # build the intersection of `a` and `b` backed
         # by a list instead of a set and redo.
+        union = lists_union(a, b)
         isect = lists_intersect(a, b)
         sym_diff = [item for item in union if item not in isect]
     return sym_diff
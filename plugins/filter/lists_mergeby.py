@@ -195,13 +195,20 @@ _value:
 """
 
 from ansible.errors import AnsibleFilterError
-from collections.abc import Mapping, Sequence
+from collections.abc import Mapping, MutableMapping, Sequence
 from ansible.utils.vars import merge_hash
 
 from collections import defaultdict
+from itertools import groupby
 from operator import itemgetter
 
 
+def _check_element(elem):
+    if not isinstance(elem, Mapping):
+        msg = "Elements of list arguments for lists_mergeby must be dictionaries. %s is %s"
+        raise AnsibleFilterError(msg % (elem, type(elem)))
+
+
 def list_mergeby(x, y, index, recursive=False, list_merge="replace"):
     """Merge 2 lists by attribute 'index'. The function 'merge_hash'
     from ansible.utils.vars is used.  This function is used by the
@@ -211,14 +218,56 @@ def list_mergeby(x, y, index, recursive=False, list_merge="replace"):
     d = defaultdict(dict)
     for lst in (x, y):
         for elem in lst:
-            if not isinstance(elem, Mapping):
-                msg = "Elements of list arguments for lists_mergeby must be dictionaries. %s is %s"
-                raise AnsibleFilterError(msg % (elem, type(elem)))
+            _check_element(elem)
             if index in elem.keys():
                 d[elem[index]].update(merge_hash(d[elem[index]], elem, recursive, list_merge))
     return sorted(d.values(), key=itemgetter(index))
 
 
+def merge_lists_by(lists, index, recursive=False, list_merge="replace"):
+    """Merge the lists by attribute 'index', later lists taking precedence.
+
+    The result is the same as folding the lists with list_mergeby from the
+    back, but every element is visited once and the result is sorted once.
+    """
+
+    # for every value of index, the elements that have it with the position of their list;
+    # the two last lists are merged in one go, as list_mergeby does
+    groups = {}
+    mutable = True
+    last = len(lists) - 2
+    for position, lst in enumerate(lists):
+        position = min(position, last)
+        for elem in lst:
+            if type(elem) is not dict:
+                _check_element(elem)
+                mutable = mutable and isinstance(elem, MutableMapping)
+            if index in elem:
+                groups.setdefault(elem[index], []).append((position, elem))
+
+    result = []
+    if not recursive and list_merge == "replace" and mutable:
+        # merge_hash() is a plain dict update in this case, which does not depend on the grouping
+        for entries in groups.values():
+            merged = {}
+            for dummy, elem in entries:
+                merged.update(elem)
+            result.append(merged)
+        return sorted(result, key=itemgetter(index))
+
+    for entries in groups.values():
+        merged = None
+        for dummy, group in groupby(reversed(entries), key=itemgetter(0)):
+            d = {}
+            for dummy, elem in reversed(list(group)):
+                d.update(merge_hash(d, elem, recursive, list_merge))
+            if merged is not None:
+                d.update(merge_hash(d, merged, recursive, list_merge))
+            merged = d
+        result.append(merged)
+    return sorted(result, key=itemgetter(index))
+
+
 def lists_mergeby(*terms, **kwargs):
     """Merge 2 or more lists by attribute 'index'. To learn details
     on how to use the parameters 'recursive' and 'list_merge' see
@@ -258,12 +307,7 @@ def lists_mergeby(*terms, **kwargs):
         msg = "First argument after the lists for community.general.lists_mergeby must be string. %s is %s"
         raise AnsibleFilterError(msg % (index, type(index)))
 
-    high_to_low_prio_list_iterator = reversed(lists)
-    result = next(high_to_low_prio_list_iterator)
-    for list in high_to_low_prio_list_iterator:
-        result = list_mergeby(list, result, index, recursive, list_merge)
-
-    return result
+    return merge_lists_by(lists, index, recursive, list_merge)
 
 
 class FilterModule:
@@ -72,6 +72,14 @@ options:
     type: str
     default: default
     version_added: 6.2.0
+  max_connections:
+    description:
+      - Maximum number of concurrent connections used to read the instances from LXD servers that cannot return all instances
+        with their state in one request, and to read the network states.
+      - Newer LXD servers return all instances with their state in a single request, in which case this option has no effect.
+    type: int
+    default: 8
+    version_added: 12.2.0
   type_filter:
     description:
       - Filter the instances by type V(virtual-machine), V(container) or V(both).
@@ -305,7 +313,13 @@ class InventoryModule(BaseInventoryPlugin):
         for url in urls:
             try:
                 socket_connection = LXDClient(
-                    url, self.client_key, self.client_cert, self.debug, self.server_cert, self.server_check_hostname
+                    url,
+                    self.client_key,
+                    self.client_cert,
+                    self.debug,
+                    self.server_cert,
+                    self.server_check_hostname,
+                    max_connections=self.max_connections,
                 )
                 return socket_connection
             except LXDClientException as err:
@@ -368,6 +382,67 @@ class InventoryModule(BaseInventoryPlugin):
 
         return [m.split("/")[3] for m in instances["metadata"]]
 
+    def _get_instances_recursive(self):
+        """Get all instances including their state
+
+        Read all instances with their state in one request, using the recursion
+        of the LXD API
+
+        Args:
+            None
+        Kwargs:
+            None
+        Source:
+            https://documentation.ubuntu.com/lxd/en/latest/rest-api/#recursion
+        Raises:
+            None
+        Returns:
+            dict(instances): instance configs by name, in the format of get_instance_data(),
+                             or None if the server does not support it"""
+        params = dict(recursion=2)
+        if self.project:
+            params["project"] = self.project
+        try:
+            response = self.socket.do("GET", f"/1.0/instances?{urlencode(params)}")
+        except LXDClientException:
+            return None
+
+        envelope = {k: v for k, v in response.items() if k != "metadata"}
+        instances = {}
+        for metadata in response["metadata"]:
+            # older servers ignore the recursion level and return URLs or instances without state
+            if not isinstance(metadata, dict) or "state" not in metadata:
+                return None
+            metadata = dict(metadata)
+            state = metadata.pop("state")
+            metadata.pop("snapshots", None)
+            metadata.pop("backups", None)
+            instances[metadata["name"]] = {
+                "instances": dict(envelope, metadata=metadata),
+                "state": dict(envelope, metadata=state),
+            }
+        return instances
+
+    def _get_config_url(self, branch, name):
+        """Get the URL of the config of an instance
+
+        Args:
+            str(branch): Name oft the API-Branch
+            str(name): Name of instance
+        Kwargs:
+            None
+        Raises:
+            None
+        Returns:
+            str(url): URL of the config of the instance"""
+        if isinstance(branch, (tuple, list)):
+            return f"/1.0/{to_native(branch[0])}/{to_native(name)}/{to_native(branch[1])}?{urlencode(dict(project=self.project))}"
+        return f"/1.0/{to_native(branch)}/{to_native(name)}?{urlencode(dict(project=self.project))}"
+
+    @staticmethod
+    def _branch_key(branch):
+        return branch[1] if isinstance(branch, (tuple, list)) else branch
+
     def _get_config(self, branch, name):
         """Get inventory of instance
 
@@ -384,21 +459,33 @@ class InventoryModule(BaseInventoryPlugin):
             None
         Returns:
             dict(config): Config of the instance"""
-        config = {}
-        if isinstance(branch, (tuple, list)):
-            config[name] = {
-                branch[1]: self.socket.do(
-                    "GET",
-                    f"/1.0/{to_native(branch[0])}/{to_native(name)}/{to_native(branch[1])}?{urlencode(dict(project=self.project))}",
-                )
-            }
-        else:
-            config[name] = {
-                branch: self.socket.do(
-                    "GET", f"/1.0/{to_native(branch)}/{to_native(name)}?{urlencode(dict(project=self.project))}"
-                )
-            }
-        return config
+        return {name: {self._branch_key(branch): self.socket.do("GET", self._get_config_url(branch, name))}}
+
+    def _get_configs(self, branches, names, return_exceptions=False):
+        """Get inventory of several instances
+
+        Get the configs of all branches of all instances with concurrent requests
+
+        Args:
+            list(branches): Names oft the API-Branches
+            list(names): Names of the instances
+        Kwargs:
+            bool(return_exceptions): Store a LXDClientException in place of a failed branch
+        Source:
+            https://documentation.ubuntu.com/lxd/en/latest/rest-api/
+        Raises:
+            LXDClientException
+        Returns:
+            dict(configs): Configs of the instances by name"""
+        requests = [(name, branch) for name in names for branch in branches]
+        responses = self.socket.do_many(
+            [dict(method="GET", url=self._get_config_url(branch, name)) for name, branch in requests],
+            return_exceptions=return_exceptions,
+        )
+        configs = {name: {} for name in names}
+        for (name, branch), response in zip(requests, responses):
+            configs[name][self._branch_key(branch)] = response
+        return configs
 
     def get_instance_data(self, names):
         """Create Inventory of the instance
@@ -416,11 +503,7 @@ class InventoryModule(BaseInventoryPlugin):
         # tuple(('instances','metadata/templates')) to get section in branch
         # e.g. /1.0/instances/<name>/metadata/templates
         branches = ["instances", ("instances", "state")]
-        instance_config = {}
-        for branch in branches:
-            for name in names:
-                instance_config["instances"] = self._get_config(branch, name)
-                self.data = dict_merge(instance_config, self.data)
+        self.data.setdefault("instances", {}).update(self._get_configs(branches, names))
 
     def get_network_data(self, names):
         """Create Inventory of the instance
@@ -438,14 +521,10 @@ class InventoryModule(BaseInventoryPlugin):
         # tuple(('instances','metadata/templates')) to get section in branch
         # e.g. /1.0/instances/<name>/metadata/templates
         branches = [("networks", "state")]
-        network_config = {}
-        for branch in branches:
-            for name in names:
-                try:
-                    network_config["networks"] = self._get_config(branch, name)
-                except LXDClientException:
-                    network_config["networks"] = {name: None}
-                self.data = dict_merge(network_config, self.data)
+        networks = self.data.setdefault("networks", {})
+        for name, network_config in self._get_configs(branches, names, return_exceptions=True).items():
+            failed = any(isinstance(response, LXDClientException) for response in network_config.values())
+            networks[name] = None if failed else network_config
 
     def extract_network_information_from_instance_config(self, instance_name):
         """Returns the network interface configuration
@@ -1144,8 +1223,13 @@ class InventoryModule(BaseInventoryPlugin):
 
         if len(self.data) == 0:  # If no data is injected by unittests open socket
             self.socket = self._connect_to_socket()
-            self.get_instance_data(self._get_instances())
+            instances = self._get_instances_recursive()
+            if instances is not None:
+                self.data["instances"] = instances
+            else:
+                self.get_instance_data(self._get_instances())
             self.get_network_data(self._get_networks())
+            self.socket.close()
 
         # The first version of the inventory only supported containers.
         # This will change in the future.
@@ -1189,6 +1273,7 @@ class InventoryModule(BaseInventoryPlugin):
             self.server_cert = self.get_option("server_cert")
             self.server_check_hostname = self.get_option("server_check_hostname")
             self.project = self.get_option("project")
+            self.max_connections = self.get_option("max_connections")
             self.debug = self.DEBUG
             self.data = {}  # store for inventory-data
             self.groupby = self.get_option("groupby")
@@ -59,6 +59,23 @@ options:
         of query results. Leave empty to skip this check.
     type: int
     version_added: 10.4.0
+  snapshot:
+    description:
+      - List all items and collections of the vault (of the organization if O(organization_id) is set) once, and serve
+        lookups from an in-memory index of that listing instead of running the C(bw) CLI for every term.
+      - The listing is kept in memory of the process running the lookup for O(snapshot_ttl) seconds and shared by all
+        lookups in that process which use the same session and organization.
+      - With O(snapshot=true), O(search) compares the field with the term exactly, without a previous C(bw) search.
+    type: bool
+    default: false
+    version_added: 12.2.0
+  snapshot_ttl:
+    description:
+      - Number of seconds a listing made for O(snapshot) is reused before the vault is listed again.
+      - Use V(0) to list the vault again for every lookup.
+    type: int
+    default: 300
+    version_added: 12.2.0
 """
 
 EXAMPLES = r"""
@@ -102,6 +119,11 @@ EXAMPLES = r"""
     msg: >-
       {{ lookup('community.general.bitwarden', None, collection_name='my_collections/test_collection') }}
 
+- name: "Get 'password' of many records, listing the vault only once"
+  ansible.builtin.debug:
+    msg: >-
+      {{ query('community.general.bitwarden', 'db_primary', 'db_replica', 'api_gateway', field='password', snapshot=true) }}
+
 - name: "Get Bitwarden record named 'a_test', ensure there is exactly one match"
   ansible.builtin.debug:
     msg: >-
@@ -118,6 +140,7 @@ _raw:
   elements: list
 """
 
+import time
 from subprocess import Popen, PIPE
 
 from ansible.errors import AnsibleError, AnsibleOptionsError
@@ -130,10 +153,33 @@ class BitwardenException(AnsibleError):
     pass
 
 
+class BitwardenSnapshot:
+    """Items and collections of a vault, listed once and indexed by field on first use."""
+
+    def __init__(self, items, collections, expires):
+        self.items = items
+        self.collections = collections
+        self.expires = expires
+        self._indexes = {}
+
+    def find(self, search_value, search_field):
+        if not search_value or not search_field:
+            return list(self.items)
+        index = self._indexes.get(search_field)
+        if index is None:
+            index = self._indexes[search_field] = {}
+            for item in self.items:
+                value = item.get(search_field)
+                if isinstance(value, str):
+                    index.setdefault(value, []).append(item)
+        return list(index.get(search_value, []))
+
+
 class Bitwarden:
     def __init__(self, path="bw"):
         self._cli_path = path
         self._session = None
+        self._snapshots = {}
 
     @property
     def cli_path(self):
@@ -166,9 +212,41 @@ class Bitwarden:
             raise BitwardenException(err)
         return to_text(out, errors="surrogate_or_strict"), to_text(err, errors="surrogate_or_strict")
 
-    def _get_matches(self, search_value, search_field, collection_id=None, organization_id=None):
+    def _list(self, what, organization_id=None):
+        params = ["list", what]
+        if organization_id:
+            params.extend(["--organizationid", organization_id])
+        out, err = self._run(params)
+        return AnsibleJSONDecoder().raw_decode(out)[0]
+
+    def cached_snapshot(self, organization_id=None):
+        """Return the snapshot of the vault for the current session and organization if it has not expired yet."""
+        snapshot = self._snapshots.get((self.session, organization_id))
+        if snapshot is not None and snapshot.expires > time.monotonic():
+            return snapshot
+        return None
+
+    def load_snapshot(self, organization_id=None, ttl=300):
+        """List all items and collections and keep them for ttl seconds."""
+        snapshot = BitwardenSnapshot(
+            self._list("items", organization_id),
+            self._list("collections", organization_id),
+            time.monotonic() + ttl,
+        )
+        self._snapshots[(self.session, organization_id)] = snapshot
+        return snapshot
+
+    def _get_matches(self, search_value, search_field, collection_id=None, organization_id=None, snapshot=None):
         """Return matching records whose search_field is equal to key."""
 
+        if snapshot is not None:
+            return [
+                item
+                for item in snapshot.find(search_value, search_field)
+                if (not collection_id or collection_id in (item.get("collectionIds") or []))
+                and (not organization_id or item.get("organizationId") == organization_id)
+            ]
+
         # Prepare set of params for Bitwarden CLI
         if search_field == "id":
             params = ["get", "item", search_value]
@@ -200,13 +278,16 @@ class Bitwarden:
             if not search_value or not search_field or item.get(search_field) == search_value
         ]
 
-    def get_field(self, field, search_value, search_field="name", collection_id=None, organization_id=None):
+    def get_field(
+        self, field, search_value, search_field="name", collection_id=None, organization_id=None, snapshot=None
+    ):
         """Return a list of the specified field for records whose search_field match search_value
         and filtered by collection if collection has been provided.
 
         If field is None, return the whole record for each match.
+        If snapshot is given, the records are taken from it instead of asking the CLI.
         """
-        matches = self._get_matches(search_value, search_field, collection_id, organization_id)
+        matches = self._get_matches(search_value, search_field, collection_id, organization_id, snapshot)
         if not field:
             return matches
         field_matches = []
@@ -233,9 +314,17 @@ class Bitwarden:
 
         return field_matches
 
-    def get_collection_ids(self, collection_name: str, organization_id=None) -> list[str]:
+    def get_collection_ids(self, collection_name: str, organization_id=None, snapshot=None) -> list[str]:
         """Return matching IDs of collections whose name is equal to collection_name."""
 
+        if snapshot is not None:
+            return [
+                item["id"]
+                for item in snapshot.collections
+                if str(item.get("name")).lower() == collection_name.lower()
+                and (not organization_id or item.get("organizationId") == organization_id)
+            ]
+
         # Prepare set of params for Bitwarden CLI
         params = ["list", "collections", "--search", collection_name]
 
@@ -262,23 +351,30 @@ class LookupModule(LookupBase):
         result_count = self.get_option("result_count")
         _bitwarden.session = self.get_option("bw_session")
 
-        if not _bitwarden.unlocked:
+        snapshot = None
+        if self.get_option("snapshot"):
+            snapshot = _bitwarden.cached_snapshot(organization_id)
+
+        if snapshot is None and not _bitwarden.unlocked:
             raise AnsibleError("Bitwarden Vault locked. Run 'bw unlock'.")
 
+        if self.get_option("snapshot") and snapshot is None:
+            snapshot = _bitwarden.load_snapshot(organization_id, self.get_option("snapshot_ttl"))
+
         if not terms:
             terms = [None]
 
         if collection_name and collection_id:
             raise AnsibleOptionsError("'collection_name' and 'collection_id' are mutually exclusive!")
         elif collection_name:
-            collection_ids = _bitwarden.get_collection_ids(collection_name, organization_id)
+            collection_ids = _bitwarden.get_collection_ids(collection_name, organization_id, snapshot)
             if not collection_ids:
                 raise BitwardenException("No matching collections found!")
         else:
             collection_ids = [collection_id]
 
         results = [
-            _bitwarden.get_field(field, term, search_field, collection_id, organization_id)
+            _bitwarden.get_field(field, term, search_field, collection_id, organization_id, snapshot)
             for collection_id in collection_ids
             for term in terms
         ]
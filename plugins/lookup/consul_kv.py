@@ -84,6 +84,22 @@ options:
     ini:
       - section: lookup_consul
         key: url
+  cache:
+    description:
+      - Keep the values read in memory of the process running the lookup, together with the C(X-Consul-Index) they were
+        read at, and serve later lookups of the same key or prefix from there instead of asking Consul again.
+      - A lookup with O(index) is served from memory when the values were read at that index or a later one, as a
+        blocking query would return immediately in that case.
+      - Values changed in Consul after they were read are not seen by the process anymore.
+    type: bool
+    default: false
+    version_added: 12.2.0
+notes:
+  - The Consul client is created once for every O(url), O(host), O(port), O(scheme), O(validate_certs), O(client_cert) and
+    O(token) combination and reused by all lookups in the same process.
+  - Single keys without O(index) and O(datacenter) are read together in transactions of up to 64 keys, so that many terms
+    only take a few requests. If Consul refuses a transaction, for example because one of the keys does not exist, its keys
+    are read one by one.
 """
 
 EXAMPLES = r"""
@@ -110,6 +126,8 @@ _raw:
   type: dict
 """
 
+import base64
+import typing as t
 from urllib.parse import urlparse
 
 from ansible.errors import AnsibleError, AnsibleAssertionError
@@ -123,6 +141,14 @@ try:
 except ImportError:
     HAS_CONSUL = False
 
+# Largest number of operations Consul accepts in a single transaction
+TXN_MAX_OPS = 64
+
+# Consul clients, and values read with the cache option, shared by all lookups of this process
+_clients: dict[tuple[t.Any, ...], t.Any] = {}
+# (index the values were read at, or None if not known, values)
+_cache: dict[tuple[t.Any, ...], tuple[int | None, list[str]]] = {}
+
 
 class LookupModule(LookupBase):
     def run(self, terms, variables=None, **kwargs):
@@ -148,31 +174,91 @@ class LookupModule(LookupBase):
 
         validate_certs = self.get_option("validate_certs")
         client_cert = self.get_option("client_cert")
+        use_cache = self.get_option("cache")
+
+        client_key = (host, port, scheme, validate_certs, client_cert)
+
+        def get_client(token):
+            # The transaction endpoint only uses the token the client was created with
+            consul_api = _clients.get((client_key, token))
+            if consul_api is None:
+                consul_api = consul.Consul(
+                    host=host, port=port, scheme=scheme, verify=validate_certs, cert=client_cert, token=token
+                )
+                _clients[(client_key, token)] = consul_api
+            return consul_api
+
+        requests = [self.parse_params(term) for term in terms]
+        found = {}
+        batches = {}
+        for i, params in enumerate(requests):
+            cache_key = (client_key, params["key"], params["recurse"], params["token"], params["datacenter"])
+            if use_cache and cache_key in _cache:
+                index, values = _cache[cache_key]
+                if params["index"] is None or (index is not None and index >= int(params["index"])):
+                    found[i] = values
+                    continue
+            if params["index"] is None and params["datacenter"] is None and not params["recurse"]:
+                batches.setdefault(params["token"], []).append(i)
+
+        for token, batch in batches.items():
+            for offset in range(0, len(batch), TXN_MAX_OPS):
+                chunk = batch[offset : offset + TXN_MAX_OPS]
+                try:
+                    results = self.read_keys(get_client(token), [requests[i]["key"] for i in chunk])
+                except Exception as e:
+                    raise AnsibleError(f"Error locating '{terms[chunk[0]]}' in kv store. Error was {e}") from e
+                if results is not None:
+                    found.update(zip(chunk, results))
+
+        for i, params in enumerate(requests):
+            if i in found:
+                index = None
+            else:
+                try:
+                    index, found[i] = self.read(get_client(params["token"]), params)
+                except Exception as e:
+                    raise AnsibleError(f"Error locating '{terms[i]}' in kv store. Error was {e}") from e
+            if use_cache:
+                cache_key = (client_key, params["key"], params["recurse"], params["token"], params["datacenter"])
+                if index is not None or cache_key not in _cache:
+                    _cache[cache_key] = (index, found[i])
 
+        return [value for i in range(len(requests)) for value in found[i]]
+
+    def read(self, consul_api, params):
+        """Read a key, or all keys below a prefix, return the index they were read at and their values."""
+        index, results = consul_api.kv.get(
+            params["key"],
+            token=params["token"],
+            index=params["index"],
+            recurse=params["recurse"],
+            dc=params["datacenter"],
+        )
         values = []
+        if results:
+            # responds with a single or list of result maps
+            if isinstance(results, list):
+                for r in results:
+                    values.append(to_text(r["Value"]))
+            else:
+                values.append(to_text(results["Value"]))
+        return int(index) if index is not None else None, values
+
+    def read_keys(self, consul_api, keys):
+        """Read single keys in one transaction, return the values of every key, or None if Consul refused it."""
+        payload = [{"KV": {"Verb": "get", "Key": key}} for key in keys]
         try:
-            for term in terms:
-                params = self.parse_params(term)
-                consul_api = consul.Consul(host=host, port=port, scheme=scheme, verify=validate_certs, cert=client_cert)
-
-                results = consul_api.kv.get(
-                    params["key"],
-                    token=params["token"],
-                    index=params["index"],
-                    recurse=params["recurse"],
-                    dc=params["datacenter"],
-                )
-                if results[1]:
-                    # responds with a single or list of result maps
-                    if isinstance(results[1], list):
-                        for r in results[1]:
-                            values.append(to_text(r["Value"]))
-                    else:
-                        values.append(to_text(results[1]["Value"]))
-        except Exception as e:
-            raise AnsibleError(f"Error locating '{term}' in kv store. Error was {e}") from e
-
-        return values
+            response = consul_api.txn.put(payload)
+        except consul.ConsulException:
+            return None
+        if not response or response.get("Errors") or len(response.get("Results") or []) != len(keys):
+            return None
+        results = []
+        for result in response["Results"]:
+            value = result["KV"]["Value"]
+            results.append([to_text(base64.b64decode(value) if value is not None else value)])
+        return results
 
     def parse_params(self, term):
         params = term.split(" ")
@@ -101,7 +101,24 @@ options:
     default: 53
     type: int
     version_added: 9.5.0
+  cache:
+    description:
+      - Cache the answers in memory of the process running the lookup, and answer repeated queries from there for as long
+        as the TTL of the answer allows.
+      - The cache is shared by all dig lookups of that process.
+    default: false
+    type: bool
+    version_added: 12.2.0
+  max_workers:
+    description:
+      - Number of queries sent at the same time if more than one domain is given.
+      - Use V(1) to send the queries one after the other.
+    default: 10
+    type: int
+    version_added: 12.2.0
 notes:
+  - The resolvers are created once for every combination of name servers, O(port) and O(retry_servfail), and reused by all
+    dig lookups of the same process.
   - V(ALL) is not a record in itself, merely the listed fields are available for any record results you retrieve in the form
     of a dictionary.
   - While the plugin supports anything which C(dnspython) supports out of the box, only a subset can be converted into a dictionary.
@@ -245,6 +262,8 @@ from ansible.plugins.lookup import LookupBase
 from ansible.module_utils.parsing.convert_bool import boolean
 from ansible.utils.display import Display
 import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import dns.exception
@@ -283,6 +302,41 @@ except ImportError:
 
 display = Display()
 
+# Resolvers shared by all lookups of this process, keyed by their settings, and the cache
+# they share when the cache option is enabled
+_resolvers: dict[tuple[tuple[str, ...], int | None, bool, bool], dns.resolver.Resolver] = {}
+_cache: dns.resolver.LRUCache | None = None
+_lock = threading.Lock()
+
+
+def get_resolver(nameservers=(), port=None, retry_servfail=False, cache=False):
+    global _cache
+
+    key = (tuple(nameservers), port, retry_servfail, cache)
+    with _lock:
+        resolver = _resolvers.get(key)
+        if resolver is None:
+            resolver = dns.resolver.Resolver(configure=True)
+            resolver.use_edns(0, ednsflags=dns.flags.DO, payload=4096)
+            resolver.retry_servfail = retry_servfail
+            if port:
+                resolver.port = port
+            if nameservers:
+                resolver.nameservers = list(nameservers)
+            if cache:
+                if _cache is None:
+                    _cache = dns.resolver.LRUCache()
+                resolver.cache = _cache
+            _resolvers[key] = resolver
+    return resolver
+
+
+def resolve(resolver, qname, *args, **kwargs):
+    # Resolver.query() is deprecated since dnspython 2.0, and is resolve() with search=True
+    if hasattr(resolver, "resolve"):
+        return resolver.resolve(qname, *args, search=True, **kwargs)
+    return resolver.query(qname, *args, **kwargs)
+
 
 def make_rdata_dict(rdata):
     """While the 'dig' lookup plugin supports anything which dnspython supports
@@ -371,11 +425,6 @@ class LookupModule(LookupBase):
 
         self.set_options(var_options=variables, direct=kwargs)
 
-        # Create Resolver object so that we can set NS if necessary
-        myres = dns.resolver.Resolver(configure=True)
-        edns_size = 4096
-        myres.use_edns(0, ednsflags=dns.flags.DO, payload=edns_size)
-
         domains = []
         nameservers = []
         qtype = self.get_option("qtype")
@@ -384,11 +433,13 @@ class LookupModule(LookupBase):
         real_empty = self.get_option("real_empty")
         tcp = self.get_option("tcp")
         port = self.get_option("port")
+        cache = self.get_option("cache")
+        max_workers = self.get_option("max_workers")
         try:
             rdclass = dns.rdataclass.from_text(self.get_option("class"))
         except Exception as e:
             raise AnsibleError(f"dns lookup illegal CLASS: {e}") from e
-        myres.retry_servfail = self.get_option("retry_servfail")
+        retry_servfail = self.get_option("retry_servfail")
 
         for t in terms:
             if t.startswith("@"):  # e.g. "@10.0.1.2,192.0.2.1" is ok.
@@ -402,7 +453,7 @@ class LookupModule(LookupBase):
                         nameservers.append(ns)
                     except Exception:
                         try:
-                            nsaddr = dns.resolver.query(ns)[0].address
+                            nsaddr = resolve(get_resolver(cache=cache), ns)[0].address
                             nameservers.append(nsaddr)
                         except Exception as e:
                             raise AnsibleError(f"dns lookup NS: {e}") from e
@@ -423,7 +474,7 @@ class LookupModule(LookupBase):
                     except Exception as e:
                         raise AnsibleError(f"dns lookup illegal CLASS: {e}") from e
                 elif opt == "retry_servfail":
-                    myres.retry_servfail = boolean(arg)
+                    retry_servfail = boolean(arg)
                 elif opt == "fail_on_error":
                     fail_on_error = boolean(arg)
                 elif opt == "real_empty":
@@ -444,10 +495,7 @@ class LookupModule(LookupBase):
 
         # print "--- domain = {domain} qtype={qtype} rdclass={rdclass}"
 
-        if port:
-            myres.port = port
-        if len(nameservers) > 0:
-            myres.nameservers = nameservers
+        myres = get_resolver(nameservers, port, retry_servfail, cache)
 
         if qtype.upper() == "PTR":
             reversed_domains = []
@@ -464,11 +512,10 @@ class LookupModule(LookupBase):
         if len(domains) > 1:
             real_empty = True
 
-        ret = []
-
-        for domain in domains:
+        def query(domain):
+            ret = []
             try:
-                answers = myres.query(domain, qtype, rdclass=rdclass, tcp=tcp)
+                answers = resolve(myres, domain, qtype, rdclass=rdclass, tcp=tcp)
                 for rdata in answers:
                     s = rdata.to_text()
                     if qtype.upper() == "TXT":
@@ -503,4 +550,12 @@ class LookupModule(LookupBase):
             except dns.exception.DNSException as err:
                 raise AnsibleError(f"dns.resolver unhandled exception {err}") from err
 
-        return ret
+            return ret
+
+        if max_workers > 1 and len(domains) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(domains))) as executor:
+                results = list(executor.map(query, domains))
+        else:
+            results = [query(domain) for domain in domains]
+
+        return [value for result in results for value in result]
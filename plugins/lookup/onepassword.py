@@ -75,9 +75,11 @@ _raw:
 """
 
 import abc
+import hashlib
 import os
 import json
 import subprocess
+import time
 
 from ansible.plugins.lookup import LookupBase
 from ansible.errors import AnsibleLookupError, AnsibleOptionsError
@@ -86,6 +88,10 @@ from ansible.module_utils.common.text.converters import to_bytes, to_text
 
 from ansible_collections.community.general.plugins.module_utils.onepassword import OnePasswordConfig
 
+# Sessions and items shared by all lookups of this process when cache_ttl is set, with their expiry time
+_sessions: dict[str, tuple[float, bool, str | None]] = {}
+_items: dict[tuple[str, str, str, str | None, str], tuple[float, str]] = {}
+
 
 def _lower_if_possible(value):
     """Return the lower case version value, otherwise return the value"""
@@ -97,6 +103,8 @@ def _lower_if_possible(value):
 
 class OnePassCLIBase(metaclass=abc.ABCMeta):
     bin = "op"
+    # What get_raw() returns, so that cached results of different CLI classes are not mixed up
+    raw_kind = "item"
 
     def __init__(
         self,
@@ -549,7 +557,7 @@ class OnePassCLIv2(OnePassCLIBase):
         environment_update = {"OP_SECRET_KEY": self.secret_key}
         return self._run(args, command_input=to_bytes(self.master_password), environment_update=environment_update)
 
-    def _add_parameters_and_run(self, args, vault=None, token=None):
+    def _add_parameters_and_run(self, args, vault=None, token=None, command_input=None):
         if self.account_id:
             args.extend(["--account", self.account_id])
 
@@ -563,23 +571,49 @@ class OnePassCLIv2(OnePassCLIBase):
                 "OP_CONNECT_HOST": self.connect_host,
                 "OP_CONNECT_TOKEN": self.connect_token,
             }
-            return self._run(args, environment_update=environment_update)
+            return self._run(args, command_input=command_input, environment_update=environment_update)
 
         if self.service_account_token:
             if vault is None:
                 raise AnsibleLookupError("'vault' is required with 'service_account_token'")
             environment_update = {"OP_SERVICE_ACCOUNT_TOKEN": self.service_account_token}
-            return self._run(args, environment_update=environment_update)
+            return self._run(args, command_input=command_input, environment_update=environment_update)
 
         if token is not None:
             args += [to_bytes("--session=") + token]
 
-        return self._run(args)
+        return self._run(args, command_input=command_input)
 
     def get_raw(self, item_id, vault=None, token=None):
         args = ["item", "get", item_id, "--format", "json"]
         return self._add_parameters_and_run(args, vault=vault, token=token)
 
+    def list_items(self, vault=None, token=None):
+        """Return the summaries of all items, of the vault if given"""
+        rc, out, err = self._add_parameters_and_run(["item", "list", "--format", "json"], vault=vault, token=token)
+        return json.loads(out)
+
+    def get_items(self, summaries, vault=None, token=None):
+        """Return the items of the summaries returned by list_items(), fetched by a single op call"""
+        rc, out, err = self._add_parameters_and_run(
+            ["item", "get", "-", "--format", "json"],
+            vault=vault,
+            token=token,
+            command_input=to_bytes(json.dumps(summaries)),
+        )
+        # op prints one JSON document per item
+        out = to_text(out)
+        decoder = json.JSONDecoder()
+        items = []
+        pos = 0
+        while True:
+            while pos < len(out) and out[pos].isspace():
+                pos += 1
+            if pos == len(out):
+                return items
+            item, pos = decoder.raw_decode(out, pos)
+            items.append(item)
+
     def signin(self):
         self._check_required_params(["master_password"])
 
@@ -603,6 +637,7 @@ class OnePass:
         connect_host=None,
         connect_token=None,
         cli_class=None,
+        cache_ttl=0,
     ):
         self.subdomain = subdomain
         self.domain = domain
@@ -614,8 +649,10 @@ class OnePass:
         self.connect_host = connect_host
         self.connect_token = connect_token
 
+        self.cache_ttl = cache_ttl
         self.logged_in = False
         self.token = None
+        self._cached_session = False
 
         self._config = OnePasswordConfig()
         self._cli = self._get_cli_class(cli_class)
@@ -681,7 +718,33 @@ class OnePass:
             rc, out, err = self._cli.full_signin()
             self.token = out.strip()
 
+    @property
+    def _account_key(self):
+        # The credentials are part of the key, so that a lookup with wrong credentials never gets a cached session
+        parts = [
+            self.subdomain,
+            self.domain,
+            self.username,
+            self.account_id,
+            self.secret_key,
+            self.master_password,
+            self.service_account_token,
+            self.connect_host,
+            self.connect_token,
+        ]
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def _item_key(self, item_id, vault):
+        return self._account_key, self._cli.supports_version, self._cli.raw_kind, vault, item_id
+
     def assert_logged_in(self):
+        if self.cache_ttl:
+            session = _sessions.get(self._account_key)
+            if session is not None and session[0] > time.monotonic():
+                expires, self.logged_in, self.token = session
+                self._cached_session = True
+                return
+
         logged_in = self._cli.assert_logged_in()
         if logged_in:
             self.logged_in = logged_in
@@ -689,10 +752,73 @@ class OnePass:
         else:
             self.set_token()
 
+        self._cached_session = False
+        if self.cache_ttl:
+            _sessions[self._account_key] = (time.monotonic() + self.cache_ttl, self.logged_in, self.token)
+
     def get_raw(self, item_id, vault=None):
-        rc, out, err = self._cli.get_raw(item_id, vault, self.token)
+        if not self.cache_ttl:
+            rc, out, err = self._cli.get_raw(item_id, vault, self.token)
+            return out
+
+        key = self._item_key(item_id, vault)
+        cached = _items.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        try:
+            rc, out, err = self._cli.get_raw(item_id, vault, self.token)
+        except AnsibleLookupError:
+            if not self._cached_session:
+                raise
+            # The session taken from the cache may have expired in the meantime
+            _sessions.pop(self._account_key, None)
+            self.assert_logged_in()
+            rc, out, err = self._cli.get_raw(item_id, vault, self.token)
+
+        _items[key] = (time.monotonic() + self.cache_ttl, out)
         return out
 
+    def prefetch(self, item_ids, vault=None):
+        """Fetch the items which are not cached yet with one op call, if the cache is enabled and the CLI supports it.
+
+        Items that cannot be identified unambiguously from their summary are left to get_raw().
+        """
+        if not self.cache_ttl or self._cli.raw_kind != "item" or not hasattr(self._cli, "get_items"):
+            return
+
+        now = time.monotonic()
+        missing = [
+            item_id
+            for item_id in dict.fromkeys(item_ids)
+            if _items.get(self._item_key(item_id, vault), (now,))[0] <= now
+        ]
+        if len(missing) < 2:
+            return
+
+        try:
+            summaries = self._cli.list_items(vault, self.token)
+            wanted = {}
+            for item_id in missing:
+                matches = [
+                    summary
+                    for summary in summaries
+                    if summary.get("id") == item_id or _lower_if_possible(summary.get("title")) == item_id.lower()
+                ]
+                if len(matches) == 1:
+                    wanted.setdefault(matches[0]["id"], []).append(item_id)
+            if not wanted:
+                return
+            items = self._cli.get_items([s for s in summaries if s.get("id") in wanted], vault, self.token)
+        except (AnsibleLookupError, ValueError):
+            # Leave it to get_raw(), which also takes care of an expired session
+            return
+
+        expires = time.monotonic() + self.cache_ttl
+        for item in items:
+            for item_id in wanted.get(item.get("id"), []):
+                _items[self._item_key(item_id, vault)] = (expires, json.dumps(item))
+
     def get_field(self, item_id, field, section=None, vault=None):
         output = self.get_raw(item_id, vault)
         if output:
@@ -728,8 +854,10 @@ class LookupModule(LookupBase):
             account_id=account_id,
             connect_host=connect_host,
             connect_token=connect_token,
+            cache_ttl=self.get_option("cache_ttl"),
         )
         op.assert_logged_in()
+        op.prefetch(terms, vault)
 
         values = []
         for term in terms:
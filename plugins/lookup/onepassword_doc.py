@@ -48,6 +48,8 @@ from ansible.plugins.lookup import LookupBase
 
 
 class OnePassCLIv2Doc(OnePassCLIv2):
+    raw_kind = "document"
+
     def get_raw(self, item_id, vault=None, token=None):
         args = ["document", "get", item_id]
         return self._add_parameters_and_run(args, vault=vault, token=token)
@@ -79,6 +81,7 @@ class LookupModule(LookupBase):
             connect_host=connect_host,
             connect_token=connect_token,
             cli_class=OnePassCLIv2Doc,
+            cache_ttl=self.get_option("cache_ttl"),
         )
         op.assert_logged_in()
 
@@ -105,7 +105,9 @@ class LookupModule(LookupBase):
             connect_host=connect_host,
             connect_token=connect_token,
             cli_class=OnePassCLIv2,
+            cache_ttl=self.get_option("cache_ttl"),
         )
         op.assert_logged_in()
+        op.prefetch(terms, vault)
 
         return [self.get_ssh_key(op.get_raw(term, vault), term, ssh_format=ssh_format) for term in terms]
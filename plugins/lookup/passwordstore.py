@@ -156,8 +156,39 @@ options:
     ini:
       - section: passwordstore_lookup
         key: missing_subkey
+  cache:
+    description:
+      - Keep the decrypted entries in memory of the process running the lookup, and reuse them for later lookups of the
+        same entry in the same store as long as its file was not modified.
+      - Ansible runs lookups in a worker process forked for every task and host, so the cache only benefits lookups
+        of the same task on the same host, for example in a loop. It is not shared between tasks, hosts, or workers.
+      - Entries are dropped from the cache when the lookup writes them.
+      - Entries which are not stored in a C(.gpg) or C(.age) file below O(directory), for example entries of mounted gopass
+        stores, are not cached.
+    type: bool
+    default: false
+    ini:
+      - section: passwordstore_lookup
+        key: cache
+    version_added: 12.2.0
+  max_workers:
+    description:
+      - Number of entries decrypted at the same time if more than one term is given.
+      - Neither C(pass) nor C(gopass) can show several entries in one invocation, so this runs one command for every
+        entry in parallel instead.
+      - Running gpg-agent in parallel may need C(auto-expand-secmem), see above. The entries are always decrypted one after
+        the other with O(lock=readwrite).
+      - Use V(1) to decrypt the entries one after the other.
+    type: int
+    default: 1
+    ini:
+      - section: passwordstore_lookup
+        key: max_workers
+    version_added: 12.2.0
 notes:
   - The lookup supports passing all options as lookup parameters since community.general 6.0.0.
+  - Every entry is decrypted only once per lookup, also if several terms refer to it.
+  - Whether O(backend=pass) is the standard C(pass) utility is only checked once per process.
 """
 EXAMPLES = r"""
 ansible.cfg: |
@@ -240,6 +271,7 @@ _raw:
   elements: str
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 import os
 import re
@@ -259,6 +291,21 @@ from ansible_collections.community.general.plugins.module_utils._filelock import
 
 display = Display()
 
+# Shared by all lookups of this process: whether a pass command is the standard pass utility,
+# and the decrypted entries by (command, directory, passname) with the stat of their file
+_realpass: dict[str, bool] = {}
+_entry_cache: dict[tuple[str, str, str], tuple[tuple[str, int, int, int], list[str]]] = {}
+
+
+def _entry_stat(directory, passname):
+    for ext in (".gpg", ".age"):
+        try:
+            st = os.stat(os.path.join(directory, f"{passname}{ext}"))
+        except OSError:
+            continue
+        return ext, st.st_mtime_ns, st.st_size, st.st_ino
+    return None
+
 
 # backhacked check_output with input for python 2.7
 # http://stackoverflow.com/questions/10103551/passing-data-to-subprocess-check-output
@@ -297,21 +344,17 @@ def check_output2(*popenargs, **kwargs):
 
 
 class LookupModule(LookupBase):
-    def __init__(self, loader=None, templar=None, **kwargs):
-        super().__init__(loader, templar, **kwargs)
-        self.realpass = None
-
     def is_real_pass(self):
-        if self.realpass is None:
+        if self.pass_cmd not in _realpass:
             try:
                 passoutput = to_text(
                     check_output2([self.pass_cmd, "--version"], env=self.env), errors="surrogate_or_strict"
                 )
-                self.realpass = "pass: the standard unix password manager" in passoutput
+                _realpass[self.pass_cmd] = "pass: the standard unix password manager" in passoutput
             except subprocess.CalledProcessError as e:
                 raise AnsibleError(f"exit code {e.returncode} while running {e.cmd}. Error output: {e.output}") from e
 
-        return self.realpass
+        return _realpass[self.pass_cmd]
 
     def parse_params(self, term):
         # I went with the "traditional" param followed with space separated KV pairs.
@@ -369,11 +412,59 @@ class LookupModule(LookupBase):
                 else:
                     self.env["PASSWORD_STORE_UMASK"] = self.paramvals["umask"]
 
-    def check_pass(self):
-        try:
-            self.passoutput = to_text(
+    def show(self):
+        """Return the lines of the decrypted entry, reusing the ones read before if its file did not change since."""
+        shown = self.shown.get((self.paramvals["directory"], self.passname))
+        if shown is not None:
+            return list(shown)
+
+        key = (self.pass_cmd, self.paramvals["directory"], self.passname)
+        stat = _entry_stat(self.paramvals["directory"], self.passname) if self.get_option("cache") else None
+        cached = _entry_cache.get(key)
+        if stat is not None and cached is not None and cached[0] == stat:
+            lines = cached[1]
+        else:
+            lines = to_text(
                 check_output2([self.pass_cmd, "show"] + [self.passname], env=self.env), errors="surrogate_or_strict"
             ).splitlines()
+            if stat is not None:
+                _entry_cache[key] = (stat, lines)
+        self.shown[(self.paramvals["directory"], self.passname)] = lines
+        return list(lines)
+
+    def forget(self):
+        self.shown.pop((self.paramvals["directory"], self.passname), None)
+        _entry_cache.pop((self.pass_cmd, self.paramvals["directory"], self.passname), None)
+
+    def prefetch(self, terms):
+        """Decrypt the entries of all terms at the same time, see O(max_workers)."""
+        paramvals = dict(self.paramvals)
+        entries = {}
+        for term in terms:
+            if term.split():
+                self.parse_params(term)
+                entries.setdefault((self.paramvals["directory"], self.passname), self.env)
+        self.paramvals = paramvals
+        if len(entries) < 2:
+            return
+
+        def show(entry):
+            (directory, passname), env = entry
+            try:
+                output = check_output2([self.pass_cmd, "show", passname], env=env)
+            except subprocess.CalledProcessError:
+                # check_pass() shows the entry again and handles the error
+                return None
+            return to_text(output, errors="surrogate_or_strict").splitlines()
+
+        with ThreadPoolExecutor(max_workers=min(self.get_option("max_workers"), len(entries))) as executor:
+            for key, lines in zip(entries, executor.map(show, entries.items())):
+                if lines is not None:
+                    self.shown[key] = lines
+
+    def check_pass(self):
+        try:
+            self.passoutput = self.show()
             self.password = self.passoutput[0]
             self.passdict = {}
             try:
@@ -456,6 +547,7 @@ class LookupModule(LookupBase):
                 if self.paramvals["timestamp"] and self.paramvals["backup"]:
                     msg += f"lookup_pass: old password was {self.password} (Updated on {datetime})\n"
 
+        self.forget()
         try:
             check_output2([self.pass_cmd, "insert", "-f", "-m", self.passname], input=msg, env=self.env)
         except subprocess.CalledProcessError as e:
@@ -477,6 +569,7 @@ class LookupModule(LookupBase):
         if self.paramvals["timestamp"]:
             msg += f"\nlookup_pass: First generated by ansible on {datetime}\n"
 
+        self.forget()
         try:
             check_output2([self.pass_cmd, "insert", "-f", "-m", self.passname], input=msg, env=self.env)
         except subprocess.CalledProcessError as e:
@@ -522,6 +615,7 @@ class LookupModule(LookupBase):
         self.backend = self.get_option("backend")
         self.pass_cmd = self.backend  # pass and gopass are commands as well
         self.locked = None
+        self.shown: dict[tuple[str, str], list[str]] = {}
         timeout = self.get_option("locktimeout")
         if not re.match("^[0-9]+[smh]$", timeout):
             raise AnsibleError(f"{timeout} is not a correct value for locktimeout")
@@ -561,6 +655,9 @@ class LookupModule(LookupBase):
         self.setup(variables)
         result = []
 
+        if len(terms) > 1 and self.get_option("max_workers") > 1 and self.get_option("lock") != "readwrite":
+            self.prefetch(terms)
+
         for term in terms:
             self.parse_params(term)  # parse the input into paramvals
             with self.opt_lock("readwrite"):
@@ -580,6 +677,7 @@ class LookupModule(LookupBase):
                 else:  # password does not exist
                     if self.paramvals["missing"] == "create":
                         with self.opt_lock("write"):
+                            self.forget()  # another lookup may have created it while waiting for the lock
                             if (
                                 self.locked == "write" and self.check_pass()
                             ):  # lookup password again if under write lock
@@ -5,15 +5,23 @@
 from __future__ import annotations
 
 import copy
+import hashlib
 import json
+import os
+import tempfile
+import threading
+import time
 import traceback
 import typing as t
+from pathlib import Path
 from urllib.parse import urlencode, quote
 from urllib.error import HTTPError
 
 from ansible.module_utils.urls import open_url
 from ansible.module_utils.common.text.converters import to_native, to_text
 
+from ansible_collections.community.general.plugins.module_utils._filelock import FileLock, LockTimeout
+
 if t.TYPE_CHECKING:
     from collections.abc import Sequence
     from ansible.module_utils.basic import AnsibleModule
@@ -95,6 +103,7 @@ URL_CLIENT_USER_ROLEMAPPINGS_COMPOSITE = (
 )
 
 URL_REALM_GROUP_ROLEMAPPINGS = "{url}/admin/realms/{realm}/groups/{group}/role-mappings/realm"
+URL_GROUP_ROLEMAPPINGS = "{url}/admin/realms/{realm}/groups/{id}/role-mappings"
 
 URL_CLIENTSECRET = "{url}/admin/realms/{realm}/clients/{id}/client-secret"
 
@@ -163,6 +172,7 @@ def keycloak_argument_spec() -> dict[str, t.Any]:
         token=dict(type="str", no_log=True),
         refresh_token=dict(type="str", no_log=True),
         http_agent=dict(type="str", default="Ansible"),
+        token_cache_file=dict(type="path"),
     )
 
 
@@ -179,9 +189,8 @@ class KeycloakError(Exception):
         return str(self.msg)
 
 
-def _token_request(module_params: dict[str, t.Any], payload: dict[str, t.Any]) -> str:
-    """Obtains connection header with token for the authentication,
-    using the provided auth_username/auth_password
+def _token_response(module_params: dict[str, t.Any], payload: dict[str, t.Any]) -> dict[str, t.Any]:
+    """Runs a request against the token endpoint
     :param module_params: parameters of the module
     :param payload:
        type:
@@ -192,7 +201,7 @@ def _token_request(module_params: dict[str, t.Any], payload: dict[str, t.Any]) -
            along with parameters based on 'grant_type'; e.g.,
            'username'/'password' for type 'password',
            'refresh_token' for type 'refresh_token'.
-    :return: access token
+    :return: token endpoint response, which includes at least 'access_token'
     """
     base_url = module_params["auth_keycloak_url"]
     if not base_url.lower().startswith(("http", "https")):
@@ -214,38 +223,66 @@ def _token_request(module_params: dict[str, t.Any], payload: dict[str, t.Any]) -
                 data=urlencode(payload),
             ).read()
         )
-
-        return r["access_token"]
     except ValueError as e:
         raise KeycloakError(f"API returned invalid JSON when trying to obtain access token from {auth_url}: {e}") from e
-    except KeyError as e:
-        raise KeycloakError(f"API did not include access_token field in response from {auth_url}") from e
     except Exception as e:
         raise KeycloakError(f"Could not obtain access token from {auth_url}: {e}", authError=e) from e
 
+    if not isinstance(r, dict) or "access_token" not in r:
+        raise KeycloakError(f"API did not include access_token field in response from {auth_url}")
+    return r
 
-def _request_token_using_credentials(module_params: dict[str, t.Any]) -> str:
+
+def _token_request(module_params: dict[str, t.Any], payload: dict[str, t.Any]) -> str:
     """Obtains connection header with token for the authentication,
     using the provided auth_username/auth_password
-    :param module_params: parameters of the module. Must include 'auth_username' and 'auth_password'.
-    :return: connection header
+    :param module_params: parameters of the module
+    :param payload: authentication request payload, see _token_response()
+    :return: access token
     """
-    client_id = module_params.get("auth_client_id")
-    auth_username = module_params.get("auth_username")
-    auth_password = module_params.get("auth_password")
-    client_secret = module_params.get("auth_client_secret")
+    return _token_response(module_params, payload)["access_token"]
 
+
+def _credentials_payload(module_params: dict[str, t.Any]) -> dict[str, t.Any]:
     temp_payload = {
         "grant_type": "password",
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "username": auth_username,
-        "password": auth_password,
+        "client_id": module_params.get("auth_client_id"),
+        "client_secret": module_params.get("auth_client_secret"),
+        "username": module_params.get("auth_username"),
+        "password": module_params.get("auth_password"),
+    }
+    # Remove empty items, for instance missing client_secret
+    return {k: v for k, v in temp_payload.items() if v is not None}
+
+
+def _refresh_token_payload(module_params: dict[str, t.Any], refresh_token: str | None) -> dict[str, t.Any]:
+    temp_payload = {
+        "grant_type": "refresh_token",
+        "client_id": module_params.get("auth_client_id"),
+        "client_secret": module_params.get("auth_client_secret"),
+        "refresh_token": refresh_token,
     }
     # Remove empty items, for instance missing client_secret
-    payload = {k: v for k, v in temp_payload.items() if v is not None}
+    return {k: v for k, v in temp_payload.items() if v is not None}
+
 
-    return _token_request(module_params, payload)
+def _client_credentials_payload(module_params: dict[str, t.Any]) -> dict[str, t.Any]:
+    temp_payload = {
+        "grant_type": "client_credentials",
+        "client_id": module_params.get("auth_client_id"),
+        "client_secret": module_params.get("auth_client_secret"),
+    }
+    # Remove empty items, for instance missing client_secret
+    return {k: v for k, v in temp_payload.items() if v is not None}
+
+
+def _request_token_using_credentials(module_params: dict[str, t.Any]) -> str:
+    """Obtains connection header with token for the authentication,
+    using the provided auth_username/auth_password
+    :param module_params: parameters of the module. Must include 'auth_username' and 'auth_password'.
+    :return: connection header
+    """
+    return _token_request(module_params, _credentials_payload(module_params))
 
 
 def _request_token_using_refresh_token(module_params: dict[str, t.Any]) -> str:
@@ -254,20 +291,7 @@ def _request_token_using_refresh_token(module_params: dict[str, t.Any]) -> str:
     :param module_params: parameters of the module. Must include 'refresh_token'.
     :return: connection header
     """
-    client_id = module_params.get("auth_client_id")
-    refresh_token = module_params.get("refresh_token")
-    client_secret = module_params.get("auth_client_secret")
-
-    temp_payload = {
-        "grant_type": "refresh_token",
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "refresh_token": refresh_token,
-    }
-    # Remove empty items, for instance missing client_secret
-    payload = {k: v for k, v in temp_payload.items() if v is not None}
-
-    return _token_request(module_params, payload)
+    return _token_request(module_params, _refresh_token_payload(module_params, module_params.get("refresh_token")))
 
 
 def _request_token_using_client_credentials(module_params: dict[str, t.Any]) -> str:
@@ -279,36 +303,161 @@ def _request_token_using_client_credentials(module_params: dict[str, t.Any]) ->
     and 'auth_client_secret'..
     :return: connection header
     """
-    client_id = module_params.get("auth_client_id")
-    client_secret = module_params.get("auth_client_secret")
+    return _token_request(module_params, _client_credentials_payload(module_params))
+
+
+def _auth_payload(module_params: dict[str, t.Any]) -> dict[str, t.Any]:
+    """Returns the token request payload for the credentials given to the module"""
+    auth_client_id = module_params.get("auth_client_id")
+    auth_client_secret = module_params.get("auth_client_secret")
+    auth_username = module_params.get("auth_username")
+    if auth_client_id is not None and auth_client_secret is not None and auth_username is None:
+        return _client_credentials_payload(module_params)
+    return _credentials_payload(module_params)
+
+
+TOKEN_CACHE_EXPIRY_MARGIN = 30
+"""Cached tokens which expire in less than this many seconds are not used anymore."""
+
+
+def _token_cache_key(module_params: dict[str, t.Any], payload: dict[str, t.Any]) -> str:
+    # The credentials are part of the key, so that a task with wrong credentials never gets a cached token
+    parts = [module_params["auth_keycloak_url"].rstrip("/"), module_params.get("auth_realm"), sorted(payload.items())]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
 
-    temp_payload = {
-        "grant_type": "client_credentials",
-        "client_id": client_id,
-        "client_secret": client_secret,
-    }
-    # Remove empty items, for instance missing client_secret
-    payload = {k: v for k, v in temp_payload.items() if v is not None}
 
-    return _token_request(module_params, payload)
+def _token_cache_entry(response: dict[str, t.Any], now: float) -> dict[str, t.Any]:
+    entry = {"access_token": response["access_token"], "expires_at": now + float(response.get("expires_in") or 0)}
+    if response.get("refresh_token"):
+        entry["refresh_token"] = response["refresh_token"]
+        # Keycloak reports 0 for offline tokens, which do not expire
+        refresh_expires_in = response.get("refresh_expires_in")
+        entry["refresh_expires_at"] = now + float(refresh_expires_in) if refresh_expires_in else None
+    return entry
+
+
+def _token_cache_access_valid(entry: dict[str, t.Any], now: float) -> bool:
+    return entry.get("expires_at", 0) > now + TOKEN_CACHE_EXPIRY_MARGIN
+
+
+def _token_cache_refresh_valid(entry: dict[str, t.Any], now: float) -> bool:
+    if not entry.get("refresh_token"):
+        return False
+    refresh_expires_at = entry.get("refresh_expires_at")
+    return refresh_expires_at is None or refresh_expires_at > now + TOKEN_CACHE_EXPIRY_MARGIN
+
+
+def _load_token_cache(path: str) -> dict[str, dict[str, t.Any]]:
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        # A damaged cache is not fatal, it only means new tokens have to be requested
+        return {}
+    if not isinstance(data, dict) or data.get("version") != 1 or not isinstance(data.get("tokens"), dict):
+        return {}
+    return data["tokens"]
+
+
+def _save_token_cache(path: str, tokens: dict[str, dict[str, t.Any]]) -> None:
+    now = time.time()
+    tokens = {
+        key: entry
+        for key, entry in tokens.items()
+        if _token_cache_access_valid(entry, now) or _token_cache_refresh_valid(entry, now)
+    }
+    # mkstemp() creates the file readable and writable by the owner only
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".keycloak-token-cache-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump({"version": 1, "tokens": tokens}, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _token_cache_lock(module_params: dict[str, t.Any], path: str) -> t.ContextManager[None]:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    lock_timeout = max(3 * (module_params.get("connection_timeout") or 10), 30)
+    return FileLock().lock_file(Path(path), Path(directory), lock_timeout=lock_timeout)
+
+
+def _get_cached_token(module_params: dict[str, t.Any], path: str) -> str:
+    """Returns an access token from the token cache file, renewing it if needed.
+    A cached access token is used as long as it does not expire. After that,
+    the cached refresh token is used to get a new access token, and only when
+    this is not possible, the module's credentials are used.
+    The cache file is locked while doing this, so that concurrent modules wait
+    for the first one to obtain a token instead of each requesting their own.
+    :param module_params: parameters of the module
+    :param path: path of the token cache file
+    :return: access token
+    """
+    path = os.path.abspath(path)
+    payload = _auth_payload(module_params)
+    key = _token_cache_key(module_params, payload)
+    try:
+        with _token_cache_lock(module_params, path):
+            tokens = _load_token_cache(path)
+            now = time.time()
+            entry = tokens.get(key)
+            if entry is not None and _token_cache_access_valid(entry, now):
+                return entry["access_token"]
+
+            response = None
+            if entry is not None and _token_cache_refresh_valid(entry, now):
+                try:
+                    response = _token_response(
+                        module_params, _refresh_token_payload(module_params, entry["refresh_token"])
+                    )
+                except KeycloakError:
+                    # The session may have ended on the server, fall back to the credentials
+                    pass
+            if response is None:
+                response = _token_response(module_params, payload)
+
+            tokens[key] = _token_cache_entry(response, now)
+            _save_token_cache(path, tokens)
+            return response["access_token"]
+    except LockTimeout as e:
+        raise KeycloakError(f"Timed out waiting for the lock of the token cache file {path}") from e
+    except OSError as e:
+        raise KeycloakError(f"Could not use the token cache file {path}: {e}") from e
+
+
+def _drop_cached_token(module_params: dict[str, t.Any]) -> None:
+    """Removes the token of the module's credentials from the token cache file, if there is one"""
+    path = module_params.get("token_cache_file")
+    if not path or module_params.get("token") is not None:
+        return
+    path = os.path.abspath(path)
+    key = _token_cache_key(module_params, _auth_payload(module_params))
+    try:
+        with _token_cache_lock(module_params, path):
+            tokens = _load_token_cache(path)
+            if tokens.pop(key, None) is not None:
+                _save_token_cache(path, tokens)
+    except (LockTimeout, OSError):
+        pass
 
 
 def get_token(module_params: dict[str, t.Any]) -> dict[str, str]:
     """Obtains connection header with token for the authentication,
-    token already given or obtained from credentials
+    token already given, cached in the token cache file, or obtained from credentials
     :param module_params: parameters of the module
     :return: connection header
     """
     token = module_params.get("token")
 
     if token is None:
-        auth_client_id = module_params.get("auth_client_id")
-        auth_client_secret = module_params.get("auth_client_secret")
-        auth_username = module_params.get("auth_username")
-        if auth_client_id is not None and auth_client_secret is not None and auth_username is None:
-            token = _request_token_using_client_credentials(module_params)
+        if module_params.get("token_cache_file"):
+            token = _get_cached_token(module_params, module_params["token_cache_file"])
         else:
-            token = _request_token_using_credentials(module_params)
+            token = _token_request(module_params, _auth_payload(module_params))
 
     return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
 
@@ -377,6 +526,9 @@ class KeycloakAPI:
     is obtained through OpenID connect
     """
 
+    page_size = 100
+    """Number of entries requested per page by the iter_* methods."""
+
     def __init__(self, module: AnsibleModule, connection_header: dict[str, str]) -> None:
         self.module = module
         self.baseurl = self.module.params.get("auth_keycloak_url")
@@ -384,6 +536,10 @@ class KeycloakAPI:
         self.connection_timeout = self.module.params.get("connection_timeout")
         self.restheaders = connection_header
         self.http_agent = self.module.params.get("http_agent")
+        self.use_realm_snapshot = False
+        self._realm_snapshots: dict[str, KeycloakRealmSnapshot] = {}
+        # Serializes re-authentication when requests are sent from several threads
+        self._auth_lock = threading.Lock()
 
     def _request(self, url: str, method: str, data: str | bytes | None = None):
         """Makes a request to Keycloak and returns the raw response.
@@ -398,6 +554,9 @@ class KeycloakAPI:
         :param data: (optional) data for request
         :return: raw API response
         """
+        if method != "GET":
+            # Anything but a read may change what the realm snapshots hold
+            self._realm_snapshots.clear()
 
         def make_request_catching_401() -> object | HTTPError:
             try:
@@ -415,21 +574,46 @@ class KeycloakAPI:
                     raise e
                 return e
 
+        sent_authorization = self.restheaders.get("Authorization")
         r = make_request_catching_401()
 
+        if isinstance(r, HTTPError):
+            with self._auth_lock:
+                if self.restheaders.get("Authorization") == sent_authorization:
+                    r = self._reauthenticate(make_request_catching_401, r)
+                else:
+                    # Another thread re-authenticated while this request was sent
+                    r = make_request_catching_401()
+
         if isinstance(r, Exception):
-            # Try to refresh token and retry, if available
-            refresh_token = self.module.params.get("refresh_token")
-            if refresh_token is not None:
-                try:
-                    token = _request_token_using_refresh_token(self.module.params)
-                    self.restheaders["Authorization"] = f"Bearer {token}"
+            # Either no re-auth options were available, or they all failed
+            raise r
 
-                    r = make_request_catching_401()
-                except KeycloakError as e:
-                    # Token refresh returns 400 if token is expired/invalid, so continue on if we get a 400
-                    if e.authError is not None and e.authError.code != 400:  # type: ignore # TODO!
-                        raise e
+        return r
+
+    def _reauthenticate(self, make_request, r: HTTPError):
+        """Obtains a new token after a request was answered with a 401,
+        stores it in the restheaders and repeats the request.
+
+        :param make_request: function sending the request, returning the HTTPError of a 401
+        :param r: the HTTPError of the 401
+        :return: raw API response, or the HTTPError if the request was answered with a 401 again
+        """
+        # A cached token may have been revoked, do not hand it out again
+        _drop_cached_token(self.module.params)
+
+        # Try to refresh token and retry, if available
+        refresh_token = self.module.params.get("refresh_token")
+        if refresh_token is not None:
+            try:
+                token = _request_token_using_refresh_token(self.module.params)
+                self.restheaders["Authorization"] = f"Bearer {token}"
+
+                r = make_request()
+            except KeycloakError as e:
+                # Token refresh returns 400 if token is expired/invalid, so continue on if we get a 400
+                if e.authError is not None and e.authError.code != 400:  # type: ignore # TODO!
+                    raise e
 
         if isinstance(r, Exception):
             # Try to re-auth with username/password, if available
@@ -439,7 +623,7 @@ class KeycloakAPI:
                 token = _request_token_using_credentials(self.module.params)
                 self.restheaders["Authorization"] = f"Bearer {token}"
 
-                r = make_request_catching_401()
+                r = make_request()
 
         if isinstance(r, Exception):
             # Try to re-auth with client_id and client_secret, if available
@@ -450,16 +634,12 @@ class KeycloakAPI:
                     token = _request_token_using_client_credentials(self.module.params)
                     self.restheaders["Authorization"] = f"Bearer {token}"
 
-                    r = make_request_catching_401()
+                    r = make_request()
                 except KeycloakError as e:
                     # Token refresh returns 400 if token is expired/invalid, so continue on if we get a 400
                     if e.authError is not None and e.authError.code != 400:  # type: ignore # TODO!
                         raise e
 
-        if isinstance(r, Exception):
-            # Either no re-auth options were available, or they all failed
-            raise r
-
         return r
 
     def _request_and_deserialize(self, url: str, method: str, data: str | bytes | None = None):
@@ -472,6 +652,35 @@ class KeycloakAPI:
         """
         return json.loads(self._request(url, method, data).read())
 
+    def _paginate(self, url: str, **query: t.Any) -> t.Iterator[dict[str, t.Any]]:
+        """Yields the entries of a collection resource, requesting one page of
+        self.page_size entries at a time with the 'first' and 'max' query parameters.
+
+        :param url: collection URL, without query string
+        :param query: additional query parameters
+        :return: generator of entries
+        """
+        first = 0
+        while True:
+            params = dict(query, first=first, max=self.page_size)
+            page = self._request_and_deserialize(f"{url}?{urlencode(params)}", method="GET")
+            yield from page
+            if len(page) < self.page_size:
+                return
+            first += len(page)
+
+    def realm_snapshot(self, realm: str = "master") -> KeycloakRealmSnapshot:
+        """Returns the snapshot of a realm, which loads groups, clients, roles and users
+        once and answers lookups from memory. The snapshot is dropped as soon as
+        this object sends a request that may change the realm.
+
+        :param realm: realm of the snapshot
+        :return: KeycloakRealmSnapshot
+        """
+        if realm not in self._realm_snapshots:
+            self._realm_snapshots[realm] = KeycloakRealmSnapshot(self, realm)
+        return self._realm_snapshots[realm]
+
     def get_realm_info_by_id(self, realm: str = "master") -> dict[str, t.Any] | None:
         """Obtain realm public info by id
 
@@ -609,12 +818,30 @@ class KeycloakAPI:
         except Exception as e:
             self.fail_request(e, msg=f"Could not obtain list of clients for realm {realm}: {e}")
 
+    def iter_clients(self, realm: str = "master"):
+        """Obtains client representations for all clients in a realm, one page at a time
+
+        :param realm: realm to be queried
+        :return: generator of dicts of client representations
+        """
+        clientlist_url = URL_CLIENTS.format(url=self.baseurl, realm=realm)
+        try:
+            yield from self._paginate(clientlist_url)
+        except ValueError as e:
+            self.module.fail_json(
+                msg=f"API returned incorrect JSON when trying to obtain list of clients for realm {realm}: {e}"
+            )
+        except Exception as e:
+            self.fail_request(e, msg=f"Could not obtain list of clients for realm {realm}: {e}")
+
     def get_client_by_clientid(self, client_id, realm: str = "master"):
         """Get client representation by clientId
         :param client_id: The clientId to be queried
         :param realm: realm from which to obtain the client representation
         :return: dict with a client representation or None if none matching exist
         """
+        if self.use_realm_snapshot:
+            return self.realm_snapshot(realm).get_client_by_clientid(client_id)
         r = self.get_clients(realm=realm, filter=client_id)
         if len(r) > 0:
             return r[0]
@@ -996,6 +1223,8 @@ class KeycloakAPI:
         :param username: Username of the user to fetch.
         :param realm: Realm in which the user resides; default 'master'
         """
+        if self.use_realm_snapshot:
+            return self.realm_snapshot(realm).get_user_by_username(username)
         users_url = URL_USERS.format(url=self.baseurl, realm=realm)
         users_url += f"?username={username}&exact=true"
         try:
@@ -1014,6 +1243,23 @@ class KeycloakAPI:
         except Exception as e:
             self.fail_request(e, msg=f"Could not obtain the user for realm {realm} and username {username}: {e}")
 
+    def iter_users(self, realm: str = "master", **query):
+        """Fetch all keycloak users within a realm, one page at a time.
+
+        :param realm: Realm in which the users reside; default 'master'
+        :param query: Additional query parameters, for example search, username, email or briefRepresentation
+        :return: generator of user representations
+        """
+        users_url = URL_USERS.format(url=self.baseurl, realm=realm)
+        try:
+            yield from self._paginate(users_url, **query)
+        except ValueError as e:
+            self.module.fail_json(
+                msg=f"API returned incorrect JSON when trying to obtain the users of realm {realm}: {e}"
+            )
+        except Exception as e:
+            self.fail_request(e, msg=f"Could not obtain the users of realm {realm}: {e}")
+
     def get_service_account_user_by_client_id(self, client_id, realm: str = "master"):
         """Fetch a keycloak service account user within a realm based on its client_id.
 
@@ -1598,6 +1844,67 @@ class KeycloakAPI:
         except Exception as e:
             self.fail_request(e, msg=f"Could not fetch list of groups in realm {realm}: {e}")
 
+    def iter_groups(self, realm: str = "master", brief: bool = True):
+        """Fetch all toplevel groups of a realm, one page at a time.
+
+        :param realm: Return the groups of this realm (default "master").
+        :param brief: Whether to omit the attributes and role mappings of the groups
+        :return: generator of group representations
+        """
+        groups_url = URL_GROUPS.format(url=self.baseurl, realm=realm)
+        try:
+            yield from self._paginate(groups_url, briefRepresentation=str(brief).lower())
+        except Exception as e:
+            self.fail_request(e, msg=f"Could not fetch list of groups in realm {realm}: {e}")
+
+    def iter_subgroups(self, parent, realm: str = "master", brief: bool = True):
+        """Fetch the direct subgroups of a group, one page at a time when needed.
+
+        :param parent: Representation of the parent group
+        :param realm: Realm in which the group resides; default 'master'
+        :param brief: Whether to omit the attributes and role mappings of the groups
+        :return: generator of group representations
+        """
+        if "subGroupCount" not in parent:
+            # Before version 23, Keycloak returns all subgroups with their parent
+            yield from parent.get("subGroups", [])
+            return
+        if parent["subGroupCount"] == 0:
+            return
+        group_children_url = URL_GROUP_CHILDREN.format(url=self.baseurl, realm=realm, groupid=parent["id"])
+        try:
+            yield from self._paginate(group_children_url, briefRepresentation=str(brief).lower())
+        except Exception as e:
+            self.fail_request(e, msg=f"Could not fetch subgroups of group {parent['id']} in realm {realm}: {e}")
+
+    def get_group_rolemappings(self, gid, realm: str = "master"):
+        """Fetch the realm and client role mappings of a group.
+
+        :param gid: UUID of the group
+        :param realm: Realm in which the group resides; default 'master'
+        :return: dict with the keys 'realmMappings' and 'clientMappings', as returned by Keycloak
+        """
+        rolemappings_url = URL_GROUP_ROLEMAPPINGS.format(url=self.baseurl, realm=realm, id=gid)
+        try:
+            return self._request_and_deserialize(rolemappings_url, method="GET")
+        except Exception as e:
+            self.fail_request(e, msg=f"Could not fetch role mappings of group {gid} in realm {realm}: {e}")
+
+    def _list_groups(self, realm):
+        if self.use_realm_snapshot:
+            return self.realm_snapshot(realm).get_toplevel_groups()
+        return self.get_groups(realm=realm)
+
+    def _list_subgroups(self, parent, realm):
+        if self.use_realm_snapshot:
+            return self.realm_snapshot(realm).get_subgroups(parent["id"])
+        return self.get_subgroups(parent, realm)
+
+    def _group_by_id(self, gid, realm):
+        if self.use_realm_snapshot:
+            return self.realm_snapshot(realm).get_group_by_groupid(gid)
+        return self.get_group_by_groupid(gid, realm=realm)
+
     def get_group_by_groupid(self, gid, realm: str = "master"):
         """Fetch a keycloak group from the provided realm using the group's unique ID.
 
@@ -1652,13 +1959,13 @@ class KeycloakAPI:
                 if not parent:
                     return None
 
-                all_groups = self.get_subgroups(parent, realm)
+                all_groups = self._list_subgroups(parent, realm)
             else:
-                all_groups = self.get_groups(realm=realm)
+                all_groups = self._list_groups(realm)
 
             for group in all_groups:
                 if group["name"] == name:
-                    return self.get_group_by_groupid(group["id"], realm=realm)
+                    return self._group_by_id(group["id"], realm)
 
             return None
 
@@ -1691,7 +1998,7 @@ class KeycloakAPI:
         cp, is_id = self._get_normed_group_parent(cp)
 
         if is_id:
-            tmp = self.get_group_by_groupid(cp, realm=realm)
+            tmp = self._group_by_id(cp, realm)
         else:
             # given as name, assume toplvl group
             tmp = self.get_group_by_name(cp, realm=realm)
@@ -1700,7 +2007,7 @@ class KeycloakAPI:
             return None
 
         for p in name_chain[1:]:
-            for sg in self.get_subgroups(tmp, realm):
+            for sg in self._list_subgroups(tmp, realm):
                 pv, is_id = self._get_normed_group_parent(p)
 
                 if is_id:
@@ -1863,6 +2170,22 @@ class KeycloakAPI:
         except Exception as e:
             self.fail_request(e, msg=f"Could not obtain list of roles for realm {realm}: {e}")
 
+    def iter_realm_roles(self, realm: str = "master"):
+        """Obtains role representations for all roles in a realm, one page at a time
+
+        :param realm: realm to be queried
+        :return: generator of dicts of role representations
+        """
+        rolelist_url = URL_REALM_ROLES.format(url=self.baseurl, realm=realm)
+        try:
+            yield from self._paginate(rolelist_url)
+        except ValueError as e:
+            self.module.fail_json(
+                msg=f"API returned incorrect JSON when trying to obtain list of roles for realm {realm}: {e}"
+            )
+        except Exception as e:
+            self.fail_request(e, msg=f"Could not obtain list of roles for realm {realm}: {e}")
+
     def get_realm_role(self, name, realm: str = "master"):
         """Fetch a keycloak role from the provided realm using the role's name.
 
@@ -2962,8 +3285,10 @@ class KeycloakAPI:
         The path is formed by prepending a '/' character to `target` unless it's already present.
         This adds support for finding top level groups by name and subgroups by path.
         """
-        groups = self.get_groups(realm=realm)
         path = target if target.startswith("/") else f"/{target}"
+        if self.use_realm_snapshot:
+            return self.realm_snapshot(realm).get_group_by_path(path)
+        groups = self.get_groups(realm=realm)
         for segment in path.split("/"):
             if not segment:
                 continue
@@ -3245,3 +3570,114 @@ class KeycloakAPI:
             return self._request(execute_action_url, method="PUT", data=body)
         except Exception as e:
             self.fail_request(e, msg=f"Could not send execute actions email to user {user_id} in realm {realm}: {e}")
+
+
+class KeycloakRealmSnapshot:
+    """In-memory view of a realm, for modules which look up many groups, clients,
+    roles or users during one run.
+
+    Every part is loaded with paginated requests the first time it is needed,
+    and indexed, so that later lookups do not send any request. Lookups return
+    copies, callers may modify them. Use KeycloakAPI.realm_snapshot() to get the
+    snapshot of a realm instead of creating one directly.
+    """
+
+    def __init__(self, api: KeycloakAPI, realm: str) -> None:
+        self.api = api
+        self.realm = realm
+        self._groups: dict[str, dict[str, t.Any]] | None = None
+        self._group_paths: dict[str, str] = {}
+        self._group_children: dict[str | None, list[str]] = {}
+        self._group_rolemappings: dict[str, dict[str, t.Any]] = {}
+        self._clients: dict[str, dict[str, t.Any]] | None = None
+        self._client_ids: dict[str, str] = {}
+        self._client_roles: dict[str, dict[str, dict[str, t.Any]]] = {}
+        self._realm_roles: dict[str, dict[str, t.Any]] | None = None
+        self._users: dict[str, dict[str, t.Any]] | None = None
+
+    def _load_groups(self) -> dict[str, dict[str, t.Any]]:
+        if self._groups is None:
+            groups: dict[str, dict[str, t.Any]] = {}
+            pending: list[tuple[str | None, dict[str, t.Any]]] = [
+                (None, group) for group in self.api.iter_groups(realm=self.realm, brief=False)
+            ]
+            pending.reverse()
+            while pending:
+                parent_id, group = pending.pop()
+                groups[group["id"]] = group
+                self._group_paths[group["path"]] = group["id"]
+                self._group_children.setdefault(parent_id, []).append(group["id"])
+                children = list(self.api.iter_subgroups(group, realm=self.realm, brief=False))
+                pending.extend((group["id"], child) for child in reversed(children))
+            self._groups = groups
+        return self._groups
+
+    def get_toplevel_groups(self) -> list[dict[str, t.Any]]:
+        groups = self._load_groups()
+        return [copy.deepcopy(groups[gid]) for gid in self._group_children.get(None, [])]
+
+    def get_subgroups(self, gid: str) -> list[dict[str, t.Any]]:
+        groups = self._load_groups()
+        return [copy.deepcopy(groups[child]) for child in self._group_children.get(gid, [])]
+
+    def get_group_by_groupid(self, gid: str) -> dict[str, t.Any] | None:
+        group = self._load_groups().get(gid)
+        return copy.deepcopy(group) if group is not None else None
+
+    def get_group_by_path(self, path: str) -> dict[str, t.Any] | None:
+        self._load_groups()
+        gid = self._group_paths.get(path if path.startswith("/") else f"/{path}")
+        return self.get_group_by_groupid(gid) if gid is not None else None
+
+    def get_groups(self) -> list[dict[str, t.Any]]:
+        """Returns all groups of the realm, subgroups included, parents before their children."""
+        return [copy.deepcopy(group) for group in self._load_groups().values()]
+
+    def get_group_rolemappings(self, gid: str) -> dict[str, t.Any]:
+        if gid not in self._group_rolemappings:
+            self._group_rolemappings[gid] = self.api.get_group_rolemappings(gid, realm=self.realm)
+        return copy.deepcopy(self._group_rolemappings[gid])
+
+    def _load_clients(self) -> dict[str, dict[str, t.Any]]:
+        if self._clients is None:
+            self._clients = {client["id"]: client for client in self.api.iter_clients(realm=self.realm)}
+            self._client_ids = {client["clientId"]: client["id"] for client in self._clients.values()}
+        return self._clients
+
+    def get_clients(self) -> list[dict[str, t.Any]]:
+        return [copy.deepcopy(client) for client in self._load_clients().values()]
+
+    def get_client_by_id(self, cid: str) -> dict[str, t.Any] | None:
+        client = self._load_clients().get(cid)
+        return copy.deepcopy(client) if client is not None else None
+
+    def get_client_by_clientid(self, client_id: str) -> dict[str, t.Any] | None:
+        self._load_clients()
+        cid = self._client_ids.get(client_id)
+        return self.get_client_by_id(cid) if cid is not None else None
+
+    def get_client_role(self, cid: str, name: str) -> dict[str, t.Any] | None:
+        if cid not in self._client_roles:
+            roles = self.api.get_client_roles_by_id(cid, realm=self.realm)
+            self._client_roles[cid] = {role["name"]: role for role in roles}
+        role = self._client_roles[cid].get(name)
+        return copy.deepcopy(role) if role is not None else None
+
+    def get_realm_role(self, name: str) -> dict[str, t.Any] | None:
+        if self._realm_roles is None:
+            self._realm_roles = {role["name"]: role for role in self.api.iter_realm_roles(realm=self.realm)}
+        role = self._realm_roles.get(name)
+        return copy.deepcopy(role) if role is not None else None
+
+    def _load_users(self) -> dict[str, dict[str, t.Any]]:
+        if self._users is None:
+            self._users = {user["username"]: user for user in self.api.iter_users(realm=self.realm)}
+        return self._users
+
+    def get_users(self) -> list[dict[str, t.Any]]:
+        return [copy.deepcopy(user) for user in self._load_users().values()]
+
+    def get_user_by_username(self, username: str) -> dict[str, t.Any] | None:
+        # Keycloak stores usernames in lower case
+        user = self._load_users().get(username.lower())
+        return copy.deepcopy(user) if user is not None else None
@@ -17,6 +17,7 @@ import re
 import socket
 import uuid
 import typing as t
+from contextlib import contextmanager
 from urllib.parse import quote
 
 from ansible.module_utils.basic import env_fallback, AnsibleFallbackNotFound
@@ -44,7 +45,16 @@ def _env_then_dns_fallback(*args, **kwargs) -> str:
             raise AnsibleFallbackNotFound from None  # no need to pass the original exception's context since this is basically a special return value
 
 
+class _Batch:
+    def __init__(self):
+        self.calls = []
+        self.results = []
+
+
 class IPAClient:
+    # Largest number of calls sent in a single batch request
+    batch_size = 500
+
     def __init__(self, module: AnsibleModule, host, port, protocol):
         self.host = host
         self.port = port
@@ -53,6 +63,7 @@ class IPAClient:
         self.headers = None
         self.timeout = module.params.get("ipa_timeout")
         self.use_gssapi = False
+        self._batch = None
 
     def get_base_url(self) -> str:
         return f"{self.protocol}://{self.host}/ipa"
@@ -124,7 +135,6 @@ class IPAClient:
     def _post_json(self, method, name, item=None):
         if item is None:
             item = {}
-        url = f"{self.get_base_url()}/session/json"
         data = dict(method=method)
 
         # TODO: We should probably handle this a little better.
@@ -135,6 +145,17 @@ class IPAClient:
         else:
             data["params"] = [[name], item]
 
+        if self._batch is not None:
+            self._batch.calls.append(data)
+            return None
+
+        resp = self._send_json(method, data)
+        if "result" in resp:
+            return self._unwrap_result(resp.get("result"))
+        return None
+
+    def _send_json(self, method, data):
+        url = f"{self.get_base_url()}/session/json"
         try:
             resp, info = fetch_url(
                 module=self.module,
@@ -155,18 +176,47 @@ class IPAClient:
         err = resp.get("error")
         if err is not None:
             self._fail(f"response {method}", err)
+        return resp
 
-        if "result" in resp:
-            result = resp.get("result")
-            if "result" in result:
-                result = result.get("result")
-                if isinstance(result, list):
-                    if len(result) > 0:
-                        return result[0]
-                    else:
-                        return {}
-            return result
-        return None
+    @staticmethod
+    def _unwrap_result(result):
+        if "result" in result:
+            result = result.get("result")
+            if isinstance(result, list):
+                if len(result) > 0:
+                    return result[0]
+                else:
+                    return {}
+        return result
+
+    @contextmanager
+    def batch(self):
+        """Queue the calls made inside the block and send them to the server as a single ``batch`` request.
+
+        The methods called inside the block return ``None``; their results are available in
+        ``results`` of the yielded object, in call order, once the block has been left.
+        A failure of any of the calls fails the module. Nested blocks join the outermost batch.
+        """
+        if self._batch is not None:
+            yield self._batch
+            return
+
+        self._batch = batch = _Batch()
+        try:
+            yield batch
+        finally:
+            self._batch = None
+
+        for offset in range(0, len(batch.calls), self.batch_size):
+            calls = batch.calls[offset : offset + self.batch_size]
+            resp = self._send_json("batch", dict(method="batch", params=[calls, {}]))
+            results = (resp.get("result") or {}).get("results") or []
+            if len(results) != len(calls):
+                self._fail("response batch", f"expected {len(calls)} results, got {len(results)}")
+            for call, result in zip(calls, results):
+                if result.get("error") is not None:
+                    self._fail(f"response {call['method']}", {"message": result.get("error")})
+                batch.results.append(self._unwrap_result(result))
 
     def get_diff(self, ipa_data, module_data):
         result = []
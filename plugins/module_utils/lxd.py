@@ -8,9 +8,11 @@ from __future__ import annotations
 import http.client as http_client
 import json
 import os
+import queue
 import socket
 import ssl
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 
 from ansible.module_utils.urls import generic_urlparse
@@ -46,6 +48,7 @@ class LXDClient:
         debug: bool = False,
         server_cert_file: str | None = None,
         server_check_hostname: bool = True,
+        max_connections: int = 1,
     ) -> None:
         """LXD Client.
 
@@ -55,11 +58,14 @@ class LXDClient:
         :param debug: The debug flag. The request and response are stored in logs when debug is true.
         :param server_cert_file: The path of the server certificate file.
         :param server_check_hostname: Whether to check the server's hostname as part of TLS verification.
+        :param max_connections: The maximum number of connections used concurrently by do_many().
         """
         self.url = url
         self.debug = debug
+        self.max_connections = max_connections
         self.logs: list[dict[str, t.Any]] = []
         self.connection: UnixHTTPConnection | HTTPSConnection
+        self._ssl_context: ssl.SSLContext | None = None
         if url.startswith("https:"):
             self.cert_file = cert_file
             self.key_file = key_file
@@ -70,13 +76,32 @@ class LXDClient:
                 ctx.load_verify_locations(cafile=server_cert_file)
             ctx.check_hostname = server_check_hostname
             ctx.load_cert_chain(cert_file, keyfile=key_file)  # type: ignore # TODO!
-            self.connection = HTTPSConnection(parts.get("netloc"), context=ctx)
+            self._ssl_context = ctx
+            self._netloc = parts.get("netloc")
         elif url.startswith("unix:"):
-            unix_socket_path = url[len("unix:") :]
-            self.connection = UnixHTTPConnection(unix_socket_path)
+            self._unix_socket_path = url[len("unix:") :]
         else:
             raise LXDClientException("URL scheme must be unix: or https:")
 
+        # Idle keep-alive connections. The most recently used connection is reused
+        # first, since it is the least likely to have been closed by the server.
+        self._idle_connections: queue.LifoQueue[UnixHTTPConnection | HTTPSConnection] = queue.LifoQueue()
+        self.connection = self._new_connection()
+        self._idle_connections.put(self.connection)
+
+    def _new_connection(self) -> UnixHTTPConnection | HTTPSConnection:
+        if self._ssl_context is not None:
+            return HTTPSConnection(self._netloc, context=self._ssl_context)
+        return UnixHTTPConnection(self._unix_socket_path)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
+            try:
+                self._idle_connections.get_nowait().close()
+            except queue.Empty:
+                break
+
     def do(self, method: str, url: str, body_json=None, ok_error_codes=None, timeout=None, wait_for_container=None):
         resp_json = self._send_request(method, url, body_json=body_json, ok_error_codes=ok_error_codes, timeout=timeout)
         if resp_json["type"] == "async":
@@ -89,6 +114,32 @@ class LXDClient:
                 self._raise_err_from_json(resp_json)
         return resp_json
 
+    def do_many(self, requests, return_exceptions=False):
+        """Send several requests concurrently, over up to max_connections connections.
+
+        Asynchronous operations are waited for by the same worker that started them,
+        so the waits for several operations overlap.
+
+        :param requests: An iterable of dicts with the keyword arguments for do().
+        :param return_exceptions: Return a LXDClientException in place of the response of a failed
+            request, instead of raising the first one.
+        :return: The responses in the order of requests.
+        """
+        requests = list(requests)
+
+        def call(kwargs):
+            try:
+                return self.do(**kwargs)
+            except LXDClientException as e:
+                if return_exceptions:
+                    return e
+                raise
+
+        if self.max_connections <= 1 or len(requests) <= 1:
+            return [call(kwargs) for kwargs in requests]
+        with ThreadPoolExecutor(max_workers=min(self.max_connections, len(requests))) as executor:
+            return list(executor.map(call, requests))
+
     def authenticate(self, trust_password):
         body_json = {"type": "client", "password": trust_password}
         return self._send_request("POST", "/1.0/certificates", body_json=body_json)
@@ -96,10 +147,7 @@ class LXDClient:
     def _send_request(self, method: str, url: str, body_json=None, ok_error_codes=None, timeout=None):
         try:
             body = json.dumps(body_json)
-            self.connection.request(method, url, body=body)
-            resp = self.connection.getresponse()
-            resp_data = resp.read()
-            resp_json = json.loads(resp_data)
+            resp_json = self._send_on_idle_connection(method, url, body)
             self.logs.append(
                 {
                     "type": "sent request",
@@ -118,6 +166,34 @@ class LXDClient:
         except socket.error as e:
             raise LXDClientException("cannot connect to the LXD server", err=e) from e
 
+    def _send_on_idle_connection(self, method: str, url: str, body: str):
+        try:
+            connection = self._idle_connections.get_nowait()
+        except queue.Empty:
+            connection = self._new_connection()
+        try:
+            try:
+                return self._send_on_connection(connection, method, url, body)
+            except (http_client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # The server closed the kept-alive connection. Only resend requests
+                # that are safe to repeat, http.client reconnects on its own.
+                connection.close()
+                if method not in ("GET", "PUT", "DELETE"):
+                    raise
+                return self._send_on_connection(connection, method, url, body)
+        except BaseException:
+            connection.close()
+            raise
+        finally:
+            self._idle_connections.put(connection)
+
+    @staticmethod
+    def _send_on_connection(connection, method: str, url: str, body: str):
+        connection.request(method, url, body=body)
+        resp = connection.getresponse()
+        resp_data = resp.read()
+        return json.loads(resp_data)
+
     def _raise_err_from_json(self, resp_json):
         err_params = {}
         if self.debug:
@@ -4,20 +4,31 @@
 
 from __future__ import annotations
 
+import base64
+import copy
+import hashlib
 import http.client as http_client
+import io
 import json
 import os
 import random
 import string
+import tempfile
+import threading
 import time
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-from ansible.module_utils.urls import open_url
+from ansible.module_utils.urls import make_context, open_url
 from ansible.module_utils.common.text.converters import to_native
 from ansible.module_utils.common.text.converters import to_text
 from ansible.module_utils.common.text.converters import to_bytes
 from urllib.error import URLError, HTTPError
 from urllib.parse import urlparse
+from urllib.request import getproxies, proxy_bypass
+
+from ansible_collections.community.general.plugins.module_utils._filelock import FileLock, LockTimeout
 
 if t.TYPE_CHECKING:
     from ansible.module_utils.basic import AnsibleModule
@@ -49,10 +60,86 @@ REDFISH_COMMON_ARGUMENT_SPEC = {
         "type": "list",
         "elements": "str",
     },
+    "session_cache_file": {
+        "type": "path",
+    },
 }
 
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+
+class _BufferedResponse:
+    """
+    Response received over a pooled connection. The body has already been read,
+    so that the connection can be reused, and is served from memory.
+    """
+
+    def __init__(self, url: str, resp: http_client.HTTPResponse, body: bytes) -> None:
+        self.url = url
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.headers
+        self._body = io.BytesIO(body)
+
+    def read(self, amt: int | None = None) -> bytes:
+        return self._body.read(amt)
+
+    def info(self):
+        return self.headers
+
+    def getheader(self, name: str, default: str | None = None) -> str | None:
+        return self.headers.get(name, default)
+
+    def getcode(self) -> int:
+        return self.status
+
+    def geturl(self) -> str:
+        return self.url
+
+
+def _session_cache_key(root_uri: str, username: str, password: str) -> str:
+    # The password is part of the key, so that a changed password never picks up an old session
+    return hashlib.sha256(json.dumps([root_uri, username, password]).encode("utf-8")).hexdigest()
+
+
+def _load_session_cache(path: str) -> dict[str, dict[str, t.Any]]:
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        # A damaged cache is not fatal, it only means new sessions have to be created
+        return {}
+    if not isinstance(data, dict) or data.get("version") != 1 or not isinstance(data.get("sessions"), dict):
+        return {}
+    return data["sessions"]
+
+
+def _save_session_cache(path: str, sessions: dict[str, dict[str, t.Any]]) -> None:
+    # mkstemp() creates the file readable and writable by the owner only
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".redfish-session-cache-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump({"version": 1, "sessions": sessions}, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _session_cache_lock(path: str, timeout) -> t.ContextManager[None]:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    return FileLock().lock_file(Path(path), Path(directory), lock_timeout=max(3 * (timeout or 10), 30))
+
 
 class RedfishUtils:
+    # Maximum number of concurrent GET requests when walking resources
+    max_workers = 8
+    # Whether requests are sent over persistent connections instead of a new connection each
+    keep_alive = True
+
     def __init__(
         self,
         creds: dict[str, str],
@@ -63,6 +150,7 @@ class RedfishUtils:
         data_modification: bool = False,
         strip_etag_quotes: bool = False,
         ciphers: str | None = None,
+        cache_get_requests: bool = False,
     ) -> None:
         self.root_uri = root_uri
         self.creds = creds
@@ -78,6 +166,16 @@ class RedfishUtils:
         self._vendor = None
         self.validate_certs = module.params.get("validate_certs", False)
         self.ca_path = module.params.get("ca_path")
+        # Successful GET responses by URI, when cache_get_requests is set.
+        # Any other request empties the cache.
+        self.get_cache: dict[str, dict[str, t.Any]] | None = {} if cache_get_requests else None
+        self.session_cache_file = module.params.get("session_cache_file")
+        self._session_token: str | None = None
+        self._session_failed = False
+        self._session_lock = threading.Lock()
+        self._connections: dict[tuple[str, str], list[http_client.HTTPConnection]] = {}
+        self._connections_lock = threading.Lock()
+        self._ssl_context = None
 
     def _auth_params(self, headers: dict[str, str]) -> tuple[str | None, str | None, bool]:
         """
@@ -88,11 +186,12 @@ class RedfishUtils:
         :param headers: dict containing headers to send in request
         :return: tuple of username, password and force_basic_auth
         """
-        if self.creds.get("token"):
+        token = self.creds.get("token") or self._cached_session_token()
+        if token:
             username = None
             password = None
             force_basic_auth = False
-            headers["X-Auth-Token"] = self.creds["token"]
+            headers["X-Auth-Token"] = token
         else:
             username = self.creds["user"]
             password = self.creds["pswd"]
@@ -164,14 +263,205 @@ class RedfishUtils:
         kwargs.setdefault("timeout", self.timeout)
         kwargs.setdefault("ciphers", self.ciphers)
         kwargs.setdefault("ca_path", self.ca_path)
-        resp = open_url(uri, **kwargs)
+        if self.get_cache is not None and kwargs.get("method") != "GET":
+            self.get_cache.clear()
+        try:
+            resp = self._send(uri, **kwargs)
+        except HTTPError as e:
+            token = (kwargs.get("headers") or {}).get("X-Auth-Token")
+            if e.code != 401 or token is None or self.creds.get("token") or not self.session_cache_file:
+                raise
+            # The cached session has expired or was deleted, replace it once
+            self._drop_cached_session(token)
+            headers = dict(kwargs["headers"])
+            del headers["X-Auth-Token"]
+            new_token = self._cached_session_token()
+            if new_token:
+                headers["X-Auth-Token"] = new_token
+            else:
+                kwargs.update(url_username=self.creds["user"], url_password=self.creds["pswd"], force_basic_auth=True)
+            kwargs["headers"] = headers
+            resp = self._send(uri, **kwargs)
         headers = {k.lower(): v for (k, v) in resp.info().items()}
         return resp, headers
 
+    def _send(self, uri: str, **kwargs):
+        """
+        Send a request over a pooled persistent connection when possible,
+        otherwise with open_url().
+        """
+        parts = urlparse(uri)
+        pooled = self.keep_alive and parts.scheme in ("http", "https")
+        if pooled and kwargs.get("use_proxy", True):
+            # Leave proxies to open_url()
+            proxies = getproxies()
+            proxy = proxies.get(parts.scheme) or proxies.get("all")
+            pooled = not (proxy and not proxy_bypass(parts.hostname or ""))
+        if pooled and kwargs.get("url_username") and not kwargs.get("force_basic_auth"):
+            # Authentication in response to a challenge is left to open_url() as well
+            pooled = False
+        if not pooled:
+            return open_url(uri, **kwargs)
+
+        resp = self._pooled_request(parts, **kwargs)
+        if resp.status in REDIRECT_CODES:
+            return open_url(uri, **kwargs)
+        if resp.status >= 400:
+            raise HTTPError(uri, resp.status, resp.reason, resp.headers, resp._body)
+        return resp
+
+    def _get_connection(self, scheme: str, netloc: str) -> tuple[http_client.HTTPConnection, bool]:
+        """Return an idle connection to the host, or a new one, and whether it was used before."""
+        with self._connections_lock:
+            idle = self._connections.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+        if scheme == "http":
+            return http_client.HTTPConnection(netloc, timeout=self.timeout), False
+        if self._ssl_context is None:
+            ciphers = self.ciphers
+            if isinstance(ciphers, str):
+                ciphers = ciphers.split(":")
+            self._ssl_context = make_context(cafile=self.ca_path, ciphers=ciphers, validate_certs=self.validate_certs)
+        return http_client.HTTPSConnection(netloc, timeout=self.timeout, context=self._ssl_context), False
+
+    def _release_connection(self, scheme: str, netloc: str, conn: http_client.HTTPConnection) -> None:
+        with self._connections_lock:
+            idle = self._connections.setdefault((scheme, netloc), [])
+            if len(idle) < self.max_workers:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _pooled_request(
+        self,
+        parts,
+        method: str = "GET",
+        data=None,
+        headers: dict[str, str] | None = None,
+        url_username: str | None = None,
+        url_password: str | None = None,
+        force_basic_auth: bool = False,
+        timeout=None,
+        **kwargs,
+    ) -> _BufferedResponse:
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        req_headers = {"User-Agent": "ansible-httpget"}
+        req_headers.update(headers or {})
+        if force_basic_auth and url_username:
+            credentials = base64.b64encode(to_bytes(f"{url_username}:{url_password or ''}")).decode("ascii")
+            req_headers["Authorization"] = f"Basic {credentials}"
+        body = to_bytes(data, nonstring="passthru")
+
+        for attempt in range(2):
+            conn, reused = self._get_connection(parts.scheme, parts.netloc)
+            try:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                conn.request(method, target, body=body, headers=req_headers)
+                resp = conn.getresponse()
+                content = resp.read()
+            except (http_client.HTTPException, OSError) as e:
+                conn.close()
+                # The service may have closed an idle connection. Only requests that
+                # are safe to repeat are sent again, on a new connection.
+                if (
+                    reused
+                    and attempt == 0
+                    and method in ("GET", "HEAD", "PUT", "DELETE")
+                    and isinstance(e, (http_client.RemoteDisconnected, ConnectionResetError, BrokenPipeError))
+                ):
+                    continue
+                raise URLError(e) from e
+            break
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release_connection(parts.scheme, parts.netloc, conn)
+        return _BufferedResponse(f"{parts.scheme}://{parts.netloc}{target}", resp, content)
+
+    def _cached_session_token(self) -> str | None:
+        """
+        Return the X-Auth-Token of the session cached in the session cache file
+        for the credentials, creating a session if there is none. Return None
+        if there is no session cache file, or sessions cannot be used.
+        """
+        if not self.session_cache_file or self._session_failed or not self.creds.get("user"):
+            return None
+        with self._session_lock:
+            if self._session_token is not None or self._session_failed:
+                return self._session_token
+            path = os.path.abspath(self.session_cache_file)
+            key = _session_cache_key(self.root_uri, self.creds["user"], self.creds["pswd"])
+            try:
+                with _session_cache_lock(path, self.timeout):
+                    sessions = _load_session_cache(path)
+                    entry = sessions.get(key)
+                    if entry is None:
+                        entry = self._create_cached_session()
+                        if entry is None:
+                            self._session_failed = True
+                            return None
+                        sessions[key] = entry
+                        _save_session_cache(path, sessions)
+            except (LockTimeout, OSError) as e:
+                self.module.warn(f"Could not use the session cache file {path}, using basic authentication: {e}")
+                self._session_failed = True
+                return None
+            self._session_token = entry["token"]
+            return self._session_token
+
+    def _create_cached_session(self) -> dict[str, t.Any] | None:
+        payload = {"UserName": self.creds["user"], "Password": self.creds["pswd"]}
+        try:
+            resp, headers = self._request(
+                self.root_uri + self.sessions_uri,
+                method="POST",
+                data=json.dumps(payload),
+                headers=dict(POST_HEADERS),
+            )
+        except Exception as e:
+            self.module.warn(f"Could not create a session to cache, using basic authentication: {e}")
+            return None
+        if "x-auth-token" not in headers:
+            self.module.warn("The service did not return the X-Auth-Token header of the session to cache")
+            return None
+        location = headers.get("location")
+        return {
+            "token": headers["x-auth-token"],
+            "uri": urlparse(location).path if location else None,
+            "created": time.time(),
+        }
+
+    def _drop_cached_session(self, token: str) -> None:
+        """Remove the session with the given token from the session cache file."""
+        with self._session_lock:
+            if self._session_token == token:
+                self._session_token = None
+            path = os.path.abspath(self.session_cache_file)
+            key = _session_cache_key(self.root_uri, self.creds["user"], self.creds["pswd"])
+            try:
+                with _session_cache_lock(path, self.timeout):
+                    sessions = _load_session_cache(path)
+                    if sessions.get(key, {}).get("token") == token:
+                        del sessions[key]
+                        _save_session_cache(path, sessions)
+            except (LockTimeout, OSError):
+                pass
+
     # The following functions are to send GET/POST/PATCH/DELETE requests
     def get_request(
         self, uri: str, override_headers: dict[str, str] | None = None, allow_no_resp: bool = False, timeout=None
     ):
+        # Requests with their own headers may get a different answer, so they bypass the cache
+        cache = None if override_headers else self.get_cache
+        if cache is not None and uri in cache:
+            cached = cache[uri]
+            return dict(cached, data=copy.deepcopy(cached["data"]))
         req_headers = dict(GET_HEADERS)
         if override_headers:
             req_headers.update(override_headers)
@@ -212,8 +502,78 @@ class RedfishUtils:
         # Almost all errors should be caught above, but just in case
         except Exception as e:
             return {"ret": False, "msg": f"Failed GET request to '{uri}': '{e}'"}
+        if cache is not None:
+            cache[uri] = {"ret": True, "data": copy.deepcopy(data), "headers": headers, "resp": resp}
         return {"ret": True, "data": data, "headers": headers, "resp": resp}
 
+    def _expand_query(self) -> str | None:
+        """
+        Return the $expand query that loads the members of a collection along
+        with it, if the service supports one.
+
+        :return: value for the $expand query parameter or None
+        """
+        response = self.get_request(self.root_uri + self.service_root)
+        if response["ret"] is False:
+            return None
+        expand = (response["data"].get("ProtocolFeaturesSupported") or {}).get("ExpandQuery") or {}
+        if expand.get("NoLinks"):
+            query = "."
+        elif expand.get("ExpandAll"):
+            query = "*"
+        else:
+            return None
+        if expand.get("Levels"):
+            query += "($levels=1)"
+        return query
+
+    def _prefetch(self, uris):
+        """
+        GET the given URIs concurrently and store the responses in the GET
+        cache, so that walking them afterwards does not wait for the service.
+        Errors are not cached and show up when the URI is requested again.
+
+        :param uris: list of full URIs
+        """
+        if self.get_cache is None:
+            return
+        missing = [uri for uri in dict.fromkeys(uris) if uri not in self.get_cache]
+        if len(missing) < 2:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+            list(executor.map(self.get_request, missing))
+
+    def get_collection(self, uri: str):
+        """
+        GET a resource collection. With the GET cache enabled, the members of
+        the collection are loaded into the cache as well, with an $expand query
+        if the service supports one and with concurrent requests otherwise.
+
+        :param uri: full URI of the collection
+        :return: dict containing the response of the collection
+        """
+        if self.get_cache is None:
+            return self.get_request(uri)
+        response = None
+        expand = self._expand_query()
+        if expand:
+            response = self.get_request(f"{uri}?$expand={expand}")
+        if response is None or response["ret"] is False:
+            response = self.get_request(uri)
+            if response["ret"] is False:
+                return response
+        missing = []
+        for member in (response["data"] or {}).get("Members") or []:
+            member_uri = self.root_uri + member["@odata.id"]
+            if len(member) > 1:
+                self.get_cache.setdefault(
+                    member_uri, {"ret": True, "data": copy.deepcopy(member), "headers": {}, "resp": None}
+                )
+            else:
+                missing.append(member_uri)
+        self._prefetch(missing)
+        return response
+
     def post_request(self, uri: str, pyld, multipart: bool = False):
         req_headers = dict(POST_HEADERS)
         username, password, basic_auth = self._auth_params(req_headers)
@@ -758,8 +1118,13 @@ class RedfishUtils:
     def aggregate(self, func, uri_list, uri_name):
         ret = True
         entries = []
-        for uri in uri_list:
-            inventory = func(uri)
+        if self.get_cache is not None and len(uri_list) > 1:
+            # Only read-only callers enable the cache, walk the resources concurrently
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(uri_list))) as executor:
+                inventories = list(executor.map(func, uri_list))
+        else:
+            inventories = map(func, uri_list)
+        for uri, inventory in zip(uri_list, inventories):
             ret = inventory.pop("ret") and ret
             if "entries" in inventory:
                 entries.append(({uri_name: uri}, inventory["entries"]))
@@ -807,7 +1172,7 @@ class RedfishUtils:
 
         # Get a list of all storage controllers and build respective URIs
         storage_uri = data["Storage"]["@odata.id"]
-        response = self.get_request(self.root_uri + storage_uri)
+        response = self.get_collection(self.root_uri + storage_uri)
         if response["ret"] is False:
             return response
         result["ret"] = True
@@ -824,7 +1189,7 @@ class RedfishUtils:
                 if key in data:
                     controllers_uri = data[key]["@odata.id"]
 
-                    response = self.get_request(self.root_uri + controllers_uri)
+                    response = self.get_collection(self.root_uri + controllers_uri)
                     if response["ret"] is False:
                         return response
                     result["ret"] = True
@@ -904,7 +1269,7 @@ class RedfishUtils:
         if "Storage" in data:
             # Get a list of all storage controllers and build respective URIs
             storage_uri = data["Storage"]["@odata.id"]
-            response = self.get_request(self.root_uri + storage_uri)
+            response = self.get_collection(self.root_uri + storage_uri)
             if response["ret"] is False:
                 return response
             result["ret"] = True
@@ -924,7 +1289,7 @@ class RedfishUtils:
                     if "Controllers" in data:
                         controllers_uri = data["Controllers"]["@odata.id"]
 
-                        response = self.get_request(self.root_uri + controllers_uri)
+                        response = self.get_collection(self.root_uri + controllers_uri)
                         if response["ret"] is False:
                             return response
                         result["ret"] = True
@@ -949,6 +1314,7 @@ class RedfishUtils:
                                 controller_name = f"Controller {sc_id}"
                     drive_results = []
                     if "Drives" in data:
+                        self._prefetch([self.root_uri + device["@odata.id"] for device in data["Drives"]])
                         for device in data["Drives"]:
                             disk_uri = self.root_uri + device["@odata.id"]
                             response = self.get_request(disk_uri)
@@ -972,7 +1338,7 @@ class RedfishUtils:
         if "SimpleStorage" in data:
             # Get a list of all storage controllers and build respective URIs
             storage_uri = data["SimpleStorage"]["@odata.id"]
-            response = self.get_request(self.root_uri + storage_uri)
+            response = self.get_collection(self.root_uri + storage_uri)
             if response["ret"] is False:
                 return response
             result["ret"] = True
@@ -1047,7 +1413,7 @@ class RedfishUtils:
         if "Storage" in data:
             # Get a list of all storage controllers and build respective URIs
             storage_uri = data["Storage"]["@odata.id"]
-            response = self.get_request(self.root_uri + storage_uri)
+            response = self.get_collection(self.root_uri + storage_uri)
             if response["ret"] is False:
                 return response
             result["ret"] = True
@@ -1064,7 +1430,7 @@ class RedfishUtils:
                     data = response["data"]
                     controller_name = f"Controller {idx}"
                     if "Controllers" in data:
-                        response = self.get_request(self.root_uri + data["Controllers"]["@odata.id"])
+                        response = self.get_collection(self.root_uri + data["Controllers"]["@odata.id"])
                         if response["ret"] is False:
                             return response
                         c_data = response["data"]
@@ -1094,7 +1460,7 @@ class RedfishUtils:
                     if "Volumes" in data:
                         # Get a list of all volumes and build respective URIs
                         volumes_uri = data["Volumes"]["@odata.id"]
-                        response = self.get_request(self.root_uri + volumes_uri)
+                        response = self.get_collection(self.root_uri + volumes_uri)
                         data = response["data"]
 
                         if data.get("Members"):
@@ -2651,7 +3017,7 @@ class RedfishUtils:
         processors_uri = data[key]["@odata.id"]
 
         # Get a list of all CPUs and build respective URIs
-        response = self.get_request(self.root_uri + processors_uri)
+        response = self.get_collection(self.root_uri + processors_uri)
         if response["ret"] is False:
             return response
         result["ret"] = True
@@ -2712,7 +3078,7 @@ class RedfishUtils:
         memory_uri = data[key]["@odata.id"]
 
         # Get a list of all DIMMs and build respective URIs
-        response = self.get_request(self.root_uri + memory_uri)
+        response = self.get_collection(self.root_uri + memory_uri)
         if response["ret"] is False:
             return response
         result["ret"] = True
@@ -2795,7 +3161,7 @@ class RedfishUtils:
         ethernetinterfaces_uri = data[key]["@odata.id"]
 
         # Get a list of all network controllers and build respective URIs
-        response = self.get_request(self.root_uri + ethernetinterfaces_uri)
+        response = self.get_collection(self.root_uri + ethernetinterfaces_uri)
         if response["ret"] is False:
             return response
         result["ret"] = True
@@ -216,7 +216,7 @@ def main():
 
     # Build root URI
     root_uri = f"https://{module.params['baseuri']}"
-    rf_utils = IdracRedfishUtils(creds, root_uri, timeout, module)
+    rf_utils = IdracRedfishUtils(creds, root_uri, timeout, module, cache_get_requests=True)
 
     # Check that Category is valid
     if category not in CATEGORY_COMMANDS_ALL:
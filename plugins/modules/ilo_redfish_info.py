@@ -144,7 +144,7 @@ def main():
     timeout = module.params["timeout"]
 
     root_uri = f"https://{module.params['baseuri']}"
-    rf_utils = iLORedfishUtils(creds, root_uri, timeout, module)
+    rf_utils = iLORedfishUtils(creds, root_uri, timeout, module, cache_get_requests=True)
 
     # Build Category list
     if "all" in module.params["category"]:
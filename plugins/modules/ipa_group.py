@@ -279,44 +279,45 @@ def ensure(module, client):
                         data[key] = module_group.get(key)
                     client.group_mod(name=name, item=data)
 
-        if group is not None:
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_group.get("member_group", []),
-                    group,
-                    client.group_add_member_group,
-                    client.group_remove_member_group,
-                    append=append,
+        with client.batch():
+            if group is not None:
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_group.get("member_group", []),
+                        group,
+                        client.group_add_member_group,
+                        client.group_remove_member_group,
+                        append=append,
+                    )
+                    or changed
                 )
-                or changed
-            )
-
-        if user is not None:
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_group.get("member_user", []),
-                    user,
-                    client.group_add_member_user,
-                    client.group_remove_member_user,
-                    append=append,
+
+            if user is not None:
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_group.get("member_user", []),
+                        user,
+                        client.group_add_member_user,
+                        client.group_remove_member_user,
+                        append=append,
+                    )
+                    or changed
                 )
-                or changed
-            )
-
-        if external_user is not None:
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_group.get("ipaexternalmember", []),
-                    external_user,
-                    client.group_add_member_externaluser,
-                    client.group_remove_member_externaluser,
-                    append=append,
+
+            if external_user is not None:
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_group.get("ipaexternalmember", []),
+                        external_user,
+                        client.group_add_member_externaluser,
+                        client.group_remove_member_externaluser,
+                        append=append,
+                    )
+                    or changed
                 )
-                or changed
-            )
     else:
         if ipa_group:
             changed = True
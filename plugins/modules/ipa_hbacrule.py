@@ -283,109 +283,110 @@ def ensure(module, client):
                         data[key] = module_hbacrule.get(key)
                     client.hbacrule_mod(name=name, item=data)
 
-        if host is not None:
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_hbacrule.get("memberhost_host", []),
-                    host,
-                    client.hbacrule_add_host,
-                    client.hbacrule_remove_host,
-                    "host",
+        with client.batch():
+            if host is not None:
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_hbacrule.get("memberhost_host", []),
+                        host,
+                        client.hbacrule_add_host,
+                        client.hbacrule_remove_host,
+                        "host",
+                    )
+                    or changed
                 )
-                or changed
-            )
-
-        if hostgroup is not None:
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_hbacrule.get("memberhost_hostgroup", []),
-                    hostgroup,
-                    client.hbacrule_add_host,
-                    client.hbacrule_remove_host,
-                    "hostgroup",
+
+            if hostgroup is not None:
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_hbacrule.get("memberhost_hostgroup", []),
+                        hostgroup,
+                        client.hbacrule_add_host,
+                        client.hbacrule_remove_host,
+                        "hostgroup",
+                    )
+                    or changed
                 )
-                or changed
-            )
-
-        if service is not None:
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_hbacrule.get("memberservice_hbacsvc", []),
-                    service,
-                    client.hbacrule_add_service,
-                    client.hbacrule_remove_service,
-                    "hbacsvc",
+
+            if service is not None:
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_hbacrule.get("memberservice_hbacsvc", []),
+                        service,
+                        client.hbacrule_add_service,
+                        client.hbacrule_remove_service,
+                        "hbacsvc",
+                    )
+                    or changed
                 )
-                or changed
-            )
-
-        if servicegroup is not None:
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_hbacrule.get("memberservice_hbacsvcgroup", []),
-                    servicegroup,
-                    client.hbacrule_add_service,
-                    client.hbacrule_remove_service,
-                    "hbacsvcgroup",
+
+            if servicegroup is not None:
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_hbacrule.get("memberservice_hbacsvcgroup", []),
+                        servicegroup,
+                        client.hbacrule_add_service,
+                        client.hbacrule_remove_service,
+                        "hbacsvcgroup",
+                    )
+                    or changed
                 )
-                or changed
-            )
-
-        if sourcehost is not None:
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_hbacrule.get("sourcehost_host", []),
-                    sourcehost,
-                    client.hbacrule_add_sourcehost,
-                    client.hbacrule_remove_sourcehost,
-                    "host",
+
+            if sourcehost is not None:
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_hbacrule.get("sourcehost_host", []),
+                        sourcehost,
+                        client.hbacrule_add_sourcehost,
+                        client.hbacrule_remove_sourcehost,
+                        "host",
+                    )
+                    or changed
                 )
-                or changed
-            )
-
-        if sourcehostgroup is not None:
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_hbacrule.get("sourcehost_group", []),
-                    sourcehostgroup,
-                    client.hbacrule_add_sourcehost,
-                    client.hbacrule_remove_sourcehost,
-                    "hostgroup",
+
+            if sourcehostgroup is not None:
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_hbacrule.get("sourcehost_group", []),
+                        sourcehostgroup,
+                        client.hbacrule_add_sourcehost,
+                        client.hbacrule_remove_sourcehost,
+                        "hostgroup",
+                    )
+                    or changed
                 )
-                or changed
-            )
-
-        if user is not None:
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_hbacrule.get("memberuser_user", []),
-                    user,
-                    client.hbacrule_add_user,
-                    client.hbacrule_remove_user,
-                    "user",
+
+            if user is not None:
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_hbacrule.get("memberuser_user", []),
+                        user,
+                        client.hbacrule_add_user,
+                        client.hbacrule_remove_user,
+                        "user",
+                    )
+                    or changed
                 )
-                or changed
-            )
-
-        if usergroup is not None:
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_hbacrule.get("memberuser_group", []),
-                    usergroup,
-                    client.hbacrule_add_user,
-                    client.hbacrule_remove_user,
-                    "group",
+
+            if usergroup is not None:
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_hbacrule.get("memberuser_group", []),
+                        usergroup,
+                        client.hbacrule_add_user,
+                        client.hbacrule_remove_user,
+                        "group",
+                    )
+                    or changed
                 )
-                or changed
-            )
     else:
         if ipa_hbacrule:
             changed = True
@@ -173,32 +173,32 @@ def ensure(module, client):
                         data[key] = module_hostgroup.get(key)
                     client.hostgroup_mod(name=name, item=data)
 
-        if host is not None:
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_hostgroup.get("member_host", []),
-                    [item.lower() for item in host],
-                    client.hostgroup_add_host,
-                    client.hostgroup_remove_host,
-                    append=append,
+        with client.batch():
+            if host is not None:
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_hostgroup.get("member_host", []),
+                        [item.lower() for item in host],
+                        client.hostgroup_add_host,
+                        client.hostgroup_remove_host,
+                        append=append,
+                    )
+                    or changed
                 )
-                or changed
-            )
-
-        if hostgroup is not None:
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_hostgroup.get("member_hostgroup", []),
-                    [item.lower() for item in hostgroup],
-                    client.hostgroup_add_hostgroup,
-                    client.hostgroup_remove_hostgroup,
-                    append=append,
-                )
-                or changed
-            )
 
+            if hostgroup is not None:
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_hostgroup.get("member_hostgroup", []),
+                        [item.lower() for item in hostgroup],
+                        client.hostgroup_add_hostgroup,
+                        client.hostgroup_remove_hostgroup,
+                        append=append,
+                    )
+                    or changed
+                )
     else:
         if ipa_hostgroup:
             changed = True
@@ -388,113 +388,114 @@ def ensure(module, client):
 
                     client.sudorule_mod(name=name, item=module_sudorule)
 
-        if cmd is not None:
-            changed = category_changed(module, client, "cmdcategory", ipa_sudorule) or changed
-            if not module.check_mode:
-                client.sudorule_add_allow_command(name=name, item=cmd)
-
-        if cmdgroup is not None:
-            changed = category_changed(module, client, "cmdcategory", ipa_sudorule) or changed
-            if not module.check_mode:
-                client.sudorule_add_allow_command_group(name=name, item=cmdgroup)
-
-        if deny_cmd is not None:
-            changed = category_changed(module, client, "cmdcategory", ipa_sudorule) or changed
-            if not module.check_mode:
-                client.sudorule_add_deny_command(name=name, item=deny_cmd)
-
-        if deny_cmdgroup is not None:
-            changed = category_changed(module, client, "cmdcategory", ipa_sudorule) or changed
-            if not module.check_mode:
-                client.sudorule_add_deny_command_group(name=name, item=deny_cmdgroup)
-
-        if runasusercategory is not None:
-            changed = category_changed(module, client, "iparunasusercategory", ipa_sudorule) or changed
-
-        if runasgroupcategory is not None:
-            changed = category_changed(module, client, "iparunasgroupcategory", ipa_sudorule) or changed
-
-        if host is not None:
-            changed = category_changed(module, client, "hostcategory", ipa_sudorule) or changed
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_sudorule.get("memberhost_host", []),
-                    host,
-                    client.sudorule_add_host_host,
-                    client.sudorule_remove_host_host,
-                )
-                or changed
-            )
-
-        if hostgroup is not None:
-            changed = category_changed(module, client, "hostcategory", ipa_sudorule) or changed
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_sudorule.get("memberhost_hostgroup", []),
-                    hostgroup,
-                    client.sudorule_add_host_hostgroup,
-                    client.sudorule_remove_host_hostgroup,
-                )
-                or changed
-            )
-        if sudoopt is not None:
-            # client.modify_if_diff does not work as each option must be removed/added by its own
-            ipa_list = ipa_sudorule.get("ipasudoopt", [])
-            module_list = sudoopt
-            diff = list(set(ipa_list) - set(module_list))
-            if len(diff) > 0:
-                changed = True
+        with client.batch():
+            if cmd is not None:
+                changed = category_changed(module, client, "cmdcategory", ipa_sudorule) or changed
                 if not module.check_mode:
-                    for item in diff:
-                        client.sudorule_remove_option_ipasudoopt(name, item)
-            diff = list(set(module_list) - set(ipa_list))
-            if len(diff) > 0:
-                changed = True
+                    client.sudorule_add_allow_command(name=name, item=cmd)
+
+            if cmdgroup is not None:
+                changed = category_changed(module, client, "cmdcategory", ipa_sudorule) or changed
                 if not module.check_mode:
-                    for item in diff:
-                        client.sudorule_add_option_ipasudoopt(name, item)
+                    client.sudorule_add_allow_command_group(name=name, item=cmdgroup)
 
-        if runasextusers is not None:
-            ipa_sudorule_run_as_user = ipa_sudorule.get("ipasudorunasextuser", [])
-            diff = list(set(ipa_sudorule_run_as_user) - set(runasextusers))
-            if len(diff) > 0:
-                changed = True
+            if deny_cmd is not None:
+                changed = category_changed(module, client, "cmdcategory", ipa_sudorule) or changed
                 if not module.check_mode:
-                    for item in diff:
-                        client.sudorule_remove_runasuser(name=name, item=item)
-            diff = list(set(runasextusers) - set(ipa_sudorule_run_as_user))
-            if len(diff) > 0:
-                changed = True
+                    client.sudorule_add_deny_command(name=name, item=deny_cmd)
+
+            if deny_cmdgroup is not None:
+                changed = category_changed(module, client, "cmdcategory", ipa_sudorule) or changed
                 if not module.check_mode:
-                    for item in diff:
-                        client.sudorule_add_runasuser(name=name, item=item)
-
-        if user is not None:
-            changed = category_changed(module, client, "usercategory", ipa_sudorule) or changed
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_sudorule.get("memberuser_user", []),
-                    user,
-                    client.sudorule_add_user_user,
-                    client.sudorule_remove_user_user,
+                    client.sudorule_add_deny_command_group(name=name, item=deny_cmdgroup)
+
+            if runasusercategory is not None:
+                changed = category_changed(module, client, "iparunasusercategory", ipa_sudorule) or changed
+
+            if runasgroupcategory is not None:
+                changed = category_changed(module, client, "iparunasgroupcategory", ipa_sudorule) or changed
+
+            if host is not None:
+                changed = category_changed(module, client, "hostcategory", ipa_sudorule) or changed
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_sudorule.get("memberhost_host", []),
+                        host,
+                        client.sudorule_add_host_host,
+                        client.sudorule_remove_host_host,
+                    )
+                    or changed
+                )
+
+            if hostgroup is not None:
+                changed = category_changed(module, client, "hostcategory", ipa_sudorule) or changed
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_sudorule.get("memberhost_hostgroup", []),
+                        hostgroup,
+                        client.sudorule_add_host_hostgroup,
+                        client.sudorule_remove_host_hostgroup,
+                    )
+                    or changed
+                )
+            if sudoopt is not None:
+                # client.modify_if_diff does not work as each option must be removed/added by its own
+                ipa_list = ipa_sudorule.get("ipasudoopt", [])
+                module_list = sudoopt
+                diff = list(set(ipa_list) - set(module_list))
+                if len(diff) > 0:
+                    changed = True
+                    if not module.check_mode:
+                        for item in diff:
+                            client.sudorule_remove_option_ipasudoopt(name, item)
+                diff = list(set(module_list) - set(ipa_list))
+                if len(diff) > 0:
+                    changed = True
+                    if not module.check_mode:
+                        for item in diff:
+                            client.sudorule_add_option_ipasudoopt(name, item)
+
+            if runasextusers is not None:
+                ipa_sudorule_run_as_user = ipa_sudorule.get("ipasudorunasextuser", [])
+                diff = list(set(ipa_sudorule_run_as_user) - set(runasextusers))
+                if len(diff) > 0:
+                    changed = True
+                    if not module.check_mode:
+                        for item in diff:
+                            client.sudorule_remove_runasuser(name=name, item=item)
+                diff = list(set(runasextusers) - set(ipa_sudorule_run_as_user))
+                if len(diff) > 0:
+                    changed = True
+                    if not module.check_mode:
+                        for item in diff:
+                            client.sudorule_add_runasuser(name=name, item=item)
+
+            if user is not None:
+                changed = category_changed(module, client, "usercategory", ipa_sudorule) or changed
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_sudorule.get("memberuser_user", []),
+                        user,
+                        client.sudorule_add_user_user,
+                        client.sudorule_remove_user_user,
+                    )
+                    or changed
                 )
-                or changed
-            )
-        if usergroup is not None:
-            changed = category_changed(module, client, "usercategory", ipa_sudorule) or changed
-            changed = (
-                client.modify_if_diff(
-                    name,
-                    ipa_sudorule.get("memberuser_group", []),
-                    usergroup,
-                    client.sudorule_add_user_group,
-                    client.sudorule_remove_user_group,
+            if usergroup is not None:
+                changed = category_changed(module, client, "usercategory", ipa_sudorule) or changed
+                changed = (
+                    client.modify_if_diff(
+                        name,
+                        ipa_sudorule.get("memberuser_group", []),
+                        usergroup,
+                        client.sudorule_add_user_group,
+                        client.sudorule_remove_user_group,
+                    )
+                    or changed
                 )
-                or changed
-            )
     else:
         if ipa_sudorule:
             changed = True
@@ -0,0 +1,815 @@
+#!/usr/bin/python
+
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+DOCUMENTATION = r"""
+module: keycloak_bulk
+
+short_description: Reconcile many Keycloak users, groups and role mappings at once
+
+version_added: 12.2.0
+
+description:
+  - This module makes the users, groups, group memberships and role mappings of a Keycloak realm match a list of desired users
+    and groups. It requires access to the REST API using OpenID Connect; the user connecting and the client being used must
+    have the requisite access rights.
+  - Unlike M(community.general.keycloak_user), M(community.general.keycloak_group) and the role mapping modules, which handle
+    one object per task, this module reads the realm once with paginated requests, computes all differences, and then sends
+    the creates, updates and deletes with a bounded number of concurrent requests.
+  - Objects which are not mentioned are left alone, unless O(purge_users) or O(purge_groups) is set.
+  - Attributes are multi-valued in the Keycloak API. You may pass single values for attributes, and this is translated into
+    a list suitable for the API.
+
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: none
+  action_group:
+    version_added: 12.2.0
+
+options:
+  realm:
+    type: str
+    description:
+      - The Keycloak realm to reconcile.
+    default: 'master'
+
+  groups:
+    type: list
+    elements: dict
+    default: []
+    description:
+      - Desired groups.
+      - Parents of a group are created as needed, and are never removed by O(purge_groups).
+    suboptions:
+      path:
+        type: str
+        required: true
+        description:
+          - Path of the group, for example V(/parent/child).
+      state:
+        type: str
+        choices: [present, absent]
+        default: present
+        description:
+          - Whether the group should exist. Removing a group also removes its subgroups.
+      attributes:
+        type: dict
+        description:
+          - Attributes of the group. Attributes which are not mentioned are left unchanged.
+      realm_roles:
+        type: list
+        elements: str
+        description:
+          - Names of the realm roles directly mapped to the group.
+          - When set, mappings of other realm roles are removed. When not set, realm role mappings are left unchanged.
+      client_roles:
+        type: list
+        elements: dict
+        description:
+          - Client roles directly mapped to the group.
+          - For every client mentioned, mappings of other roles of this client are removed. Role mappings of clients which
+            are not mentioned are left unchanged.
+        suboptions:
+          client_id:
+            type: str
+            required: true
+            description:
+              - The C(clientId) of the client.
+          roles:
+            type: list
+            elements: str
+            required: true
+            description:
+              - Names of the client roles.
+
+  users:
+    type: list
+    elements: dict
+    default: []
+    description:
+      - Desired users.
+    suboptions:
+      username:
+        type: str
+        required: true
+        description:
+          - Username of the user.
+      state:
+        type: str
+        choices: [present, absent]
+        default: present
+        description:
+          - Whether the user should exist.
+      email:
+        type: str
+        description:
+          - Email address of the user.
+      first_name:
+        type: str
+        description:
+          - First name of the user.
+      last_name:
+        type: str
+        description:
+          - Last name of the user.
+      enabled:
+        type: bool
+        description:
+          - Whether the user is enabled.
+          - New users are enabled when this is not set.
+      email_verified:
+        type: bool
+        description:
+          - Whether the email address of the user has been verified.
+      attributes:
+        type: dict
+        description:
+          - Attributes of the user. Attributes which are not mentioned are left unchanged.
+      groups:
+        type: list
+        elements: str
+        description:
+          - Paths of the groups the user is a direct member of.
+          - When set, the user is removed from other groups. When not set, group memberships are left unchanged.
+      realm_roles:
+        type: list
+        elements: str
+        description:
+          - Names of the realm roles directly mapped to the user.
+          - When set, mappings of other realm roles are removed, except for the default roles of the realm.
+            When not set, realm role mappings are left unchanged.
+      client_roles:
+        type: list
+        elements: dict
+        description:
+          - Client roles directly mapped to the user.
+          - For every client mentioned, mappings of other roles of this client are removed. Role mappings of clients which
+            are not mentioned are left unchanged.
+        suboptions:
+          client_id:
+            type: str
+            required: true
+            description:
+              - The C(clientId) of the client.
+          roles:
+            type: list
+            elements: str
+            required: true
+            description:
+              - Names of the client roles.
+
+  purge_users:
+    type: bool
+    default: false
+    description:
+      - Remove the users of the realm which are not in O(users). Service account users are never removed.
+
+  purge_groups:
+    type: bool
+    default: false
+    description:
+      - Remove the groups of the realm which are not in O(groups) and are not a parent of a group in O(groups).
+
+  max_workers:
+    type: int
+    default: 4
+    description:
+      - Maximum number of requests sent to Keycloak at the same time.
+
+extends_documentation_fragment:
+  - community.general.keycloak
+  - community.general.keycloak.actiongroup_keycloak
+  - community.general.attributes
+
+author:
+  - agent (@agent)
+"""
+
+EXAMPLES = r"""
+- name: Provision the developers of a realm
+  community.general.keycloak_bulk:
+    auth_keycloak_url: https://auth.example.com/auth
+    auth_realm: master
+    auth_username: USERNAME
+    auth_password: PASSWORD
+    realm: MyCustomRealm
+    groups:
+      - path: /engineering
+        attributes:
+          cost_center: "4711"
+      - path: /engineering/developers
+        realm_roles:
+          - developer
+        client_roles:
+          - client_id: gitlab
+            roles:
+              - maintainer
+    users:
+      - username: alice
+        email: alice@example.com
+        first_name: Alice
+        groups:
+          - /engineering/developers
+      - username: bob
+        state: absent
+  delegate_to: localhost
+
+- name: Make the realm users exactly match an inventory, authentication with token
+  community.general.keycloak_bulk:
+    auth_keycloak_url: https://auth.example.com/auth
+    token: TOKEN
+    realm: MyCustomRealm
+    users: "{{ directory_users }}"
+    purge_users: true
+    max_workers: 8
+  delegate_to: localhost
+"""
+
+RETURN = r"""
+msg:
+  description: Message as to what action was taken.
+  returned: always
+  type: str
+  sample: >-
+    Created 1 users and 1 groups, updated 0 users and 0 groups, deleted 1 users and 0 groups,
+    added 1 memberships and 1 role mappings, removed 0 memberships and 0 role mappings.
+
+summary:
+  description: Number of changes by kind.
+  returned: always
+  type: dict
+  sample:
+    {
+      "groups_created": 1,
+      "groups_deleted": 0,
+      "groups_updated": 0,
+      "memberships_added": 1,
+      "memberships_removed": 0,
+      "role_mappings_added": 1,
+      "role_mappings_removed": 0,
+      "users_created": 1,
+      "users_deleted": 1,
+      "users_updated": 0
+    }
+
+changes:
+  description:
+    - Changes by kind. Users are identified by their username, groups by their path.
+    - In check mode, the changes which would have been made.
+  returned: always
+  type: dict
+  sample:
+    {
+      "groups_created": ["/engineering/developers"],
+      "groups_deleted": [],
+      "groups_updated": [],
+      "memberships_added": ["alice: /engineering/developers"],
+      "memberships_removed": [],
+      "role_mappings_added": ["group /engineering/developers: realm role developer"],
+      "role_mappings_removed": [],
+      "users_created": ["alice"],
+      "users_deleted": ["bob"],
+      "users_updated": []
+    }
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak import (
+    URL_CLIENT_GROUP_ROLEMAPPINGS,
+    URL_GROUP,
+    URL_GROUP_CHILDREN,
+    URL_GROUPS,
+    URL_REALM_GROUP_ROLEMAPPINGS,
+    URL_USER,
+    URL_USER_CLIENT_ROLE_MAPPINGS,
+    URL_USER_GROUP,
+    URL_USER_GROUPS,
+    URL_USER_REALM_ROLE_MAPPINGS,
+    URL_USER_ROLE_MAPPINGS,
+    URL_USERS,
+    KeycloakAPI,
+    KeycloakError,
+    get_token,
+    keycloak_argument_spec,
+)
+
+CHANGE_KINDS = (
+    "groups_created",
+    "groups_updated",
+    "groups_deleted",
+    "users_created",
+    "users_updated",
+    "users_deleted",
+    "memberships_added",
+    "memberships_removed",
+    "role_mappings_added",
+    "role_mappings_removed",
+)
+
+USER_FIELDS = {
+    "email": "email",
+    "first_name": "firstName",
+    "last_name": "lastName",
+    "enabled": "enabled",
+    "email_verified": "emailVerified",
+}
+
+
+class BulkError(Exception):
+    def __init__(self, errors, total):
+        super().__init__(f"{len(errors)} of {total} requests failed: {'; '.join(errors[:10])}")
+
+
+def normalize_attributes(attributes):
+    """Turn every attribute value into a list of strings, like Keycloak returns them."""
+    result = {}
+    for name, value in (attributes or {}).items():
+        values = value if isinstance(value, list) else [value]
+        result[name] = [str(v) for v in values]
+    return result
+
+
+def parent_path(path):
+    return path.rsplit("/", 1)[0]
+
+
+def ancestor_paths(path):
+    while True:
+        path = parent_path(path)
+        if not path:
+            return
+        yield path
+
+
+class KeycloakBulkReconciler:
+    def __init__(self, module, kc, realm, max_workers):
+        self.module = module
+        self.kc = kc
+        self.realm = realm
+        self.max_workers = max(1, max_workers)
+        self.snapshot = kc.realm_snapshot(realm)
+        self.changes = {kind: [] for kind in CHANGE_KINDS}
+        self.group_ids = {}
+        self.user_ids = {}
+        self.phases = []
+
+    def url(self, template, **kwargs):
+        return template.format(url=self.kc.baseurl, realm=self.realm, **kwargs)
+
+    def run(self, func, items):
+        """Call func for every item with at most max_workers concurrent calls, and return the results in order."""
+        results = [None] * len(items)
+        errors = []
+        if not items:
+            return results
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(func, item): index for index, item in enumerate(items)}
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    errors.append(str(e))
+        if errors:
+            raise BulkError(errors, len(items))
+        return results
+
+    def request(self, description, method, url, body=None):
+        try:
+            return self.kc._request(url, method=method, data=json.dumps(body) if body is not None else None)
+        except Exception as e:
+            raise KeycloakError(f"{description}: {e}") from e
+
+    def create(self, description, url, body):
+        location = self.request(description, "POST", url, body).headers.get("Location", "")
+        return location.rstrip("/").rsplit("/", 1)[-1]
+
+    def add_phase(self, operations):
+        if operations:
+            self.phases.append(operations)
+
+    # Reading and planning
+
+    def resolve_roles(self, owner, realm_roles, client_roles):
+        """Return {(client UUID or None, role name): role representation} for the desired roles of owner."""
+        roles = {}
+        for name in realm_roles or []:
+            role = self.snapshot.get_realm_role(name)
+            if role is None:
+                self.module.fail_json(msg=f"Realm role {name} of {owner} does not exist in realm {self.realm}")
+            roles[(None, name)] = role
+        for mapping in client_roles or []:
+            client = self.snapshot.get_client_by_clientid(mapping["client_id"])
+            if client is None:
+                self.module.fail_json(
+                    msg=f"Client {mapping['client_id']} of {owner} does not exist in realm {self.realm}"
+                )
+            roles.setdefault((client["id"], None), {"clientId": mapping["client_id"]})
+            for name in mapping["roles"]:
+                role = self.snapshot.get_client_role(client["id"], name)
+                if role is None:
+                    self.module.fail_json(
+                        msg=f"Role {name} of client {mapping['client_id']} of {owner} does not exist in realm {self.realm}"
+                    )
+                roles[(client["id"], name)] = role
+        return roles
+
+    def plan_role_mappings(self, owner, desired, current, managed_clients, manage_realm, url_for, protected=()):
+        """Queue the role mapping changes of one user or group.
+
+        :param desired: result of resolve_roles()
+        :param current: {(client UUID or None, role name): role representation} of the current direct mappings
+        :param managed_clients: UUIDs of the clients whose mappings are managed
+        :param manage_realm: whether realm role mappings are managed
+        :param url_for: callable returning the mapping URL for a client UUID, or None for realm roles
+        """
+        clients = {cid: desired.pop((cid, None))["clientId"] for cid in managed_clients}
+        add = {}
+        remove = {}
+        for key, role in desired.items():
+            if key not in current:
+                add.setdefault(key[0], []).append(role)
+        for key, role in current.items():
+            cid, name = key
+            managed = cid in managed_clients if cid is not None else manage_realm
+            if managed and key not in desired and name not in protected:
+                remove.setdefault(cid, []).append(role)
+
+        operations = []
+        for kind, changes, method in (
+            ("role_mappings_added", add, "POST"),
+            ("role_mappings_removed", remove, "DELETE"),
+        ):
+            for cid, roles in changes.items():
+                prefix = "realm role" if cid is None else f"client {clients.get(cid, cid)} role"
+                self.changes[kind].extend(f"{owner}: {prefix} {role['name']}" for role in roles)
+                reps = [{"id": role["id"], "name": role["name"]} for role in roles]
+                operations.append((owner, method, url_for, cid, reps))
+        return operations
+
+    def plan_groups(self, desired_groups, purge):
+        existing = {group["path"]: group for group in self.snapshot.get_groups()}
+        self.group_ids.update((path, group["id"]) for path, group in existing.items())
+        present = {}
+        absent = set()
+        for group in desired_groups:
+            path = "/" + group["path"].strip("/")
+            if group["state"] == "present":
+                present[path] = group
+            else:
+                absent.add(path)
+
+        keep = set(present)
+        for path in present:
+            keep.update(ancestor_paths(path))
+
+        creates = {}
+        updates = []
+        mappings = []
+        for path in sorted(keep, key=lambda p: p.count("/")):
+            group = present.get(path, {})
+            current = existing.get(path)
+            attributes = normalize_attributes(group.get("attributes"))
+            if current is None:
+                self.changes["groups_created"].append(path)
+                creates.setdefault(path.count("/"), []).append(
+                    (path, {"name": path.rsplit("/", 1)[1], "attributes": attributes})
+                )
+                current = {}
+            else:
+                merged = dict(current.get("attributes") or {}, **attributes)
+                if merged != (current.get("attributes") or {}):
+                    self.changes["groups_updated"].append(path)
+                    updates.append((path, {"name": current["name"], "attributes": merged}))
+
+            if group.get("realm_roles") is None and group.get("client_roles") is None:
+                continue
+            owner = f"group {path}"
+            desired = self.resolve_roles(owner, group.get("realm_roles"), group.get("client_roles"))
+            managed_clients = {cid for cid, name in desired if cid is not None and name is None}
+            # Full group representations list the names of the directly mapped roles
+            current_roles = {}
+            for name in current.get("realmRoles") or []:
+                role = self.snapshot.get_realm_role(name)
+                if role is not None:
+                    current_roles[(None, name)] = role
+            for client_id, names in (current.get("clientRoles") or {}).items():
+                client = self.snapshot.get_client_by_clientid(client_id)
+                if client is None or client["id"] not in managed_clients:
+                    continue
+                for name in names:
+                    role = self.snapshot.get_client_role(client["id"], name)
+                    if role is not None:
+                        current_roles[(client["id"], name)] = role
+            mappings.extend(
+                (path,) + operation
+                for operation in self.plan_role_mappings(
+                    owner,
+                    desired,
+                    current_roles,
+                    managed_clients,
+                    group.get("realm_roles") is not None,
+                    self.group_mapping_url,
+                )
+            )
+
+        deletes = set(path for path in absent if path in existing)
+        if purge:
+            deletes.update(path for path in existing if path not in keep)
+        # removing a group removes its subgroups
+        deletes = sorted(path for path in deletes if not any(parent in deletes for parent in ancestor_paths(path)))
+        self.changes["groups_deleted"].extend(deletes)
+
+        for depth in sorted(creates):
+            self.add_phase([(self.create_group, item) for item in creates[depth]])
+        self.add_phase([(self.update_group, item) for item in updates])
+        self.add_phase([(self.change_role_mappings, item) for item in mappings])
+        self.group_deletes = [(self.delete_group, path) for path in deletes]
+
+    def group_mapping_url(self, path, cid):
+        if cid is None:
+            return self.url(URL_REALM_GROUP_ROLEMAPPINGS, group=self.group_ids[path])
+        return self.url(URL_CLIENT_GROUP_ROLEMAPPINGS, id=self.group_ids[path], client=cid)
+
+    def user_mapping_url(self, username, cid):
+        if cid is None:
+            return self.url(URL_USER_REALM_ROLE_MAPPINGS, id=self.user_ids[username])
+        return self.url(URL_USER_CLIENT_ROLE_MAPPINGS, id=self.user_ids[username], client_id=cid)
+
+    def read_user_groups(self, uid):
+        return [
+            group["path"] for group in self.kc._paginate(self.url(URL_USER_GROUPS, id=uid), briefRepresentation="true")
+        ]
+
+    def read_user_roles(self, uid):
+        mappings = self.kc._request_and_deserialize(self.url(URL_USER_ROLE_MAPPINGS, id=uid), method="GET")
+        roles = {(None, role["name"]): role for role in mappings.get("realmMappings") or []}
+        for client in (mappings.get("clientMappings") or {}).values():
+            roles.update(((client["id"], role["name"]), role) for role in client.get("mappings") or [])
+        return roles
+
+    def plan_users(self, desired_users, purge):
+        existing = {user["username"]: user for user in self.snapshot.get_users()}
+        self.user_ids.update((username, user["id"]) for username, user in existing.items())
+        present = {}
+        absent = set()
+        for user in desired_users:
+            username = user["username"].lower()
+            if user["state"] == "present":
+                present[username] = user
+            else:
+                absent.add(username)
+
+        for user in present.values():
+            for path in user.get("groups") or []:
+                path = "/" + path.strip("/")
+                if path not in self.group_ids and path not in self.changes["groups_created"]:
+                    self.module.fail_json(
+                        msg=f"Group {path} of user {user['username']} does not exist in realm {self.realm}"
+                    )
+
+        # One concurrent read of the memberships and role mappings of the existing users which need them
+        def needs(option):
+            return sorted(name for name, user in present.items() if name in existing and user.get(option) is not None)
+
+        membership_users = needs("groups")
+        role_users = sorted(set(needs("realm_roles")) | set(needs("client_roles")))
+        try:
+            memberships = dict(
+                zip(membership_users, self.run(self.read_user_groups, [existing[n]["id"] for n in membership_users]))
+            )
+            current_roles = dict(
+                zip(role_users, self.run(self.read_user_roles, [existing[n]["id"] for n in role_users]))
+            )
+        except BulkError as e:
+            self.module.fail_json(msg=f"Could not read the users of realm {self.realm}: {e}")
+
+        creates = []
+        updates = []
+        membership_changes = []
+        mappings = []
+        default_roles = {f"default-roles-{self.realm.lower()}"}
+        for username, user in sorted(present.items()):
+            current = existing.get(username)
+            fields = {USER_FIELDS[option]: user[option] for option in USER_FIELDS if user.get(option) is not None}
+            attributes = normalize_attributes(user.get("attributes"))
+            if current is None:
+                self.changes["users_created"].append(username)
+                rep = {"username": username, "enabled": True, **fields}
+                if attributes:
+                    rep["attributes"] = attributes
+                creates.append((username, rep))
+                current = {}
+            else:
+                changed = {key: value for key, value in fields.items() if current.get(key) != value}
+                merged = dict(current.get("attributes") or {}, **attributes)
+                if merged != (current.get("attributes") or {}):
+                    changed["attributes"] = merged
+                if changed:
+                    self.changes["users_updated"].append(username)
+                    updates.append((username, changed))
+
+            if user.get("groups") is not None:
+                desired_groups = set("/" + path.strip("/") for path in user["groups"])
+                current_groups = set(memberships.get(username, []))
+                for path in sorted(desired_groups - current_groups):
+                    self.changes["memberships_added"].append(f"{username}: {path}")
+                    membership_changes.append(("PUT", username, path))
+                for path in sorted(current_groups - desired_groups):
+                    self.changes["memberships_removed"].append(f"{username}: {path}")
+                    membership_changes.append(("DELETE", username, path))
+
+            if user.get("realm_roles") is None and user.get("client_roles") is None:
+                continue
+            owner = f"user {username}"
+            desired = self.resolve_roles(owner, user.get("realm_roles"), user.get("client_roles"))
+            managed_clients = {cid for cid, name in desired if cid is not None and name is None}
+            mappings.extend(
+                (username,) + operation
+                for operation in self.plan_role_mappings(
+                    owner,
+                    desired,
+                    current_roles.get(username, {}),
+                    managed_clients,
+                    user.get("realm_roles") is not None,
+                    self.user_mapping_url,
+                    protected=default_roles,
+                )
+            )
+
+        deletes = set(name for name in absent if name in existing)
+        if purge:
+            deletes.update(
+                name
+                for name, user in existing.items()
+                if name not in present and not user.get("serviceAccountClientId")
+            )
+        self.changes["users_deleted"].extend(sorted(deletes))
+
+        self.add_phase([(self.create_user, item) for item in creates])
+        self.add_phase([(self.update_user, item) for item in updates])
+        self.add_phase([(self.change_membership, item) for item in membership_changes])
+        self.add_phase([(self.change_role_mappings, item) for item in mappings])
+        self.add_phase([(self.delete_user, name) for name in sorted(deletes)])
+
+    # Applying
+
+    def create_group(self, item):
+        path, rep = item
+        parent = parent_path(path)
+        url = self.url(URL_GROUP_CHILDREN, groupid=self.group_ids[parent]) if parent else self.url(URL_GROUPS)
+        self.group_ids[path] = self.create(f"Could not create group {path}", url, rep)
+
+    def update_group(self, item):
+        path, rep = item
+        self.request(f"Could not update group {path}", "PUT", self.url(URL_GROUP, groupid=self.group_ids[path]), rep)
+
+    def delete_group(self, path):
+        self.request(f"Could not delete group {path}", "DELETE", self.url(URL_GROUP, groupid=self.group_ids[path]))
+
+    def create_user(self, item):
+        username, rep = item
+        self.user_ids[username] = self.create(f"Could not create user {username}", self.url(URL_USERS), rep)
+
+    def update_user(self, item):
+        username, rep = item
+        self.request(f"Could not update user {username}", "PUT", self.url(URL_USER, id=self.user_ids[username]), rep)
+
+    def delete_user(self, username):
+        self.request(f"Could not delete user {username}", "DELETE", self.url(URL_USER, id=self.user_ids[username]))
+
+    def change_membership(self, item):
+        method, username, path = item
+        url = self.url(URL_USER_GROUP, id=self.user_ids[username], group_id=self.group_ids[path])
+        self.request(f"Could not change membership of user {username} in group {path}", method, url)
+
+    def change_role_mappings(self, item):
+        owner_key, description, method, url_for, cid, reps = item
+        self.request(f"Could not change role mappings of {description}", method, url_for(owner_key, cid), reps)
+
+    def apply(self):
+        # Subgroups are removed with their parents, so groups go after their members
+        self.add_phase(self.group_deletes)
+        for operations in self.phases:
+            self.run(lambda operation: operation[0](operation[1]), operations)
+
+    @property
+    def changed(self):
+        return any(self.changes.values())
+
+    def summary(self):
+        return {kind: len(changes) for kind, changes in self.changes.items()}
+
+    def message(self, check_mode):
+        counts = self.summary()
+        verb = "Would create" if check_mode else "Created"
+        return (
+            f"{verb} {counts['users_created']} users and {counts['groups_created']} groups, "
+            f"updated {counts['users_updated']} users and {counts['groups_updated']} groups, "
+            f"deleted {counts['users_deleted']} users and {counts['groups_deleted']} groups, "
+            f"added {counts['memberships_added']} memberships and {counts['role_mappings_added']} role mappings, "
+            f"removed {counts['memberships_removed']} memberships and {counts['role_mappings_removed']} role mappings."
+        )
+
+
+def main():
+    """
+    Module execution
+
+    :return:
+    """
+    argument_spec = keycloak_argument_spec()
+
+    client_roles_spec = dict(
+        client_id=dict(type="str", required=True),
+        roles=dict(type="list", elements="str", required=True),
+    )
+
+    groups_spec = dict(
+        path=dict(type="str", required=True),
+        state=dict(type="str", default="present", choices=["present", "absent"]),
+        attributes=dict(type="dict"),
+        realm_roles=dict(type="list", elements="str"),
+        client_roles=dict(type="list", elements="dict", options=client_roles_spec),
+    )
+
+    users_spec = dict(
+        username=dict(type="str", required=True),
+        state=dict(type="str", default="present", choices=["present", "absent"]),
+        email=dict(type="str"),
+        first_name=dict(type="str"),
+        last_name=dict(type="str"),
+        enabled=dict(type="bool"),
+        email_verified=dict(type="bool"),
+        attributes=dict(type="dict"),
+        groups=dict(type="list", elements="str"),
+        realm_roles=dict(type="list", elements="str"),
+        client_roles=dict(type="list", elements="dict", options=client_roles_spec),
+    )
+
+    meta_args = dict(
+        realm=dict(type="str", default="master"),
+        groups=dict(type="list", elements="dict", default=[], options=groups_spec),
+        users=dict(type="list", elements="dict", default=[], options=users_spec),
+        purge_users=dict(type="bool", default=False),
+        purge_groups=dict(type="bool", default=False),
+        max_workers=dict(type="int", default=4),
+    )
+
+    argument_spec.update(meta_args)
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+        required_one_of=(
+            [["token", "auth_realm", "auth_username", "auth_password", "auth_client_id", "auth_client_secret"]]
+        ),
+        required_together=([["auth_username", "auth_password"]]),
+        required_by={"refresh_token": "auth_realm"},
+    )
+
+    # Obtain access token, initialize API
+    try:
+        connection_header = get_token(module.params)
+    except KeycloakError as e:
+        module.fail_json(msg=str(e))
+
+    kc = KeycloakAPI(module, connection_header)
+    kc.use_realm_snapshot = True
+
+    reconciler = KeycloakBulkReconciler(module, kc, module.params["realm"], module.params["max_workers"])
+    try:
+        reconciler.plan_groups(module.params["groups"], module.params["purge_groups"])
+        reconciler.plan_users(module.params["users"], module.params["purge_users"])
+    except (BulkError, KeycloakError) as e:
+        module.fail_json(msg=f"Could not read realm {module.params['realm']}: {e}")
+
+    result = dict(
+        changed=reconciler.changed,
+        msg=reconciler.message(module.check_mode),
+        summary=reconciler.summary(),
+        changes=reconciler.changes,
+    )
+    if module.check_mode or not reconciler.changed:
+        module.exit_json(**result)
+
+    try:
+        reconciler.apply()
+    except (BulkError, KeycloakError) as e:
+        result["msg"] = f"Could not reconcile realm {module.params['realm']}: {e}"
+        module.fail_json(**result)
+
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,10 +17,12 @@ description:
   - Add or remove multiple LDAP attribute values.
 notes:
   - This only deals with attributes on existing entries. To add or remove whole entries, see M(community.general.ldap_entry).
-  - For O(state=present) and O(state=absent), all value comparisons are performed on the server for maximum accuracy. For
-    O(state=exact), values have to be compared in Python, which obviously ignores LDAP matching rules. This should work out
-    in most cases, but it is theoretically possible to see spurious changes when target and actual values are semantically
-    identical but lexically distinct.
+  - For O(state=present) and O(state=absent), the entry is read once, and values are compared with the equality matching
+    rule that the schema of the server defines for the attribute. For X-ORDERED attributes, and for attributes with a matching
+    rule that the module does not implement, the comparison is performed on the server, with one search per value. For O(state=exact),
+    values have to be compared in Python, which obviously ignores LDAP matching rules. This should work out in most cases,
+    but it is theoretically possible to see spurious changes when target and actual values are semantically identical but
+    lexically distinct.
 version_added: '0.2.0'
 author:
   - Jiri Tyr (@jtyr)
@@ -172,7 +174,9 @@ import re
 LDAP_IMP_ERR = None
 try:
     import ldap
+    import ldap.dn
     import ldap.filter
+    import ldap.schema
 
     HAS_LDAP = True
 except ImportError:
@@ -180,6 +184,36 @@ except ImportError:
     HAS_LDAP = False
 
 
+def _prep_string(value):
+    """Remove insignificant spaces, like the LDAP string preparation does."""
+    return " ".join(to_text(value).split())
+
+
+def _normalize_dn(value):
+    rdns = ldap.dn.str2dn(to_text(value))
+    return ldap.dn.dn2str(
+        [sorted((attr.lower(), _prep_string(val).casefold(), flags) for attr, val, flags in rdn) for rdn in rdns]
+    )
+
+
+# Equality matching rules which can be evaluated in Python, with a function that
+# maps values which the rule considers equal to the same key.
+MATCHING_RULES = {
+    "booleanMatch": lambda value: to_text(value).strip().upper(),
+    "caseExactIA5Match": _prep_string,
+    "caseExactMatch": _prep_string,
+    "caseIgnoreIA5Match": lambda value: _prep_string(value).casefold(),
+    "caseIgnoreMatch": lambda value: _prep_string(value).casefold(),
+    "distinguishedNameMatch": _normalize_dn,
+    "integerMatch": lambda value: int(value),
+    "numericStringMatch": lambda value: "".join(to_text(value).split()),
+    "octetStringMatch": bytes,
+    "telephoneNumberMatch": lambda value: "".join(to_text(value).replace("-", " ").split()).casefold(),
+}
+
+X_ORDERED_VALUE = re.compile(rb"^\{\d+\}")
+
+
 class LdapAttrs(LdapGeneric):
     def __init__(self, module):
         LdapGeneric.__init__(self, module)
@@ -188,6 +222,8 @@ class LdapAttrs(LdapGeneric):
         self.attrs = self.module.params["attributes"]
         self.state = self.module.params["state"]
         self.ordered = self.module.params["ordered"]
+        self._schema = None
+        self._schema_loaded = False
 
     def _order_values(self, values):
         """Prepend X-ORDERED index numbers to attribute's values."""
@@ -214,14 +250,102 @@ class LdapAttrs(LdapGeneric):
 
         return norm_values
 
+    def _read_attrs(self, missing_ok=False):
+        """
+        Read the current values of all given attributes with a single search. The values are
+        returned by lower-case attribute name, including all other names and the OID of the
+        attribute type, since the server may return an attribute under another name than requested.
+        """
+        try:
+            results = self.connection.search_s(self.dn, ldap.SCOPE_BASE, attrlist=list(self.attrs))
+        except ldap.NO_SUCH_OBJECT as e:
+            if missing_ok:
+                return {}
+            self.fail(f"Cannot search for attributes {', '.join(self.attrs)}", e)
+        except ldap.LDAPError as e:
+            self.fail(f"Cannot search for attributes {', '.join(self.attrs)}", e)
+
+        current = {name.lower(): values for name, values in results[0][1].items()} if results else {}
+        if any(name.lower() not in current for name in self.attrs):
+            for name, values in list(current.items()):
+                for key in self._attr_keys(name):
+                    current.setdefault(key, values)
+        return current
+
+    def _attr_keys(self, name):
+        """Return the lower-case names and the OID of the attribute type of the attribute."""
+        schema = self._load_schema()
+        attr_type = schema.get_obj(ldap.schema.AttributeType, name) if schema is not None else None
+        if attr_type is None:
+            return [name.lower()]
+        return [key.lower() for key in attr_type.names + (attr_type.oid,)]
+
+    def _load_schema(self):
+        """Return the schema which applies to the entry, or None if the server does not provide it."""
+        if not self._schema_loaded:
+            self._schema_loaded = True
+            try:
+                subschema_dn = self.connection.search_subschemasubentry_s(self.dn)
+                if subschema_dn is not None:
+                    entry = self.connection.read_subschemasubentry_s(subschema_dn)
+                    if entry is not None:
+                        self._schema = ldap.schema.SubSchema(entry, check_uniqueness=0)
+            except ldap.LDAPError:
+                pass
+        return self._schema
+
+    def _matching_key(self, name):
+        """Return the key function of the equality matching rule of the attribute, if it can be evaluated in Python."""
+        schema = self._load_schema()
+        if schema is None:
+            return None
+        attr_type = schema.get_obj(ldap.schema.AttributeType, name)
+        # X-ORDERED is not inherited, unlike the matching rule
+        if attr_type is None or getattr(attr_type, "x_ordered", None):
+            return None
+        seen = set()
+        # The matching rule may be inherited from a superior attribute type
+        while attr_type is not None and not attr_type.equality and attr_type.sup and attr_type.oid not in seen:
+            seen.add(attr_type.oid)
+            attr_type = schema.get_obj(ldap.schema.AttributeType, attr_type.sup[0])
+        if attr_type is None:
+            return None
+        return MATCHING_RULES.get(attr_type.equality)
+
+    def _value_matcher(self, name, current):
+        """
+        Return a function telling whether the attribute has a value. The values are
+        compared in memory when possible, and on the server otherwise.
+        """
+        key = self._matching_key(name)
+        # X-ORDERED values are matched with and without their index on the server
+        if key is not None and not any(X_ORDERED_VALUE.match(value) for value in current):
+            try:
+                current_keys = {key(value) for value in current}
+            except Exception:
+                current_keys = None
+            if current_keys is not None:
+
+                def is_present(value):
+                    try:
+                        return key(value) in current_keys
+                    except Exception:
+                        return self._is_value_present(name, value)
+
+                return is_present
+
+        return lambda value: self._is_value_present(name, value)
+
     def add(self):
         modlist = []
         new_attrs = {}
+        current = self._read_attrs(missing_ok=True)
         for name, values in self.module.params["attributes"].items():
             norm_values = self._normalize_values(values)
+            is_present = self._value_matcher(name, current.get(name.lower(), []))
             added_values = []
             for value in norm_values:
-                if self._is_value_absent(name, value):
+                if not is_present(value):
                     modlist.append((ldap.MOD_ADD, name, value))
                     added_values.append(value)
             if added_values:
@@ -232,11 +356,13 @@ class LdapAttrs(LdapGeneric):
         modlist = []
         old_attrs = {}
         new_attrs = {}
+        current = self._read_attrs(missing_ok=True)
         for name, values in self.module.params["attributes"].items():
             norm_values = self._normalize_values(values)
+            is_present = self._value_matcher(name, current.get(name.lower(), []))
             removed_values = []
             for value in norm_values:
-                if self._is_value_present(name, value):
+                if is_present(value):
                     removed_values.append(value)
                     modlist.append((ldap.MOD_DELETE, name, value))
             if removed_values:
@@ -248,14 +374,10 @@ class LdapAttrs(LdapGeneric):
         modlist = []
         old_attrs = {}
         new_attrs = {}
+        all_current = self._read_attrs()
         for name, values in self.module.params["attributes"].items():
             norm_values = self._normalize_values(values)
-            try:
-                results = self.connection.search_s(self.dn, ldap.SCOPE_BASE, attrlist=[name])
-            except ldap.LDAPError as e:
-                self.fail(f"Cannot search for attribute {name}", e)
-
-            current = results[0][1].get(name, [])
+            current = all_current.get(name.lower(), [])
 
             if frozenset(norm_values) != frozenset(current):
                 if len(current) == 0:
@@ -284,10 +406,6 @@ class LdapAttrs(LdapGeneric):
 
         return is_present
 
-    def _is_value_absent(self, name, value):
-        """True if the target attribute doesn't have the given value."""
-        return not self._is_value_present(name, value)
-
 
 def main():
     module = AnsibleModule(
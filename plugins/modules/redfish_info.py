@@ -498,7 +498,7 @@ def main():
 
     # Build root URI
     root_uri = f"https://{module.params['baseuri']}"
-    rf_utils = RedfishUtils(creds, root_uri, timeout, module)
+    rf_utils = RedfishUtils(creds, root_uri, timeout, module, cache_get_requests=True)
 
     # Build Category list
     if "all" in module.params["category"]:
@@ -0,0 +1,109 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Serialization of cache payloads shared by the key/value cache plugins."""
+
+from __future__ import annotations
+
+import json
+import typing as t
+import zlib
+
+from ansible.errors import AnsibleError
+from ansible.parsing.ajson import AnsibleJSONEncoder, AnsibleJSONDecoder
+
+try:
+    import msgpack
+
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+try:
+    import zstandard
+
+    HAS_ZSTANDARD = True
+except ImportError:
+    HAS_ZSTANDARD = False
+
+
+HEADER_PREFIX = b"\x00ansible-cache-v1:"
+"""Every encoded payload starts with this prefix, followed by the codec name and a newline."""
+
+CODECS = ("legacy", "json", "zlib", "zstd", "msgpack")
+
+# ansible-core 2.19+ only provides these through a module __getattr__
+_JSONEncoder = t.cast("type[json.JSONEncoder]", AnsibleJSONEncoder)
+_JSONDecoder = t.cast("type[json.JSONDecoder]", AnsibleJSONDecoder)
+
+
+def _dump_json(value: t.Any) -> bytes:
+    return json.dumps(value, cls=_JSONEncoder, separators=(",", ":")).encode("utf-8")
+
+
+def _load_json(data: bytes) -> t.Any:
+    return json.loads(data, cls=_JSONDecoder)
+
+
+def _dump_msgpack(value: t.Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True, default=_JSONEncoder().default)
+
+
+def _load_msgpack(data: bytes) -> t.Any:
+    return msgpack.unpackb(data, raw=False, object_hook=_JSONDecoder().object_hook)
+
+
+def _dump_zstd(value: t.Any) -> bytes:
+    return zstandard.ZstdCompressor().compress(_dump_json(value))
+
+
+def _load_zstd(data: bytes) -> t.Any:
+    return _load_json(zstandard.ZstdDecompressor().decompress(data))
+
+
+_ENCODERS = {
+    "json": _dump_json,
+    "zlib": lambda value: zlib.compress(_dump_json(value)),
+    "zstd": _dump_zstd,
+    "msgpack": _dump_msgpack,
+}
+
+_DECODERS = {
+    "json": _load_json,
+    "zlib": lambda data: _load_json(zlib.decompress(data)),
+    "zstd": _load_zstd,
+    "msgpack": _load_msgpack,
+}
+
+
+def check_codec(codec: str) -> None:
+    """Raise an AnsibleError if the Python library needed by ``codec`` is missing."""
+    if codec not in CODECS:
+        raise AnsibleError(f"Unknown cache codec {codec!r}, expected one of {', '.join(CODECS)}")
+    if codec == "msgpack" and not HAS_MSGPACK:
+        raise AnsibleError("The 'msgpack' python module is required for the msgpack cache codec, 'pip install msgpack'")
+    if codec == "zstd" and not HAS_ZSTANDARD:
+        raise AnsibleError(
+            "The 'zstandard' python module is required for the zstd cache codec, 'pip install zstandard'"
+        )
+
+
+def is_encoded(data: t.Any) -> bool:
+    """Tell whether ``data`` was produced by ``encode()``, as opposed to a legacy entry."""
+    return isinstance(data, bytes) and data.startswith(HEADER_PREFIX)
+
+
+def encode(value: t.Any, codec: str) -> bytes:
+    """Serialize ``value`` with ``codec`` and prepend the versioned header."""
+    return HEADER_PREFIX + codec.encode("ascii") + b"\n" + _ENCODERS[codec](value)
+
+
+def decode(data: bytes) -> t.Any:
+    """Deserialize a payload produced by ``encode()``, whichever codec it was written with."""
+    header, sep, payload = data[len(HEADER_PREFIX) :].partition(b"\n")
+    codec = header.decode("ascii", errors="replace")
+    if not sep or codec not in _DECODERS:
+        raise AnsibleError(f"Cannot decode cache entry written with unknown codec {codec!r}")
+    check_codec(codec)
+    return _DECODERS[codec](payload)
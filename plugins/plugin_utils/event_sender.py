@@ -0,0 +1,227 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Background delivery of callback events to HTTP collectors, in batches."""
+
+from __future__ import annotations
+
+import http.client
+import queue
+import ssl
+import threading
+import time
+import typing as t
+import urllib.request
+from urllib.parse import urlsplit
+
+from ansible.utils.display import Display
+
+display = Display()
+
+BuildRequest = t.Callable[[list[bytes], t.Hashable], tuple[bytes, dict[str, str]]]
+"""Turns a batch of serialized events sharing the same group into a request body and its headers."""
+
+_RETRY_STATUS = frozenset((408, 429, 500, 502, 503, 504))
+
+_STOP = object()
+
+
+class _FlushMarker:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class BatchingEventSender:
+    """
+    Ship serialized events to an HTTP endpoint from a background thread.
+
+    ``send()`` only puts the event on a bounded queue, so that callbacks do not
+    wait for the collector. The background thread groups queued events by their
+    ``group`` and POSTs a group as soon as it reaches ``max_batch_size`` events
+    or ``max_batch_bytes`` bytes, or when the oldest pending event is
+    ``flush_interval`` seconds old. Requests go over a single keep-alive
+    connection and are retried with exponential backoff on connection errors
+    and on transient HTTP errors.
+
+    When the queue is full, ``send()`` drops the event and counts it in
+    ``dropped_events``, so that a slow or unreachable collector never blocks
+    the playbook. ``close()`` warns about dropped events.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        build_request: BuildRequest,
+        validate_certs: bool = True,
+        max_batch_size: int = 100,
+        max_batch_bytes: int = 1024 * 1024,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 30,
+    ) -> None:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            raise ValueError(f"Unsupported collector URL {url!r}")
+        self.url = url
+        self._scheme = parts.scheme
+        self._netloc = parts.netloc
+        self._path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self._build_request = build_request
+        self._validate_certs = validate_certs
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_batch_bytes = max_batch_bytes
+        self._flush_interval = flush_interval
+        self._retries = retries
+        self._backoff = backoff
+        self._timeout = timeout
+
+        self._connection: http.client.HTTPConnection | None = None
+        self._request_path = self._path
+        self._queue: queue.Queue = queue.Queue(max_queue_size)
+        self._closed = False
+        self.sent_events = 0
+        self.failed_events = 0
+        self.dropped_events = 0
+
+        self._thread = threading.Thread(target=self._run, name="ansible-event-sender", daemon=True)
+        self._thread.start()
+
+    def send(self, event: bytes, group: t.Hashable = None) -> None:
+        """Queue a serialized event for delivery, or drop it if the queue is full."""
+        if self._closed:
+            raise ValueError("The event sender is closed")
+        try:
+            self._queue.put_nowait((group, event))
+        except queue.Full:
+            self.dropped_events += 1
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Deliver all events queued so far. Return whether this finished within ``timeout``."""
+        if not self._thread.is_alive():
+            return True
+        marker = _FlushMarker()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def close(self, timeout: float | None = None) -> None:
+        """Deliver all queued events and stop the background thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            deadline = None if timeout is None else time.monotonic() + timeout
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            else:
+                self._thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        if self.dropped_events:
+            display.warning(f"Could not send {self.dropped_events} event(s) to {self.url}: queue full")
+
+    def _run(self) -> None:
+        pending: dict[t.Hashable, list[bytes]] = {}
+        pending_bytes: dict[t.Hashable, int] = {}
+        deadline = None
+        while True:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+
+            if item is None or item is _STOP or isinstance(item, _FlushMarker):
+                for group, events in pending.items():
+                    self._deliver(events, group)
+                pending.clear()
+                pending_bytes.clear()
+                deadline = None
+                if item is _STOP:
+                    self._close_connection()
+                    return
+                if isinstance(item, _FlushMarker):
+                    item.done.set()
+                continue
+
+            group, event = item
+            events = pending.setdefault(group, [])
+            events.append(event)
+            pending_bytes[group] = pending_bytes.get(group, 0) + len(event)
+            if len(events) >= self._max_batch_size or pending_bytes[group] >= self._max_batch_bytes:
+                self._deliver(events, group)
+                del pending[group], pending_bytes[group]
+            if not pending:
+                deadline = None
+            elif deadline is None:
+                deadline = time.monotonic() + self._flush_interval
+
+    def _deliver(self, events: list[bytes], group: t.Hashable) -> None:
+        error = None
+        try:
+            body, headers = self._build_request(events, group)
+            for attempt in range(self._retries + 1):
+                if attempt:
+                    time.sleep(self._backoff * 2 ** (attempt - 1))
+                try:
+                    status, reason = self._post(body, headers)
+                except (OSError, http.client.HTTPException) as exc:
+                    self._close_connection()
+                    error = str(exc) or type(exc).__name__
+                    continue
+                if status < 300:
+                    self.sent_events += len(events)
+                    return
+                error = f"HTTP Error {status}: {reason}"
+                if status not in _RETRY_STATUS:
+                    break
+        except Exception as exc:
+            error = str(exc)
+
+        self.failed_events += len(events)
+        display.warning(f"Could not send {len(events)} event(s) to {self.url}: {error}")
+
+    def _post(self, body: bytes, headers: dict[str, str]) -> tuple[int, str]:
+        if self._connection is None:
+            self._connection = self._connect()
+        request_headers = {"User-Agent": "ansible-httpget"}
+        request_headers.update(headers)
+        self._connection.request("POST", self._request_path, body=body, headers=request_headers)
+        response = self._connection.getresponse()
+        response.read()
+        if response.will_close:
+            self._close_connection()
+        return response.status, response.reason
+
+    def _connect(self) -> http.client.HTTPConnection:
+        host = self._netloc.rpartition("@")[2]
+        proxy = urllib.request.getproxies().get(self._scheme)
+        if proxy and urllib.request.proxy_bypass(host.rpartition(":")[0] or host):
+            proxy = None
+        proxy_netloc = urlsplit(proxy).netloc if proxy else None
+
+        if self._scheme == "https":
+            context = ssl.create_default_context()
+            if not self._validate_certs:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            connection = http.client.HTTPSConnection(proxy_netloc or host, timeout=self._timeout, context=context)
+            if proxy_netloc:
+                connection.set_tunnel(host)
+            return connection
+
+        if proxy_netloc:
+            # plain HTTP proxies expect the absolute URL in the request line
+            self._request_path = f"http://{host}{self._path}"
+        return http.client.HTTPConnection(proxy_netloc or host, timeout=self._timeout)
+
+    def _close_connection(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,152 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Non-blocking delivery of log records over a persistent stream socket."""
+
+from __future__ import annotations
+
+import collections
+import random
+import socket
+import threading
+import typing as t
+
+
+class BufferedStreamAppender:
+    """
+    Write records to a stream socket from a background thread.
+
+    ``put()`` appends the record to a ring buffer and returns immediately. When
+    the buffer already holds ``max_records`` records, the oldest one is dropped
+    and counted in ``dropped_records``, so that a slow or unreachable endpoint
+    never blocks the caller.
+
+    The writer thread sends everything buffered so far with as few
+    ``sendall()`` calls as possible, at most ``max_write_bytes`` each, over a
+    connection that stays open. When the connection fails, it is reopened with
+    exponential backoff between ``min_delay`` and ``max_delay`` seconds, and the
+    records of the failed write are sent again.
+    """
+
+    def __init__(
+        self,
+        connect: t.Callable[[], socket.socket],
+        max_records: int = 10000,
+        max_write_bytes: int = 64 * 1024,
+        min_delay: float = 0.1,
+        max_delay: float = 10.0,
+    ) -> None:
+        self._connect = connect
+        self._max_records = max(1, max_records)
+        self._max_write_bytes = max_write_bytes
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+
+        self._sock: socket.socket | None = None
+        self._buffer: collections.deque[bytes] = collections.deque()
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._closing = False
+        self._abort = threading.Event()
+        self.sent_records = 0
+        self.dropped_records = 0
+        self.reconnects = 0
+        self.last_error: str | None = None
+
+        self._thread = threading.Thread(target=self._run, name="ansible-stream-appender", daemon=True)
+        self._thread.start()
+
+    def put(self, data: bytes) -> None:
+        """Queue a record, dropping the oldest buffered record if the buffer is full."""
+        with self._cond:
+            if self._closing:
+                raise ValueError("The appender is closed")
+            if len(self._buffer) >= self._max_records:
+                self._buffer.popleft()
+                self.dropped_records += 1
+            self._buffer.append(data)
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until all buffered records are written. Return whether this finished within ``timeout``."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._buffer and not self._in_flight, timeout)
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """
+        Write the buffered records and close the connection.
+
+        Records that could not be written within ``timeout`` seconds are dropped.
+        """
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            self._abort.set()
+            self._thread.join(1.0)
+
+    def _take_batch(self) -> list[bytes]:
+        batch: list[bytes] = []
+        size = 0
+        while self._buffer and (not batch or size + len(self._buffer[0]) <= self._max_write_bytes):
+            record = self._buffer.popleft()
+            batch.append(record)
+            size += len(record)
+        self._in_flight = len(batch)
+        return batch
+
+    def _requeue(self, batch: list[bytes]) -> None:
+        room = self._max_records - len(self._buffer)
+        if room < len(batch):
+            self.dropped_records += len(batch) - max(room, 0)
+            batch = batch[len(batch) - max(room, 0) :]
+        self._buffer.extendleft(reversed(batch))
+
+    def _run(self) -> None:
+        delay = self._min_delay
+        while True:
+            with self._cond:
+                while not self._buffer and not self._closing:
+                    self._cond.wait()
+                if not self._buffer:
+                    break
+                batch = self._take_batch()
+
+            try:
+                if self._sock is None:
+                    self._sock = self._connect()
+                self._sock.sendall(b"".join(batch))
+            except OSError as exc:
+                self._close_socket()
+                self.reconnects += 1
+                self.last_error = str(exc) or type(exc).__name__
+                with self._cond:
+                    self._in_flight = 0
+                    self._requeue(batch)
+                    self._cond.notify_all()
+                if self._abort.wait(delay + random.uniform(0, delay)):
+                    break
+                delay = min(delay * 2, self._max_delay)
+                continue
+
+            delay = self._min_delay
+            with self._cond:
+                self.sent_records += len(batch)
+                self._in_flight = 0
+                self._cond.notify_all()
+
+        with self._cond:
+            self.dropped_records += len(self._buffer)
+            self._buffer.clear()
+            self._cond.notify_all()
+        self._close_socket()
+
+    def _close_socket(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
@@ -5,6 +5,9 @@
 # Make coding more python3-ish
 from __future__ import annotations
 
+import copy
+import time
+
 import pytest
 
 pytest.importorskip("memcache")
@@ -15,3 +18,160 @@ from ansible_collections.community.general.plugins.cache.memcached import CacheM
 
 def test_memcached_cachemodule():
     assert isinstance(cache_loader.get("community.general.memcached"), MemcachedCache)
+
+
+class FakeMemcacheClient:
+    """
+    Dict-backed stand-in for memcache.Client, shared between all instances.
+    """
+
+    data = {}
+    writes = []
+
+    def __init__(self, *args, **kwargs):
+        self.cas_ids = {}
+
+    def get(self, key):
+        return copy.deepcopy(self.data.get(key))
+
+    def get_multi(self, keys, key_prefix=""):
+        return {key: self.get(key_prefix + key) for key in keys if key_prefix + key in self.data}
+
+    def gets(self, key):
+        self.cas_ids[key] = self.data.get(key)
+        return self.get(key)
+
+    def set(self, key, value, time=0, min_compress_len=0):
+        self.writes.append(key)
+        self.data[key] = copy.deepcopy(value)
+        return True
+
+    def add(self, key, value, time=0, min_compress_len=0):
+        if key in self.data:
+            return False
+        return self.set(key, value)
+
+    def cas(self, key, value, time=0, min_compress_len=0):
+        if self.data.get(key) != self.cas_ids.get(key):
+            return False
+        return self.set(key, value)
+
+    def reset_cas(self):
+        self.cas_ids = {}
+
+    def delete(self, key):
+        self.data.pop(key, None)
+        return 1
+
+    def disconnect_all(self):
+        pass
+
+
+@pytest.fixture
+def fake_memcached(monkeypatch):
+    monkeypatch.setattr(FakeMemcacheClient, "data", {})
+    monkeypatch.setattr(FakeMemcacheClient, "writes", [])
+    monkeypatch.setattr("memcache.Client", FakeMemcacheClient)
+    cache = cache_loader.get("community.general.memcached")
+    # newer ansible-core wraps cache plugins to serialize payloads; test the plugin itself
+    return getattr(cache, "__wrapped__", cache)
+
+
+@pytest.mark.parametrize("codec", ["json", "zlib"])
+def test_memcached_codec_roundtrip(fake_memcached, codec):
+    facts = {"ansible_hostname": "host1", "ansible_mounts": [{"mount": "/", "size": 1024}] * 50}
+    fake_memcached._codec = codec
+    fake_memcached.set("host1", facts)
+    fake_memcached._cache.clear()
+
+    raw = FakeMemcacheClient.data["ansible_factshost1"]
+    assert raw.startswith(b"\x00ansible-cache-v1:" + codec.encode() + b"\n")
+    assert fake_memcached.get("host1") == facts
+
+
+def test_memcached_codec_reads_legacy_entries(fake_memcached):
+    fake_memcached.set("host1", {"a": 1})
+    fake_memcached._codec = "json"
+    fake_memcached.set("host2", {"b": 2})
+    fake_memcached._cache.clear()
+
+    assert fake_memcached.get("host1") == {"a": 1}
+    assert fake_memcached.get("host2") == {"b": 2}
+
+
+def test_memcached_key_index_writes_one_bucket_per_host(fake_memcached):
+    for i in range(100):
+        fake_memcached.set(f"host{i}", {"i": i})
+
+    index_writes = [key for key in FakeMemcacheClient.writes if key.startswith("ansible_cache_keys")]
+    assert len(index_writes) == 100
+    assert all(
+        len(value) < 100 for key, value in FakeMemcacheClient.data.items() if key.startswith("ansible_cache_keys")
+    )
+    assert sorted(fake_memcached.keys()) == sorted(f"host{i}" for i in range(100))
+
+
+def test_memcached_key_index_concurrent_writers(fake_memcached, monkeypatch):
+    bucket = fake_memcached._keys._bucket_name("host1")
+    original_gets = FakeMemcacheClient.gets
+    raced = []
+
+    def racing_gets(self, key):
+        result = original_gets(self, key)
+        if key == bucket and not raced:
+            # another fork updates the same bucket between our read and write
+            raced.append(key)
+            FakeMemcacheClient.data[bucket] = {"intruder": time.time()}
+        return result
+
+    monkeypatch.setattr(FakeMemcacheClient, "gets", racing_gets)
+    fake_memcached.set("host1", {"a": 1})
+
+    assert set(FakeMemcacheClient.data[bucket]) == {"host1", "intruder"}
+    assert sorted(fake_memcached.keys()) == ["host1", "intruder"]
+
+
+def test_memcached_key_index_migrates_legacy_keyset(fake_memcached):
+    FakeMemcacheClient.data["ansible_cache_keys"] = {"host1": time.time()}
+    FakeMemcacheClient.data["ansible_factshost1"] = {"a": 1}
+
+    cache = cache_loader.get("community.general.memcached")
+    cache = getattr(cache, "__wrapped__", cache)
+
+    assert "ansible_cache_keys" not in FakeMemcacheClient.data
+    assert cache.keys() == ["host1"]
+
+
+def test_memcached_expire_keys(fake_memcached):
+    fake_memcached.set("host1", {"a": 1})
+    fake_memcached.set("host2", {"b": 2})
+    fake_memcached._keys.remove_by_timerange(0, time.time() + 1)
+
+    assert fake_memcached.keys() == []
+    assert not fake_memcached.contains("host1")
+
+
+def test_memcached_expire_keys_of_other_writers(fake_memcached):
+    fake_memcached._timeout = 100
+    fake_memcached.set("host1", {"a": 1})
+
+    # another fork stores an old key in a bucket that was empty when this one read it
+    other = fake_memcached._keys._bucket_name("host2")
+    assert other != fake_memcached._keys._bucket_name("host1")
+    FakeMemcacheClient.data[other] = {"host2": time.time() - 200}
+
+    assert fake_memcached.keys() == ["host1"]
+    assert FakeMemcacheClient.data[other] == {}
+
+
+def test_memcached_copy(fake_memcached):
+    fake_memcached._get_multi_chunk_size = 3
+    for i in range(10):
+        fake_memcached.set(f"host{i}", {"i": i})
+    fake_memcached._cache.clear()
+    del FakeMemcacheClient.data["ansible_factshost5"]
+
+    result = fake_memcached.copy()
+
+    assert result == {f"host{i}": {"i": i} for i in range(10) if i != 5}
+    assert "host5" not in fake_memcached.keys()
@@ -23,3 +23,186 @@ def test_redis_cachemodule_2():
     # The _uri option is required for the redis plugin
     connection = "[::1]:6379:1"
     assert isinstance(cache_loader.get("community.general.redis", **{"_uri": connection}), RedisCache)
+
+
+class FakeRedis:
+    """
+    Minimal in-process stand-in for StrictRedis that counts network round trips.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.data = {}
+        self.zset = {}
+        self.round_trips = 0
+
+    def _call(self, name, *args):
+        return getattr(self, f"_cmd_{name}")(*args)
+
+    def __getattr__(self, name):
+        if not hasattr(type(self), f"_cmd_{name}"):
+            raise AttributeError(name)
+
+        def command(*args):
+            self.round_trips += 1
+            return self._call(name, *args)
+
+        return command
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def _cmd_get(self, key):
+        return self.data.get(key)
+
+    def _cmd_mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def _cmd_set(self, key, value):
+        self.data[key] = value if isinstance(value, bytes) else value.encode()
+
+    def _cmd_setex(self, key, timeout, value):
+        self._cmd_set(key, value)
+
+    def _cmd_delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def _cmd_zadd(self, name, mapping):
+        self.zset.update(mapping)
+
+    def _cmd_zrem(self, name, *keys):
+        for key in keys:
+            self.zset.pop(key, None)
+
+    def _cmd_zscore(self, name, key):
+        return self.zset.get(key)
+
+    def _cmd_zrangebyscore(self, name, s_min, s_max):
+        assert s_max == "+inf"
+        if s_min.startswith("("):
+            s_min = float(s_min[1:])
+            ranked = [key for key in self.zset if self.zset[key] > s_min]
+        else:
+            ranked = list(self.zset)
+        return [key.encode() for key in sorted(ranked, key=self.zset.get)]
+
+    def _cmd_zremrangebyscore(self, name, s_min, s_max):
+        self.expirations = getattr(self, "expirations", 0) + 1
+        for key in [k for k, v in self.zset.items() if s_min <= v <= s_max]:
+            del self.zset[key]
+
+
+class FakePipeline:
+    def __init__(self, db):
+        self.db = db
+        self.commands = []
+
+    def __getattr__(self, name):
+        def command(*args):
+            self.commands.append((name, args))
+
+        return command
+
+    def execute(self):
+        self.db.round_trips += 1
+        return [self.db._call(name, *args) for name, args in self.commands]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    monkeypatch.setattr("ansible_collections.community.general.plugins.cache.redis.StrictRedis", FakeRedis)
+    monkeypatch.setattr("ansible_collections.community.general.plugins.cache.redis.VERSION", (4, 0, 0))
+    cache = cache_loader.get("community.general.redis", **{"_uri": "127.0.0.1:6379:1"})
+    # newer ansible-core wraps cache plugins to serialize payloads; test the plugin itself
+    return getattr(cache, "__wrapped__", cache)
+
+
+def test_redis_set_single_round_trip(fake_redis):
+    fake_redis.set("host1", {"a": 1})
+    assert fake_redis._db.round_trips == 1
+    assert fake_redis.contains("host1")
+    assert fake_redis._db.round_trips == 2
+
+
+def test_redis_copy_uses_chunked_mget(fake_redis):
+    fake_redis._mget_chunk_size = 10
+    for i in range(25):
+        fake_redis.set(f"host{i}", {"i": i})
+
+    fake_redis._cache.clear()
+    fake_redis._db.round_trips = 0
+    result = fake_redis.copy()
+
+    assert result == {f"host{i}": {"i": i} for i in range(25)}
+    # one round trip for keys(), three for the MGET chunks
+    assert fake_redis._db.round_trips == 4
+
+
+def test_redis_get_many_drops_stale_keys(fake_redis):
+    fake_redis.set("host1", {"a": 1})
+    fake_redis.set("host2", {"b": 2})
+    fake_redis._cache.clear()
+    del fake_redis._db.data["ansible_factshost2"]
+
+    assert fake_redis.get_many(["host1", "host2"]) == {"host1": {"a": 1}}
+    assert fake_redis.keys() == ["host1"]
+
+
+def test_redis_flush(fake_redis):
+    for i in range(5):
+        fake_redis.set(f"host{i}", {"i": i})
+    fake_redis._db.round_trips = 0
+
+    fake_redis.flush()
+
+    assert fake_redis._db.round_trips == 2
+    assert fake_redis.keys() == []
+    assert fake_redis._db.data == {}
+
+
+@pytest.mark.parametrize("codec", ["json", "zlib", "zstd", "msgpack"])
+def test_redis_codec_roundtrip(fake_redis, codec):
+    if codec == "zstd":
+        pytest.importorskip("zstandard")
+    if codec == "msgpack":
+        pytest.importorskip("msgpack")
+    facts = {"ansible_hostname": "host1", "ansible_mounts": [{"mount": "/", "size": 1024}] * 50}
+    fake_redis._codec = codec
+    fake_redis.set("host1", facts)
+    fake_redis._cache.clear()
+
+    raw = fake_redis._db.data["ansible_factshost1"]
+    assert raw.startswith(b"\x00ansible-cache-v1:" + codec.encode() + b"\n")
+    assert fake_redis.get("host1") == facts
+
+
+def test_redis_codec_reads_legacy_entries(fake_redis):
+    fake_redis.set("host1", {"a": 1})
+    fake_redis._codec = "zlib"
+    fake_redis.set("host2", {"b": 2})
+    fake_redis._cache.clear()
+
+    assert fake_redis.copy() == {"host1": {"a": 1}, "host2": {"b": 2}}
+
+
+def test_redis_expiry_is_rate_limited(fake_redis, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("ansible_collections.community.general.plugins.cache.redis.time.time", lambda: now[0])
+    fake_redis._timeout = 100.0
+    fake_redis.set("old", {"a": 1})
+    now[0] += 50
+    fake_redis.set("new", {"b": 2})
+
+    now[0] += 60
+    assert fake_redis.keys() == ["new"]
+    assert not fake_redis.contains("old")
+    assert fake_redis.contains("new")
+    assert fake_redis._db.expirations == 1
+    assert "old" not in fake_redis._db.zset
+
+    now[0] += 5
+    fake_redis.keys()
+    assert fake_redis._db.expirations == 1
+    now[0] += 5
+    fake_redis.keys()
+    assert fake_redis._db.expirations == 2
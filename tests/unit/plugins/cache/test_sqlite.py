@@ -0,0 +1,81 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import pytest
+
+from ansible.plugins.loader import cache_loader
+from ansible_collections.community.general.plugins.cache.sqlite import CacheModule as SqliteCache
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    cache = cache_loader.get("community.general.sqlite", **{"_uri": str(tmp_path / "facts.sqlite")})
+    # newer ansible-core wraps cache plugins to serialize payloads; test the plugin itself
+    return getattr(cache, "__wrapped__", cache)
+
+
+def test_sqlite_cachemodule(tmp_path):
+    cache = cache_loader.get("community.general.sqlite", **{"_uri": str(tmp_path / "facts.sqlite")})
+    assert isinstance(cache, SqliteCache)
+
+
+def test_sqlite_set_get(sqlite_cache):
+    sqlite_cache.set("host1", {"a": 1})
+    sqlite_cache._cache.clear()
+
+    assert sqlite_cache.contains("host1")
+    assert not sqlite_cache.contains("host2")
+    assert sqlite_cache.get("host1") == {"a": 1}
+    with pytest.raises(KeyError):
+        sqlite_cache.get("host2")
+
+
+def test_sqlite_shared_between_instances(sqlite_cache):
+    other = cache_loader.get("community.general.sqlite", **{"_uri": sqlite_cache._path})
+    other = getattr(other, "__wrapped__", other)
+    sqlite_cache.set("host1", {"a": 1})
+    other.set("host2", {"b": 2})
+
+    assert sorted(sqlite_cache.keys()) == ["host1", "host2"]
+    assert sqlite_cache.copy() == {"host1": {"a": 1}, "host2": {"b": 2}}
+
+
+def test_sqlite_get_many(sqlite_cache):
+    sqlite_cache._select_chunk_size = 3
+    for i in range(10):
+        sqlite_cache.set(f"host{i}", {"i": i})
+    sqlite_cache._cache.clear()
+
+    assert sqlite_cache.get_many(["host1", "host5", "host9", "missing"]) == {
+        "host1": {"i": 1},
+        "host5": {"i": 5},
+        "host9": {"i": 9},
+    }
+
+
+def test_sqlite_expiry(sqlite_cache):
+    sqlite_cache.set("host1", {"a": 1})
+    sqlite_cache.set("host2", {"b": 2})
+    sqlite_cache._db().execute("UPDATE cache SET timestamp = 0 WHERE key = ?", ("ansible_factshost1",))
+    sqlite_cache._cache.clear()
+
+    assert sqlite_cache.keys() == ["host2"]
+    assert not sqlite_cache.contains("host1")
+
+    sqlite_cache._expire_keys()
+    rows = sqlite_cache._db().execute("SELECT key FROM cache").fetchall()
+    assert rows == [("ansible_factshost2",)]
+
+
+def test_sqlite_delete_flush(sqlite_cache):
+    for i in range(3):
+        sqlite_cache.set(f"host{i}", {"i": i})
+
+    sqlite_cache.delete("host0")
+    assert sorted(sqlite_cache.keys()) == ["host1", "host2"]
+
+    sqlite_cache.flush()
+    assert sqlite_cache.keys() == []
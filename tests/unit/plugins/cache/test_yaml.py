@@ -0,0 +1,91 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+
+import pytest
+
+from ansible.plugins.loader import cache_loader
+from ansible_collections.community.general.plugins.cache import yaml as yaml_cache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(yaml_cache, "_LOADED", OrderedDict())
+    cache = cache_loader.get("community.general.yaml", **{"_uri": str(tmp_path), "_prefix": ""})
+    # newer ansible-core wraps cache plugins to serialize payloads; test the plugin itself
+    return getattr(cache, "__wrapped__", cache)
+
+
+def test_yaml_roundtrip(cache):
+    facts = {"ansible_mounts": [{"mount": "/", "size": 1024}], "ansible_hostname": "host1"}
+    cache.set("host1", facts)
+    cache._cache.clear()
+
+    assert cache.get("host1") == facts
+
+
+def test_yaml_load_is_memoized(cache, monkeypatch):
+    cache.set("host1", {"a": 1})
+    loads = []
+    original_load = yaml_cache.yaml.load
+
+    def counting_load(*args, **kwargs):
+        loads.append(args)
+        return original_load(*args, **kwargs)
+
+    monkeypatch.setattr(yaml_cache.yaml, "load", counting_load)
+    first = cache._load(cache._get_cache_file_name("host1"))
+    first["a"] = 2
+    second = cache._load(cache._get_cache_file_name("host1"))
+
+    assert second == {"a": 1}
+    assert len(loads) == 1
+
+
+def test_yaml_load_detects_changed_file(cache):
+    path = cache._get_cache_file_name("host1")
+    cache.set("host1", {"a": 1})
+    assert cache._load(path) == {"a": 1}
+
+    cache.set("host1", {"a": 12})
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+
+    assert cache._load(path) == {"a": 12}
+
+
+def test_yaml_load_detects_same_size_and_mtime(cache):
+    path = cache._get_cache_file_name("host1")
+    cache.set("host1", {"a": 1})
+    st = os.stat(path)
+    assert cache._load(path) == {"a": 1}
+
+    # rewritten within the timestamp granularity, with the same size
+    cache.set("host1", {"a": 2})
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    assert cache._load(path) == {"a": 2}
+
+
+def test_yaml_load_memo_is_bounded(cache, monkeypatch):
+    monkeypatch.setattr(yaml_cache, "_LOADED_MAX", 2)
+    for host in ("host1", "host2", "host3"):
+        cache.set(host, {"host": host})
+        cache._load(cache._get_cache_file_name(host))
+    cache._load(cache._get_cache_file_name("host2"))
+    cache.set("host4", {"host": "host4"})
+    cache._load(cache._get_cache_file_name("host4"))
+
+    assert [os.path.basename(path) for path in yaml_cache._LOADED] == ["host2", "host4"]
+
+
+def test_yaml_load_ansible_tags(cache, tmp_path):
+    path = tmp_path / "host1"
+    path.write_text("foo: !unsafe '{{ bar }}'\n")
+
+    assert cache._load(str(path)) == {"foo": "{{ bar }}"}
@@ -70,3 +70,20 @@ class TestAzureLogAnalytics(unittest.TestCase):
 
         self.assertRegex(headers["Authorization"], r"^SharedKey 01234567-0123-0123-0123-01234567890a:.*=$")
         self.assertEqual(headers["Log-Type"], "ansible_playbook")
+
+    @patch("ansible_collections.community.general.plugins.callback.loganalytics.BatchingEventSender")
+    def test_send_async_batch(self, sender_mock):
+        self.loganalytics.start_sender(
+            workspace_id="01234567-0123-0123-0123-01234567890a",
+            shared_key="dZD0kCbKl3ehZG6LHFMuhtE0yHiFCmetzFMc2u+roXIUQuatqU924SsAAAAPemhjbGlAemhjbGktTUJQAQIDBA==",
+            batch_size=100,
+            flush_interval=1.0,
+        )
+        args, kwargs = sender_mock.call_args
+        build_request = args[1]
+
+        body, headers = build_request([b'{"event": {"uuid": "a"}}', b'{"event": {"uuid": "b"}}'], None)
+
+        self.assertEqual([record["event"]["uuid"] for record in json.loads(body)], ["a", "b"])
+        self.assertRegex(headers["Authorization"], r"^SharedKey 01234567-0123-0123-0123-01234567890a:.*=$")
+        self.assertEqual(headers["Log-Type"], "ansible_playbook")
@@ -10,7 +10,14 @@ from unittest.mock import patch, MagicMock, Mock
 
 from ansible.playbook.task import Task
 from ansible.executor.task_result import TaskResult
-from ansible_collections.community.general.plugins.callback.opentelemetry import OpenTelemetrySource, TaskData
+from ansible_collections.community.general.plugins.callback.opentelemetry import (
+    OTEL_LIBRARY_IMPORT_ERROR,
+    OpenTelemetrySource,
+    TaskData,
+)
+
+if not OTEL_LIBRARY_IMPORT_ERROR:
+    from opentelemetry.trace.status import Status, StatusCode
 
 
 class TestOpentelemetry(unittest.TestCase):
@@ -205,6 +212,38 @@ class TestOpentelemetry(unittest.TestCase):
             else:
                 self.assertEqual(result, tc[1])
 
+    @unittest.skipIf(OTEL_LIBRARY_IMPORT_ERROR, "requires the opentelemetry libraries")
+    def test_export_spans_incrementally(self):
+        tasks_data = OrderedDict()
+        exporter = self.opentelemetry.start_playbook_span("ansible", "playbook.yml", None, "grpc", "/spans.json")
+        self.opentelemetry.start_task(tasks_data, False, "myplay", self.mock_task)
+
+        self.opentelemetry.finish_task(tasks_data, "ok", self.my_task_result, "dump ok", keep_last=True)
+        failed_result = TaskResult(
+            host=self.mock_host, task=self.mock_task, return_data={"msg": "boom"}, task_fields=self.task_fields
+        )
+        self.opentelemetry.finish_task(tasks_data, "failed", failed_result, "dump failed", keep_last=True)
+
+        # the spans of the current task are kept until the next task starts
+        self.opentelemetry.export_tasks(tasks_data, False, False, keep="myuuid")
+        self.assertEqual(exporter.get_finished_spans(), ())
+
+        self.opentelemetry.export_tasks(tasks_data, False, False, keep="nexttask")
+        spans = exporter.get_finished_spans()
+        self.assertEqual([span.name for span in spans], ["mytask"])
+        self.assertEqual(spans[0].attributes["ansible.task.host.name"], "myhost")
+        # the last result of the host wins
+        self.assertEqual(spans[0].attributes["ansible.task.host.status"], "failed")
+        self.assertEqual(spans[0].events[-1].name, "dump failed")
+        self.assertEqual(spans[0].parent.span_id, self.opentelemetry.playbook_span.get_span_context().span_id)
+        # and the data of the exported task is dropped
+        self.assertEqual(tasks_data, OrderedDict())
+
+        self.opentelemetry.end_playbook_span(Status(status_code=StatusCode.OK))
+        spans = exporter.get_finished_spans()
+        self.assertEqual([span.name for span in spans], ["mytask", "playbook.yml"])
+        self.assertEqual(spans[1].attributes["ansible.host.name"], "my-host")
+
 
 def generate_test_data(exception=None, msg=None, stderr=None, failed=False):
     res_data = OrderedDict()
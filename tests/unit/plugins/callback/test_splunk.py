@@ -73,3 +73,28 @@ class TestSplunkClient(unittest.TestCase):
         self.assertEqual(sent_data["event"]["timestamp"], "2020-12-01 00:00:00 +0000")
         self.assertEqual(sent_data["event"]["host"], "my-host")
         self.assertEqual(sent_data["event"]["ip_address"], "1.2.3.4")
+
+    @patch("ansible_collections.community.general.plugins.callback.splunk.now")
+    @patch("ansible_collections.community.general.plugins.callback.splunk.open_url")
+    def test_send_async(self, open_url_mock, mock_now):
+        mock_now.return_value = datetime(2020, 12, 1)
+        result = TaskResult(host=self.mock_host, task=self.mock_task, return_data={}, task_fields=self.task_fields)
+        self.splunk.sender = Mock()
+
+        self.splunk.send_event(
+            url="endpoint",
+            authtoken="token",
+            validate_certs=False,
+            include_milliseconds=False,
+            batch=None,
+            state="OK",
+            result=result,
+            runtime=100,
+        )
+
+        open_url_mock.assert_not_called()
+        args, kwargs = self.splunk.sender.send.call_args
+        sent_data = json.loads(args[0])
+
+        self.assertEqual(sent_data["event"]["uuid"], "myuuid")
+        self.assertEqual(sent_data["event"]["ansible_host"], "myhost")
@@ -0,0 +1,43 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import pytest
+
+from ansible.errors import AnsibleFilterError
+
+from ansible_collections.community.general.plugins.filter import json_query as json_query_module
+from ansible_collections.community.general.plugins.filter.json_query import json_query
+
+jmespath = pytest.importorskip("jmespath")
+
+
+def test_query():
+    data = {"servers": [{"name": "a", "port": 1}, {"name": "b", "port": 2}]}
+    assert json_query(data, "servers[?port > `1`].name") == ["b"]
+
+
+def test_types_registered_once():
+    sizes = {key: len(value) for key, value in jmespath.functions.REVERSE_TYPES_MAP.items()}
+    json_query_module._register_ansible_types()
+    for dummy in range(100):
+        json_query({"a": "b"}, "a")
+
+    assert {key: len(value) for key, value in jmespath.functions.REVERSE_TYPES_MAP.items()} == sizes
+    assert "_AnsibleTaggedStr" in jmespath.functions.REVERSE_TYPES_MAP["string"]
+
+
+def test_expression_compiled_once():
+    json_query_module._compile.cache_clear()
+    for i in range(1000):
+        assert json_query({"items": [i]}, "items[0]") == i
+
+    info = json_query_module._compile.cache_info()
+    assert (info.misses, info.hits) == (1, 999)
+
+
+def test_invalid_expression():
+    with pytest.raises(AnsibleFilterError, match="JMESPathError"):
+        json_query({}, "items[")
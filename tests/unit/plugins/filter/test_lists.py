@@ -0,0 +1,119 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from ansible_collections.community.general.plugins.filter.lists import (
+    lists_difference,
+    lists_intersect,
+    lists_symmetric_difference,
+    lists_union,
+)
+
+
+def scan_unique(lst):
+    result = []
+    for item in lst:
+        if item not in result:
+            result.append(item)
+    return result
+
+
+# Reference implementations comparing the elements one by one
+def scan_union(*lists):
+    return scan_unique([item for lst in lists for item in lst])
+
+
+def scan_intersect(*lists):
+    result = scan_unique(lists[0])
+    for lst in lists[1:]:
+        result = [item for item in result if item in lst]
+    return result
+
+
+def scan_difference(*lists):
+    result = scan_unique(lists[0])
+    for lst in lists[1:]:
+        result = [item for item in result if item not in lst]
+    return result
+
+
+def scan_symmetric_difference(*lists):
+    result = scan_unique(lists[0])
+    for lst in lists[1:]:
+        union = scan_union(result, lst)
+        result = [item for item in union if not (item in result and item in lst)]
+    return result
+
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(6 if depth < 2 else 3)
+    if kind == 0:
+        return rng.choice([0, 1, 1.0, True, False])
+    if kind == 1:
+        return rng.choice(["x", "y", None])
+    if kind == 2:
+        return (rng.randrange(2), rng.choice("ab"))
+    if kind == 3:
+        return [random_value(rng, depth + 1) for dummy in range(rng.randrange(3))]
+    if kind == 4:
+        return (random_value(rng, depth + 1),)
+    return {rng.choice("ab"): random_value(rng, depth + 1) for dummy in range(rng.randrange(3))}
+
+
+@pytest.mark.parametrize(
+    "function, reference",
+    [
+        (lists_union, scan_union),
+        (lists_intersect, scan_intersect),
+        (lists_difference, scan_difference),
+        (lists_symmetric_difference, scan_symmetric_difference),
+    ],
+)
+def test_nested_values(function, reference):
+    rng = random.Random(42)
+    for dummy in range(300):
+        lists = [[random_value(rng) for dummy in range(rng.randrange(8))] for dummy in range(rng.randrange(2, 4))]
+        assert function(*lists) == reference(*lists)
+
+
+def test_distinguishes_lists_and_tuples():
+    assert lists_union([[1, 2], (1, 2)], [{"a": [1]}, {"a": (1,)}, {"a": [True]}]) == [
+        [1, 2],
+        (1, 2),
+        {"a": [1]},
+        {"a": (1,)},
+    ]
+    assert lists_intersect([{"a": [1, [2]]}, {"a": (1, [2])}], [{"a": (1, [2])}]) == [{"a": (1, [2])}]
+
+
+def test_unhashable_leaves():
+    class Unhashable:
+        __hash__ = None
+
+        def __init__(self, value):
+            self.value = value
+
+        def __eq__(self, other):
+            return isinstance(other, Unhashable) and self.value == other.value
+
+    a = [1, {"x": Unhashable(1)}, {"x": Unhashable(1)}, 2]
+    b = [{"x": Unhashable(1)}, 2]
+    assert lists_union(a, b) == [1, {"x": Unhashable(1)}, 2]
+    assert lists_intersect(a, b) == [{"x": Unhashable(1)}, 2]
+    assert lists_difference(a, b) == [1]
+
+
+def test_large_lists():
+    a = [{"name": f"host{i}", "vars": {"port": i % 1000, "tags": [i % 7]}} for i in range(20000)]
+    b = a[10000:] + [{"name": "other", "vars": {}}]
+
+    assert len(lists_union(a, b)) == 20001
+    assert lists_intersect(a, b) == a[10000:]
+    assert lists_difference(a, b) == a[:10000]
+    assert lists_symmetric_difference(a, b) == a[:10000] + [{"name": "other", "vars": {}}]
@@ -0,0 +1,74 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from ansible.errors import AnsibleFilterError
+
+from ansible_collections.community.general.plugins.filter.lists_mergeby import list_mergeby, lists_mergeby
+
+LIST_MERGE = ("replace", "keep", "append", "prepend", "append_rp", "prepend_rp")
+
+
+def pairwise_mergeby(lists, index, recursive, list_merge):
+    # The former implementation of lists_mergeby, merging the lists two at a time from the back
+    result = lists[-1]
+    for lst in reversed(lists[:-1]):
+        result = list_mergeby(lst, result, index, recursive, list_merge)
+    return result
+
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(4 if depth < 2 else 2)
+    if kind == 0:
+        return rng.randrange(3)
+    if kind == 1:
+        return rng.choice(["x", "y", None])
+    if kind == 2:
+        return [rng.randrange(4) for dummy in range(rng.randrange(4))]
+    return {rng.choice("abc"): random_value(rng, depth + 1) for dummy in range(rng.randrange(3))}
+
+
+def random_lists(rng):
+    lists = []
+    for dummy in range(rng.randrange(2, 6)):
+        lst = []
+        for dummy in range(rng.randrange(8)):
+            elem = {key: random_value(rng) for key in rng.sample("abcd", rng.randrange(4))}
+            if rng.random() < 0.9:
+                elem["name"] = rng.randrange(6)
+            lst.append(elem)
+        lists.append(lst)
+    return lists
+
+
+@pytest.mark.parametrize("list_merge", LIST_MERGE)
+@pytest.mark.parametrize("recursive", [False, True])
+def test_same_as_pairwise_merge(recursive, list_merge):
+    rng = random.Random(f"{recursive}-{list_merge}")
+    for dummy in range(200):
+        lists = random_lists(rng)
+        assert lists_mergeby(lists, "name", recursive=recursive, list_merge=list_merge) == pairwise_mergeby(
+            lists, "name", recursive, list_merge
+        )
+
+
+def test_priority():
+    list1 = [{"name": "b", "x": {"p": 1, "q": [1]}}, {"name": "a", "x": {"p": 1}}]
+    list2 = [{"name": "b", "x": {"p": 2, "q": [2]}}]
+    list3 = [{"name": "b", "x": {"r": 3}}, {"name": "b", "x": {"q": [3]}}]
+
+    assert lists_mergeby(list1, list2, list3, "name", recursive=True, list_merge="append") == [
+        {"name": "a", "x": {"p": 1}},
+        {"name": "b", "x": {"p": 2, "q": [1, 2, 3], "r": 3}},
+    ]
+
+
+def test_not_a_dictionary():
+    with pytest.raises(AnsibleFilterError, match="must be dictionaries"):
+        lists_mergeby([{"name": 1}], ["name"], "name")
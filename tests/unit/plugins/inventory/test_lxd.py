@@ -121,3 +121,64 @@ def test_build_inventory_groups_with_no_groupselection(inventory):
         if generated_data[key] != value:
             eq = False
     assert eq
+
+
+class FakeLXDClient:
+    """Answers LXD API requests from the inventory test data."""
+
+    def __init__(self, data, recursion=True):
+        self.data = data
+        self.recursion = recursion
+        self.requests = []
+
+    def do(self, method, url):
+        self.requests.append(url)
+        path, dummy, query = url.partition("?")
+        parts = path.split("/")
+        if path == "/1.0/instances":
+            if self.recursion and "recursion=2" in query:
+                metadata = []
+                for name, instance in self.data["instances"].items():
+                    metadata.append(
+                        dict(instance["instances"]["metadata"], name=name, state=instance["state"]["metadata"])
+                    )
+            else:
+                metadata = [f"/1.0/instances/{name}" for name in self.data["instances"]]
+            return {"type": "sync", "metadata": metadata}
+        if path == "/1.0/networks":
+            return {"type": "sync", "metadata": [f"/1.0/networks/{name}" for name in self.data["networks"]]}
+        if parts[2] == "instances":
+            instance = self.data["instances"][parts[3]]
+            return dict(instance["state" if len(parts) > 4 else "instances"], type="sync")
+        return dict(self.data["networks"][parts[3]]["state"], type="sync")
+
+    def do_many(self, requests, return_exceptions=False):
+        return [self.do(**kwargs) for kwargs in requests]
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("recursion", [True, False])
+def test_populate_from_server(inventory, mocker, recursion):
+    expected = inventory.data
+    inventory.data = {}
+    inventory.project = "default"
+    inventory.max_connections = 4
+    client = FakeLXDClient(expected, recursion=recursion)
+    mocker.patch.object(inventory, "_connect_to_socket", return_value=client)
+
+    inventory._populate()
+
+    instance_requests = [url for url in client.requests if url.startswith("/1.0/instances")]
+    if recursion:
+        assert instance_requests == ["/1.0/instances?recursion=2&project=default"]
+    else:
+        assert len(instance_requests) == 2 + 2 * len(expected["instances"])
+    for name, instance in expected["instances"].items():
+        assert (
+            inventory.data["instances"][name]["instances"]["metadata"]["config"]
+            == instance["instances"]["metadata"]["config"]
+        )
+        assert inventory.data["instances"][name]["state"]["metadata"] == instance["state"]["metadata"]
+    assert inventory.inventory.get_host("vlantest").get_vars()["ansible_host"] == "10.98.143.199"
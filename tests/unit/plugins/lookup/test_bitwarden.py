@@ -184,6 +184,16 @@ class LoggedOutMockBitwarden(MockBitwarden):
     unlocked = False
 
 
+class RecordingMockBitwarden(MockBitwarden):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def _run(self, args, stdin=None, expected_rc=0):
+        self.calls.append(args)
+        return super()._run(args, stdin, expected_rc)
+
+
 class TestLookupModule(unittest.TestCase):
     def setUp(self):
         self.lookup = lookup_loader.get("community.general.bitwarden")
@@ -287,3 +297,40 @@ class TestLookupModule(unittest.TestCase):
         self.lookup.run(None, organization_id=MOCK_ORGANIZATION_ID, result_count=3)
         with self.assertRaises(BitwardenException):
             self.lookup.run(None, organization_id=MOCK_ORGANIZATION_ID, result_count=0)
+
+    def test_bitwarden_plugin_snapshot(self):
+        mock_bitwarden = RecordingMockBitwarden()
+        with patch("ansible_collections.community.general.plugins.lookup.bitwarden._bitwarden", mock_bitwarden):
+            self.assertEqual(
+                [["b", "d"], ["passwordA3"]],
+                self.lookup.run(["dupe_name", "a_test"], field="password", snapshot=True),
+            )
+            self.assertEqual(
+                [[MOCK_RECORDS[2]]],
+                self.lookup.run(["dupe_name"], organization_id=MOCK_ORGANIZATION_ID, snapshot=True),
+            )
+            self.assertEqual(
+                [[MOCK_RECORDS[0]["id"]]],
+                self.lookup.run([MOCK_RECORDS[0]["id"]], search="id", field="id", snapshot=True),
+            )
+            self.assertEqual(
+                [[MOCK_RECORDS[0], MOCK_RECORDS[2]]],
+                self.lookup.run(None, collection_name="MOCK_COLLECTION", snapshot=True),
+            )
+            # The vault was listed once per organization
+            self.assertEqual(
+                [
+                    ["list", "items"],
+                    ["list", "collections"],
+                    ["list", "items", "--organizationid", MOCK_ORGANIZATION_ID],
+                    ["list", "collections", "--organizationid", MOCK_ORGANIZATION_ID],
+                ],
+                mock_bitwarden.calls,
+            )
+
+    def test_bitwarden_plugin_snapshot_ttl(self):
+        mock_bitwarden = RecordingMockBitwarden()
+        with patch("ansible_collections.community.general.plugins.lookup.bitwarden._bitwarden", mock_bitwarden):
+            self.lookup.run(["a_test"], snapshot=True, snapshot_ttl=0)
+            self.lookup.run(["a_test"], snapshot=True, snapshot_ttl=0)
+            self.assertEqual(4, len(mock_bitwarden.calls))
@@ -0,0 +1,113 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import base64
+import types
+
+import pytest
+
+from ansible.plugins.loader import lookup_loader
+
+from ansible_collections.community.general.plugins.lookup import consul_kv
+
+
+class FakeConsulException(Exception):
+    pass
+
+
+class FakeConsul:
+    """Answers the KV and transaction requests of the lookup from an in-memory store."""
+
+    store = {}
+    index = 0
+    requests = []
+    clients = []
+
+    def __init__(self, host, port, scheme, verify, cert, token=None):
+        self.token = token
+        self.kv = types.SimpleNamespace(get=self.kv_get)
+        self.txn = types.SimpleNamespace(put=self.txn_put)
+        self.clients.append(self)
+
+    def kv_get(self, key, token=None, index=None, recurse=False, dc=None):
+        self.requests.append(("get", key, token, index))
+        if recurse:
+            values = [dict(Key=k, Value=v) for k, v in sorted(self.store.items()) if k.startswith(key)]
+            return str(self.index), values or None
+        if key not in self.store:
+            return str(self.index), None
+        return str(self.index), dict(Key=key, Value=self.store[key])
+
+    def txn_put(self, payload):
+        keys = [operation["KV"]["Key"] for operation in payload]
+        self.requests.append(("txn", keys, self.token))
+        if any(key not in self.store for key in keys):
+            raise FakeConsulException('409 {"Errors": [{"OpIndex": 0, "What": "key does not exist"}]}')
+        results = [{"KV": {"Key": key, "Value": base64.b64encode(self.store[key]).decode()}} for key in keys]
+        return {"Results": results, "Errors": None}
+
+
+@pytest.fixture
+def fake_consul(monkeypatch):
+    FakeConsul.store = {"a": b"value a", "b": b"value b", "dir/x": b"x", "dir/y": b"y"}
+    FakeConsul.index = 7
+    FakeConsul.requests = []
+    FakeConsul.clients = []
+    monkeypatch.setattr(consul_kv, "HAS_CONSUL", True)
+    monkeypatch.setattr(
+        consul_kv,
+        "consul",
+        types.SimpleNamespace(Consul=FakeConsul, ConsulException=FakeConsulException),
+        raising=False,
+    )
+    monkeypatch.setattr(consul_kv, "_clients", {})
+    monkeypatch.setattr(consul_kv, "_cache", {})
+    return FakeConsul
+
+
+@pytest.fixture
+def lookup():
+    return lookup_loader.get("community.general.consul_kv")
+
+
+def test_keys_in_one_transaction(fake_consul, lookup):
+    assert lookup.run(["a", "b"], token="secret") == ["value a", "value b"]
+
+    assert fake_consul.requests == [("txn", ["a", "b"], "secret")]
+    assert [client.token for client in fake_consul.clients] == ["secret"]
+
+
+def test_transaction_refused(fake_consul, lookup):
+    assert lookup.run(["a", "missing", "b"]) == ["value a", "value b"]
+
+    assert fake_consul.requests == [
+        ("txn", ["a", "missing", "b"], None),
+        ("get", "a", None, None),
+        ("get", "missing", None, None),
+        ("get", "b", None, None),
+    ]
+
+
+def test_recurse_and_index(fake_consul, lookup):
+    assert lookup.run(["dir/ recurse=true", "a index=3"]) == ["x", "y", "value a"]
+
+    assert fake_consul.requests == [("get", "dir/", None, None), ("get", "a", None, "3")]
+
+
+def test_cache(fake_consul, lookup):
+    assert lookup.run(["a"], cache=True) == ["value a"]
+    assert lookup.run(["a"], cache=True) == ["value a"]
+    assert fake_consul.requests == [("txn", ["a"], None)]
+
+    # The index is not known for values read in a transaction
+    del fake_consul.requests[:]
+    assert lookup.run(["a index=5"], cache=True) == ["value a"]
+    assert lookup.run(["a index=6"], cache=True) == ["value a"]
+    assert fake_consul.requests == [("get", "a", None, "5")]
+
+    del fake_consul.requests[:]
+    assert lookup.run(["a index=9"], cache=True) == ["value a"]
+    assert fake_consul.requests == [("get", "a", None, "9")]
@@ -0,0 +1,149 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+dns_resolver = pytest.importorskip("dns.resolver")
+
+from ansible.errors import AnsibleError
+from ansible.plugins.loader import lookup_loader
+
+from ansible_collections.community.general.plugins.lookup import dig
+
+
+class FakeRdata:
+    def __init__(self, text):
+        self.text = text
+
+    def to_text(self):
+        return self.text
+
+
+class FakeAnswer(list):
+    """A list of rdata with the expiration time that dnspython's caches look at."""
+
+    def __init__(self, rdatas):
+        super().__init__(rdatas)
+        self.expiration = time.time() + 300
+
+
+class FakeResolver:
+    """Answers A queries from a table, and uses the cache the way dnspython's Resolver does."""
+
+    answers = {}
+    instances = []
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    queries = []
+
+    def __init__(self, configure=True):
+        self.nameservers = ["192.0.2.53"]
+        self.port = 53
+        self.retry_servfail = False
+        self.cache = None
+        self.instances.append(self)
+
+    def use_edns(self, edns, ednsflags, payload):
+        pass
+
+    def resolve(self, qname, rdtype, search=True, rdclass=None, tcp=False):
+        key = (qname, rdtype, rdclass)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        cls = type(self)
+        with cls.lock:
+            cls.queries.append(qname)
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            # answer the later domains first, so that results complete out of order
+            time.sleep(0.02 * (len(cls.answers) - list(cls.answers).index(qname)) if qname in cls.answers else 0)
+            answer = cls.answers.get(qname)
+            if answer is None:
+                raise dns_resolver.NXDOMAIN(qnames=[qname])
+            result = FakeAnswer(FakeRdata(address) for address in answer)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+        if self.cache is not None:
+            self.cache.put(key, result)
+        return result
+
+
+@pytest.fixture
+def fake_resolver(monkeypatch):
+    monkeypatch.setattr(FakeResolver, "answers", {f"host{i}.example.com": [f"192.0.2.{i}"] for i in range(1, 6)})
+    monkeypatch.setattr(FakeResolver, "instances", [])
+    monkeypatch.setattr(FakeResolver, "queries", [])
+    monkeypatch.setattr(FakeResolver, "in_flight", 0)
+    monkeypatch.setattr(FakeResolver, "max_in_flight", 0)
+    monkeypatch.setattr(dig.dns.resolver, "Resolver", FakeResolver)
+    monkeypatch.setattr(dig, "_resolvers", {})
+    monkeypatch.setattr(dig, "_cache", None)
+    return FakeResolver
+
+
+@pytest.fixture
+def lookup():
+    return lookup_loader.get("community.general.dig")
+
+
+HOSTS = [f"host{i}.example.com" for i in range(1, 6)]
+
+
+def test_concurrent_queries_keep_order(fake_resolver, lookup):
+    assert lookup.run(HOSTS, max_workers=3) == [f"192.0.2.{i}" for i in range(1, 6)]
+    assert sorted(fake_resolver.queries) == HOSTS
+    assert fake_resolver.max_in_flight == 3
+
+
+def test_sequential_queries(fake_resolver, lookup):
+    assert lookup.run(HOSTS, max_workers=1) == [f"192.0.2.{i}" for i in range(1, 6)]
+    assert fake_resolver.queries == HOSTS
+    assert fake_resolver.max_in_flight == 1
+
+
+def test_errors(fake_resolver, lookup):
+    # with several domains, failed lookups are left out of the result
+    assert lookup.run(["host1.example.com", "missing.example.com", "host2.example.com"]) == ["192.0.2.1", "192.0.2.2"]
+    assert lookup.run(["missing.example.com"]) == ["NXDOMAIN"]
+
+    with pytest.raises(AnsibleError, match="Lookup failed"):
+        lookup.run(["host1.example.com", "missing.example.com", "host2.example.com"], fail_on_error=True)
+
+
+def test_shared_resolvers(fake_resolver, lookup):
+    lookup.run(["host1.example.com"])
+    lookup.run(["host2.example.com", "host3.example.com"])
+    assert len(fake_resolver.instances) == 1
+
+    lookup.run(["@192.0.2.1", "host1.example.com"])
+    lookup.run(["@192.0.2.1", "host2.example.com"])
+    assert len(fake_resolver.instances) == 2
+    assert fake_resolver.instances[1].nameservers == ["192.0.2.1"]
+    assert all(resolver.cache is None for resolver in fake_resolver.instances)
+
+
+def test_cache(fake_resolver, lookup):
+    assert lookup.run(HOSTS[:2], cache=True) == ["192.0.2.1", "192.0.2.2"]
+    assert lookup.run(["@192.0.2.1", HOSTS[0]], cache=True) == ["192.0.2.1"]
+    assert lookup.run(HOSTS[:3], cache=True) == ["192.0.2.1", "192.0.2.2", "192.0.2.3"]
+
+    # the resolvers with the cache option share a single LRU cache
+    assert isinstance(dig._cache, dns_resolver.LRUCache)
+    assert [resolver.cache for resolver in fake_resolver.instances] == [dig._cache, dig._cache]
+    assert sorted(fake_resolver.queries) == HOSTS[:3]
+
+    # lookups without the cache option do not use it
+    lookup.run(HOSTS[:1])
+    assert fake_resolver.instances[-1].cache is None
+    assert sorted(fake_resolver.queries) == sorted(HOSTS[:3] + HOSTS[:1])
@@ -13,6 +13,7 @@ from .onepassword_common import MOCK_ENTRIES
 
 from ansible.errors import AnsibleLookupError, AnsibleOptionsError
 from ansible.plugins.loader import lookup_loader
+from ansible_collections.community.general.plugins.lookup import onepassword
 from ansible_collections.community.general.plugins.lookup.onepassword import (
     OnePassCLIv1,
     OnePassCLIv2,
@@ -309,6 +310,59 @@ def test_op_lookup(mocker, cli_class, vault, queries, kwargs, output, expected):
     assert result == expected
 
 
+def test_op_session_cache(opv2, mocker):
+    mocker.patch.dict(onepassword._sessions, clear=True)
+    mocker.patch.object(opv2._cli, "assert_logged_in", return_value=False)
+    mocker.patch.object(opv2._cli, "signin", return_value=(0, "token\n", ""))
+    mocker.patch("os.path.isfile", return_value=True)
+    opv2.cache_ttl = 60
+
+    opv2.assert_logged_in()
+    opv2.token = None
+    opv2.assert_logged_in()
+
+    assert opv2.token == "token"
+    opv2._cli.signin.assert_called_once()
+
+    # a lookup with other credentials does not get the cached session
+    opv2.master_password = "wrong"
+    opv2.token = None
+    opv2.assert_logged_in()
+
+    assert opv2._cli.signin.call_count == 2
+    assert len(onepassword._sessions) == 2
+    assert all("wrong" not in key for key in onepassword._sessions)
+
+
+def test_op_prefetch(opv2, mocker):
+    mocker.patch.dict(onepassword._items, clear=True)
+    items = {
+        "id1": {"id": "id1", "title": "Alpha", "fields": [{"id": "password", "value": "a"}]},
+        "id2": {"id": "id2", "title": "Beta", "fields": [{"id": "password", "value": "b"}]},
+        "id3": {"id": "id3", "title": "Beta", "fields": [{"id": "password", "value": "c"}]},
+    }
+    calls = []
+
+    def fake_run(args, command_input=None, **kwargs):
+        calls.append(args[:3])
+        if args[:2] == ["item", "list"]:
+            return 0, json.dumps([{"id": item["id"], "title": item["title"]} for item in items.values()]), ""
+        if args[:3] == ["item", "get", "-"]:
+            summaries = json.loads(command_input)
+            return 0, "\n".join(json.dumps(items[summary["id"]], indent=2) for summary in summaries), ""
+        return 0, json.dumps(next(item for item in items.values() if args[2] in (item["id"], item["title"]))), ""
+
+    opv2._cli._run.side_effect = fake_run
+    opv2.cache_ttl = 60
+
+    opv2.prefetch(["alpha", "id2", "Beta"])
+    assert calls == [["item", "list", "--format"], ["item", "get", "-"]]
+
+    # The ambiguous title is fetched on its own, everything else comes from the cache
+    assert [opv2.get_field(item_id, "password") for item_id in ("alpha", "id2", "Beta", "id2")] == ["a", "b", "b", "b"]
+    assert calls[2:] == [["item", "get", "Beta"]]
+
+
 @pytest.mark.parametrize("op_fixture", OP_VERSION_FIXTURES)
 def test_signin(op_fixture, request):
     op = request.getfixturevalue(op_fixture)
@@ -0,0 +1,184 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+import time
+
+import pytest
+
+from ansible.plugins.loader import lookup_loader
+
+from ansible_collections.community.general.plugins.lookup import passwordstore
+
+
+class FakePass:
+    """Runs the pass commands of the lookup on a store of plain text .gpg files."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.commands = []
+        self.cached_on_insert = []
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def path(self, passname):
+        return os.path.join(self.directory, f"{passname}.gpg")
+
+    def write(self, passname, content):
+        with open(self.path(passname), "w") as f:
+            f.write(content)
+
+    def __call__(self, args, env=None, input=None):
+        command = args[1]
+        self.commands.append((args[0], command, args[-1]))
+        if command == "--version":
+            return b"pass: the standard unix password manager\n"
+        if command == "insert":
+            self.cached_on_insert.append(any(key[2] == args[-1] for key in passwordstore._entry_cache))
+            self.write(args[-1], input)
+            return b""
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.02)
+            with open(self.path(args[-1]), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise subprocess.CalledProcessError(1, args, f"Error: {args[-1]} is not in the password store.\n") from None
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def shown(self):
+        return [passname for cmd, command, passname in self.commands if command == "show"]
+
+
+@pytest.fixture
+def fake_pass(monkeypatch, tmp_path):
+    fake = FakePass(str(tmp_path))
+    fake.write("a", "password a\nuser: alice\n")
+    fake.write("b", "password b\nuser: bob\n")
+    fake.write("c", "password c\n")
+    monkeypatch.setattr(passwordstore, "check_output2", fake)
+    monkeypatch.setattr(passwordstore, "_realpass", {})
+    monkeypatch.setattr(passwordstore, "_entry_cache", {})
+    return fake
+
+
+@pytest.fixture
+def lookup(fake_pass):
+    lookup = lookup_loader.get("community.general.passwordstore")
+
+    def run(terms, **kwargs):
+        return lookup.run(terms, {}, directory=fake_pass.directory, **kwargs)
+
+    return run
+
+
+def test_cache_disabled(fake_pass, lookup):
+    assert lookup(["a"]) == ["password a"]
+    assert lookup(["a"]) == ["password a"]
+
+    assert fake_pass.shown() == ["a", "a"]
+    assert passwordstore._entry_cache == {}
+
+
+def test_entry_shown_once_per_lookup(fake_pass, lookup):
+    # options of a term also apply to the following terms
+    assert lookup(["a", "b", "a subkey=user"]) == ["password a", "password b", "alice"]
+
+    assert fake_pass.shown() == ["a", "b"]
+
+
+def test_cache(fake_pass, lookup):
+    assert lookup(["a"], cache=True) == ["password a"]
+    assert lookup(["b", "a subkey=user"], cache=True) == ["password b", "alice"]
+
+    assert fake_pass.shown() == ["a", "b"]
+
+
+def test_cache_modified_file(fake_pass, lookup):
+    assert lookup(["a"], cache=True) == ["password a"]
+
+    st = os.stat(fake_pass.path("a"))
+    fake_pass.write("a", "password A\nuser: alice\n")
+    os.utime(fake_pass.path("a"), ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+
+    assert lookup(["a"], cache=True) == ["password A"]
+    assert fake_pass.shown() == ["a", "a"]
+
+
+def test_cache_replaced_file(fake_pass, lookup):
+    assert lookup(["a"], cache=True) == ["password a"]
+
+    # same size and modification time, but a new inode
+    st = os.stat(fake_pass.path("a"))
+    fake_pass.write("new", "password A\nuser: alice\n")
+    os.utime(fake_pass.path("new"), ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(fake_pass.path("new"), fake_pass.path("a"))
+
+    assert lookup(["a"], cache=True) == ["password A"]
+    assert fake_pass.shown() == ["a", "a"]
+
+
+def test_cache_dropped_before_insert(fake_pass, lookup):
+    assert lookup(["a"], cache=True) == ["password a"]
+
+    result = lookup(["a", "a overwrite=true userpass=new"], cache=True, timestamp=False)
+
+    assert result == ["password a", "new"]
+    assert fake_pass.cached_on_insert == [False]
+    assert fake_pass.shown() == ["a"]
+    assert lookup(["a"], cache=True) == ["new"]
+    assert fake_pass.shown() == ["a", "a"]
+
+
+def test_cache_dropped_before_generate(fake_pass, lookup):
+    assert lookup(["new", "new"], cache=True, create=True, userpass="generated", timestamp=False) == [
+        "generated",
+        "generated",
+    ]
+
+    assert fake_pass.cached_on_insert == [False]
+    assert fake_pass.shown() == ["new", "new", "new"]
+
+
+def test_max_workers(fake_pass, lookup):
+    assert lookup(["c", "a", "b", "a subkey=user"], max_workers=4) == [
+        "password c",
+        "password a",
+        "password b",
+        "alice",
+    ]
+
+    assert sorted(fake_pass.shown()) == ["a", "b", "c"]
+    assert fake_pass.max_in_flight == 3
+
+
+def test_max_workers_missing_entry(fake_pass, lookup):
+    assert lookup(["a", "missing", "b"], max_workers=4, missing="empty") == ["password a", None, "password b"]
+
+    assert sorted(fake_pass.shown()) == ["a", "b", "missing", "missing"]
+
+
+def test_max_workers_readwrite_lock(fake_pass, lookup, monkeypatch, tmp_path):
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    assert lookup(["a", "b", "c"], max_workers=4, lock="readwrite") == ["password a", "password b", "password c"]
+
+    assert fake_pass.shown() == ["a", "b", "c"]
+    assert fake_pass.max_in_flight == 1
+
+
+def test_max_workers_gopass(fake_pass, lookup):
+    assert lookup(["a", "b", "c"], backend="gopass", max_workers=2) == ["password a", "password b", "password c"]
+
+    assert sorted(fake_pass.shown()) == ["a", "b", "c"]
+    assert {cmd for cmd, command, passname in fake_pass.commands} == {"gopass"}
+    assert fake_pass.max_in_flight == 2
@@ -166,3 +166,45 @@ def test_json_without_token_returned(mock_json_without_token_returned):
         "API did not include access_token field in response from "
         "http://keycloak.url/auth/realms/master/protocol/openid-connect/token"
     )
+
+
+@pytest.fixture()
+def mock_token_endpoint(mocker):
+    responses = iter(
+        [
+            '{"access_token": "token1", "expires_in": 60, "refresh_token": "refresh1", "refresh_expires_in": 1800}',
+            '{"access_token": "token2", "expires_in": 60, "refresh_token": "refresh2", "refresh_expires_in": 1800}',
+            '{"access_token": "token3", "expires_in": 60}',
+        ]
+    )
+    return mocker.patch(
+        "ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak.open_url",
+        side_effect=lambda *args, **kwargs: StringIO(next(responses)),
+        autospec=True,
+    )
+
+
+def test_token_cache(mock_token_endpoint, mocker, tmp_path):
+    cache_file = tmp_path / "cache" / "tokens.json"
+    module_params = dict(module_params_creds, token_cache_file=str(cache_file))
+    mock_time = mocker.patch(
+        "ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak.time.time",
+        return_value=1000,
+    )
+
+    assert get_token(module_params)["Authorization"] == "Bearer token1"
+    assert get_token(module_params)["Authorization"] == "Bearer token1"
+    assert mock_token_endpoint.call_count == 1
+    assert "password=admin" in mock_token_endpoint.call_args.kwargs["data"]
+    assert oct(cache_file.stat().st_mode & 0o777) == "0o600"
+    assert "token1" in cache_file.read_text()
+
+    # other credentials do not get the cached token
+    assert get_token(dict(module_params, auth_password="other"))["Authorization"] == "Bearer token2"
+
+    # the access token expired, the refresh token is used
+    mock_time.return_value = 1050
+    assert get_token(module_params)["Authorization"] == "Bearer token3"
+    assert mock_token_endpoint.call_count == 3
+    assert "grant_type=refresh_token" in mock_token_endpoint.call_args.kwargs["data"]
+    assert "refresh_token=refresh1" in mock_token_endpoint.call_args.kwargs["data"]
@@ -0,0 +1,132 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from unittest.mock import MagicMock
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak import KeycloakAPI
+
+BASE = "http://keycloak.url/auth/admin/realms/myrealm"
+
+
+def group(gid, path, children=0):
+    return {"id": gid, "name": path.rsplit("/", 1)[1], "path": path, "subGroupCount": children}
+
+
+COLLECTIONS = {
+    "/groups": [group("g1", "/a", 2), group("g2", "/b")],
+    "/groups/g1/children": [group("g11", "/a/x", 1), group("g12", "/a/y")],
+    "/groups/g11/children": [group("g111", "/a/x/z")],
+    "/users": [{"id": f"u{i}", "username": f"user{i}"} for i in range(5)],
+    "/clients": [{"id": "c1", "clientId": "app"}],
+}
+
+
+@pytest.fixture
+def requests(mocker):
+    requests = []
+
+    def fake_open_url(url, method=None, **kwargs):
+        parts = urlsplit(url)
+        query = {key: value[0] for key, value in parse_qs(parts.query).items()}
+        requests.append((method, parts.path[len(urlsplit(BASE).path) :], query))
+        if method != "GET":
+            return StringIO("")
+        entries = COLLECTIONS[requests[-1][1]]
+        first = int(query.get("first", 0))
+        return StringIO(json.dumps(entries[first : first + int(query.get("max", len(entries)))]))
+
+    mocker.patch(
+        "ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak.open_url",
+        side_effect=fake_open_url,
+    )
+    return requests
+
+
+@pytest.fixture
+def api():
+    module = MagicMock()
+    module.params = {"auth_keycloak_url": "http://keycloak.url/auth"}
+    module.fail_json.side_effect = AssertionError
+    return KeycloakAPI(module, {})
+
+
+def test_pagination(api, requests):
+    api.page_size = 2
+
+    users = list(api.iter_users(realm="myrealm"))
+
+    assert [user["username"] for user in users] == [f"user{i}" for i in range(5)]
+    assert [(query["first"], query["max"]) for method, path, query in requests] == [("0", "2"), ("2", "2"), ("4", "2")]
+
+
+def test_snapshot_groups(api, requests):
+    api.use_realm_snapshot = True
+
+    assert api.get_group_by_name("x", realm="myrealm", parents=[{"id": None, "name": "a"}])["id"] == "g11"
+    chain = [{"id": None, "name": "a"}, {"id": None, "name": "x"}]
+    assert api.get_subgroup_by_chain(chain, realm="myrealm")["id"] == "g11"
+    assert api.find_group_by_path("a/x/z", realm="myrealm")["id"] == "g111"
+    assert api.get_group_by_name("b", realm="myrealm")["id"] == "g2"
+    assert api.get_group_by_name("c", realm="myrealm") is None
+    assert [g["path"] for g in api.realm_snapshot("myrealm").get_groups()] == ["/a", "/a/x", "/a/x/z", "/a/y", "/b"]
+
+    # the tree was loaded once, with one request per group that has subgroups
+    assert sorted(path for method, path, query in requests) == [
+        "/groups",
+        "/groups/g1/children",
+        "/groups/g11/children",
+    ]
+    assert all(query["briefRepresentation"] == "false" for method, path, query in requests)
+
+
+def test_snapshot_dropped_on_write(api, requests):
+    api.use_realm_snapshot = True
+
+    assert api.get_client_by_clientid("app", realm="myrealm")["id"] == "c1"
+    assert api.get_client_by_clientid("app", realm="myrealm")["id"] == "c1"
+    assert len(requests) == 1
+
+    api.update_client("c1", {"clientId": "app"}, realm="myrealm")
+    assert api.get_client_by_clientid("app", realm="myrealm")["id"] == "c1"
+    assert [method for method, path, query in requests] == ["GET", "PUT", "GET"]
+
+
+def test_concurrent_reauthentication(mocker):
+    expired = threading.Barrier(4)
+    logins = []
+
+    def fake_open_url(url, method=None, headers=None, **kwargs):
+        if headers["Authorization"] == "Bearer expired":
+            # every request is sent with the expired token before any of them re-authenticates
+            expired.wait(5)
+            raise HTTPError(url, 401, "Unauthorized", {}, None)
+        return StringIO("[]")
+
+    def fake_login(module_params):
+        logins.append(None)
+        return "renewed"
+
+    base = "ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak"
+    mocker.patch(f"{base}.open_url", side_effect=fake_open_url)
+    mocker.patch(f"{base}._request_token_using_credentials", side_effect=fake_login)
+    module = MagicMock()
+    module.params = {"auth_keycloak_url": "http://keycloak.url/auth", "auth_username": "admin", "auth_password": "pw"}
+    api = KeycloakAPI(module, {"Authorization": "Bearer expired"})
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda i: api._request_and_deserialize(f"{BASE}/users", "GET"), range(4)))
+
+    assert results == [[], [], [], []]
+    assert len(logins) == 1
+    assert api.restheaders["Authorization"] == "Bearer renewed"
@@ -0,0 +1,104 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import json
+from email.message import Message
+from io import BytesIO
+from unittest.mock import MagicMock
+
+import pytest
+
+from ansible_collections.community.general.plugins.module_utils.ipa import IPAClient
+
+
+class FakeResponse(BytesIO):
+    def __init__(self, data):
+        super().__init__(json.dumps(data).encode())
+        self.headers = Message()
+        self.headers["Content-Type"] = "application/json; charset=utf-8"
+
+
+class FakeServer:
+    def __init__(self):
+        self.requests = []
+
+    def fetch_url(self, module, url, data=None, **kwargs):
+        request = json.loads(data)
+        self.requests.append(request)
+        if request["method"] == "batch":
+            result = {"count": len(request["params"][0]), "results": [self.call(c) for c in request["params"][0]]}
+        else:
+            result = self.call(request)
+        return FakeResponse({"error": None, "result": result}), {"status": 200}
+
+    def call(self, request):
+        method, params = request["method"], request["params"]
+        if method == "group_add_member":
+            if params[0] == ["missing"]:
+                return {"error": "missing: group not found", "error_code": 4001}
+            return {"error": None, "result": {"cn": params[0]}, "failed": {}}
+        return {"error": None, "result": [{"cn": params[0]}], "count": 1}
+
+
+@pytest.fixture
+def client(mocker):
+    server = FakeServer()
+    mocker.patch(
+        "ansible_collections.community.general.plugins.module_utils.ipa.fetch_url",
+        side_effect=server.fetch_url,
+    )
+    module = MagicMock()
+    module.params = {"ipa_timeout": 10}
+    module.fail_json.side_effect = AssertionError
+    client = IPAClient(module, "ipa.example.com", 443, "https")
+    client.server = server
+    return client
+
+
+def test_single_call(client):
+    assert client._post_json(method="group_find", name=None, item={"cn": "admins"}) == {"cn": [None]}
+    assert client.server.requests == [{"method": "group_find", "params": [[None], {"cn": "admins"}]}]
+
+
+def test_batch(client):
+    with client.batch() as batch:
+        assert client._post_json(method="group_add_member", name="admins", item={"user": ["alice"]}) is None
+        with client.batch():
+            client._post_json(method="group_find", name="admins")
+
+    assert batch.results == [{"cn": ["admins"]}, {"cn": ["admins"]}]
+    assert client.server.requests == [
+        {
+            "method": "batch",
+            "params": [
+                [
+                    {"method": "group_add_member", "params": [["admins"], {"user": ["alice"]}]},
+                    {"method": "group_find", "params": [["admins"], {}]},
+                ],
+                {},
+            ],
+        }
+    ]
+
+
+def test_batch_size(client):
+    client.batch_size = 2
+    with client.batch() as batch:
+        for name in ("a", "b", "c"):
+            client._post_json(method="group_find", name=name)
+
+    assert batch.results == [{"cn": [name]} for name in ("a", "b", "c")]
+    assert [len(request["params"][0]) for request in client.server.requests] == [2, 1]
+
+
+def test_batch_error(client):
+    with pytest.raises(AssertionError):
+        with client.batch():
+            client._post_json(method="group_add_member", name="admins", item={"user": ["alice"]})
+            client._post_json(method="group_add_member", name="missing", item={"user": ["alice"]})
+
+    client.module.fail_json.assert_called_once_with(msg="response group_add_member: missing: group not found")
+    assert client._batch is None
@@ -0,0 +1,124 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import json
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from ansible_collections.community.general.plugins.module_utils.lxd import LXDClient, LXDClientException
+
+
+class LXDStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self):
+        return "unix"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        server = self.server
+        with server.lock:
+            server.requests.append((self.command, self.path))
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            if self.path.endswith("/wait"):
+                time.sleep(0.05)
+                self._reply({"type": "sync", "metadata": {"status": "Success"}})
+            elif self.path.startswith("/1.0/operations-start"):
+                self._reply({"type": "async", "operation": "/1.0/operations/1"})
+            elif self.path == "/1.0/missing":
+                self._reply({"type": "error", "error": "not found", "error_code": 404})
+            else:
+                self._reply({"type": "sync", "metadata": self.path})
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+
+class LXDStubServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        super().__init__(path, LXDStubHandler)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+
+    def get_request(self):
+        self.connections += 1
+        return super().get_request()
+
+
+@pytest.fixture
+def lxd_server(tmp_path):
+    server = LXDStubServer(str(tmp_path / "lxd.socket"))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_keep_alive(lxd_server):
+    client = LXDClient(f"unix:{lxd_server.server_address}")
+    for i in range(5):
+        assert client.do("GET", f"/1.0/instances/{i}")["metadata"] == f"/1.0/instances/{i}"
+    client.close()
+
+    assert lxd_server.connections == 1
+
+
+def test_reconnect_after_server_closed_connection(lxd_server):
+    client = LXDClient(f"unix:{lxd_server.server_address}")
+    client.do("GET", "/1.0/instances")
+    # simulate the server dropping the idle keep-alive connection
+    client.connection.sock.shutdown(2)
+
+    assert client.do("GET", "/1.0/instances/foo")["metadata"] == "/1.0/instances/foo"
+
+
+def test_do_many(lxd_server):
+    client = LXDClient(f"unix:{lxd_server.server_address}", max_connections=4)
+    urls = [f"/1.0/operations-start/{i}" for i in range(8)]
+
+    responses = client.do_many([dict(method="POST", url=url, body_json={}) for url in urls])
+
+    assert [r["metadata"]["status"] for r in responses] == ["Success"] * 8
+    assert 1 < lxd_server.max_active <= 4
+    assert lxd_server.connections <= 4
+
+
+def test_do_many_errors(lxd_server):
+    client = LXDClient(f"unix:{lxd_server.server_address}", max_connections=2)
+    requests = [dict(method="GET", url="/1.0/instances"), dict(method="GET", url="/1.0/missing")]
+
+    responses = client.do_many(requests, return_exceptions=True)
+    assert responses[0]["metadata"] == "/1.0/instances"
+    assert isinstance(responses[1], LXDClientException)
+
+    with pytest.raises(LXDClientException):
+        client.do_many(requests)
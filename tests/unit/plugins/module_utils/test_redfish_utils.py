@@ -0,0 +1,252 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from ansible_collections.community.general.plugins.module_utils.redfish_utils import RedfishUtils
+
+ROOT = "https://bmc.example.com"
+MEMORY = "/redfish/v1/Systems/1/Memory"
+
+
+def dimm(i):
+    return {"@odata.id": f"{MEMORY}/{i}", "Id": str(i), "CapacityMiB": 32768, "Status": {"State": "Enabled"}}
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def read(self):
+        return json.dumps(self.data).encode()
+
+    def info(self):
+        return {"Content-Type": "application/json"}
+
+
+class FakeService:
+    def __init__(self, expand=None):
+        self.lock = threading.Lock()
+        self.requests = []
+        root = {"@odata.id": "/redfish/v1/", "Systems": {"@odata.id": "/redfish/v1/Systems"}}
+        if expand is not None:
+            root["ProtocolFeaturesSupported"] = {"ExpandQuery": expand}
+        self.resources = {
+            "/redfish/v1/": root,
+            "/redfish/v1/Systems/1": {"@odata.id": "/redfish/v1/Systems/1", "Memory": {"@odata.id": MEMORY}},
+            MEMORY: {"Members": [{"@odata.id": f"{MEMORY}/{i}"} for i in range(4)]},
+        }
+        self.resources.update((f"{MEMORY}/{i}", dimm(i)) for i in range(4))
+
+    def open_url(self, uri, method=None, data=None, **kwargs):
+        path = uri[len(ROOT) :]
+        with self.lock:
+            self.requests.append((method, path))
+        if path == f"{MEMORY}?$expand=.($levels=1)":
+            return FakeResponse({"Members": [dimm(i) for i in range(4)]})
+        return FakeResponse(self.resources.get(path, {}))
+
+
+@pytest.fixture
+def module():
+    module = MagicMock()
+    module.params = {"validate_certs": False, "ca_path": None, "ciphers": None, "session_cache_file": None}
+    return module
+
+
+def make_utils(mocker, module, service, **kwargs):
+    mocker.patch(
+        "ansible_collections.community.general.plugins.module_utils.redfish_utils.open_url",
+        side_effect=service.open_url,
+    )
+    utils = RedfishUtils({"user": "admin", "pswd": "secret"}, ROOT, 10, module, **kwargs)
+    utils.keep_alive = False
+    utils.systems_uris = ["/redfish/v1/Systems/1"]
+    return utils
+
+
+def test_no_cache_by_default(mocker, module):
+    service = FakeService()
+    utils = make_utils(mocker, module, service)
+
+    utils.get_multi_memory_inventory()
+    utils.get_multi_memory_inventory()
+
+    assert len(service.requests) == 12
+
+
+def test_cache_and_concurrent_members(mocker, module):
+    service = FakeService()
+    utils = make_utils(mocker, module, service, cache_get_requests=True)
+
+    first = utils.get_multi_memory_inventory()
+    second = utils.get_multi_memory_inventory()
+
+    assert first == second
+    assert [entry["Id"] for entry in first["entries"][0][1]] == ["0", "1", "2", "3"]
+    assert sorted(path for method, path in service.requests) == sorted(
+        ["/redfish/v1/", "/redfish/v1/Systems/1", MEMORY] + [f"{MEMORY}/{i}" for i in range(4)]
+    )
+
+    # Cached data can be modified by the caller without affecting the cache
+    utils.get_request(f"{ROOT}{MEMORY}/0")["data"]["Id"] = "changed"
+    assert utils.get_request(f"{ROOT}{MEMORY}/0")["data"]["Id"] == "0"
+
+    # Writes empty the cache
+    utils.patch_request(f"{ROOT}{MEMORY}/0", {"Id": "0"})
+    del service.requests[:]
+    utils.get_request(f"{ROOT}{MEMORY}/0")
+    assert service.requests == [("GET", f"{MEMORY}/0")]
+
+
+def test_expand(mocker, module):
+    service = FakeService(expand={"NoLinks": True, "Levels": True, "MaxLevels": 3})
+    utils = make_utils(mocker, module, service, cache_get_requests=True)
+
+    inventory = utils.get_multi_memory_inventory()
+
+    assert len(inventory["entries"][0][1]) == 4
+    assert [path for method, path in service.requests] == [
+        "/redfish/v1/Systems/1",
+        "/redfish/v1/",
+        f"{MEMORY}?$expand=.($levels=1)",
+    ]
+
+
+class BMCHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, data=None, headers=None):
+        body = json.dumps(data).encode() if data is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.drop_idle:
+            # Close the connection without announcing it, like a service dropping idle connections
+            self.close_connection = True
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.requests.append(("POST", self.path, self.headers.get("X-Auth-Token")))
+            if body != {"UserName": "admin", "Password": "secret"}:
+                return self.reply(401)
+            token = f"token{next(server.ids)}"
+            server.tokens.add(token)
+        self.reply(201, {}, {"X-Auth-Token": token, "Location": f"/redfish/v1/SessionService/Sessions/{token}"})
+
+    def do_GET(self):
+        server = self.server
+        token = self.headers.get("X-Auth-Token")
+        with server.lock:
+            server.requests.append(("GET", self.path, token))
+            authorized = token in server.tokens or (not server.tokens and self.headers.get("Authorization"))
+        if not authorized:
+            return self.reply(401)
+        if self.path.endswith("/Missing"):
+            return self.reply(404, {"error": {"@Message.ExtendedInfo": [{"Message": "No such resource"}]}})
+        self.reply(200, {"@odata.id": self.path})
+
+
+class BMC(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), BMCHandler)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.tokens = set()
+        self.ids = itertools.count()
+        self.connections = 0
+        self.drop_idle = False
+
+    def get_request(self):
+        self.connections += 1
+        return super().get_request()
+
+
+@pytest.fixture
+def bmc(monkeypatch):
+    for name in ("http_proxy", "HTTP_PROXY", "all_proxy", "ALL_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+    server = BMC()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def bmc_utils(bmc, module):
+    return RedfishUtils({"user": "admin", "pswd": "secret"}, f"http://127.0.0.1:{bmc.server_address[1]}", 10, module)
+
+
+def test_keep_alive(bmc, module):
+    utils = bmc_utils(bmc, module)
+
+    for i in range(5):
+        response = utils.get_request(f"{utils.root_uri}/redfish/v1/Systems/{i}")
+        assert response["data"] == {"@odata.id": f"/redfish/v1/Systems/{i}"}
+    response = utils.get_request(f"{utils.root_uri}/redfish/v1/Missing")
+
+    assert bmc.connections == 1
+    assert response["status"] == 404
+    assert "extended message: 'No such resource'" in response["msg"]
+
+
+def test_keep_alive_retries_idempotent_requests_only(bmc, module):
+    bmc.drop_idle = True
+    utils = bmc_utils(bmc, module)
+    uri = f"{utils.root_uri}/redfish/v1/Systems/1"
+
+    assert utils.get_request(uri)["ret"] is True
+    # The GET is sent again on a new connection
+    assert utils.get_request(uri)["ret"] is True
+    assert bmc.connections == 2
+
+    # The service may have processed a POST before the connection broke, so it is not repeated
+    response = utils.post_request(f"{uri}/Actions/ComputerSystem.Reset", {"ResetType": "ForceRestart"})
+    assert response["ret"] is False
+    assert [method for method, path, token in bmc.requests] == ["GET", "GET"]
+    assert bmc.connections == 2
+
+
+def test_session_cache(bmc, module, tmp_path):
+    module.params["session_cache_file"] = str(tmp_path / "cache" / "sessions.json")
+    uri = f"http://127.0.0.1:{bmc.server_address[1]}/redfish/v1/Systems/1"
+
+    assert bmc_utils(bmc, module).get_request(uri)["ret"] is True
+    assert bmc_utils(bmc, module).get_request(uri)["ret"] is True
+    assert [(method, token) for method, path, token in bmc.requests] == [
+        ("POST", None),
+        ("GET", "token0"),
+        ("GET", "token0"),
+    ]
+    assert os.stat(module.params["session_cache_file"]).st_mode & 0o777 == 0o600
+
+    # A session which the service no longer accepts is replaced
+    bmc.tokens.clear()
+    del bmc.requests[:]
+    assert bmc_utils(bmc, module).get_request(uri)["ret"] is True
+    assert [(method, token) for method, path, token in bmc.requests] == [
+        ("GET", "token0"),
+        ("POST", None),
+        ("GET", "token1"),
+    ]
@@ -0,0 +1,314 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import itertools
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from ansible_collections.community.internal_test_tools.tests.unit.plugins.modules.utils import (
+    AnsibleExitJson,
+    ModuleTestCase,
+    set_module_args,
+)
+
+from ansible_collections.community.general.plugins.modules import keycloak_bulk
+
+PREFIX = "/auth/admin/realms/myrealm"
+
+
+class StubKeycloakHandler(BaseHTTPRequestHandler):
+    """Serves the parts of the Keycloak admin API that keycloak_bulk uses from the state of the server."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def dispatch(self, method):
+        parts = urlsplit(self.path)
+        query = {key: value[0] for key, value in parse_qs(parts.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        with self.server.lock:
+            self.server.requests.append((method, parts.path[len(PREFIX) :]))
+            status, result, location = self.server.route(method, parts.path[len(PREFIX) :], query, body)
+        data = json.dumps(result).encode() if result is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if location:
+            self.send_header("Location", f"http://127.0.0.1:{self.server.server_address[1]}{PREFIX}{location}")
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubKeycloak(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubKeycloakHandler)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.ids = itertools.count(100)
+        self.realm_roles = {
+            name: {"id": f"r-{name}", "name": name} for name in ("default-roles-myrealm", "old", "developer")
+        }
+        self.clients = {"c1": {"id": "c1", "clientId": "app"}}
+        self.client_roles = {"c1": {name: {"id": f"c1-{name}", "name": name} for name in ("admin", "viewer")}}
+        self.groups = {}
+        self.users = {}
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/auth"
+
+    def add_group(self, path, **rep):
+        gid = f"g{next(self.ids)}"
+        self.groups[gid] = dict(
+            {
+                "id": gid,
+                "name": path.rsplit("/", 1)[1],
+                "path": path,
+                "attributes": {},
+                "realmRoles": [],
+                "clientRoles": {},
+            },
+            **rep,
+        )
+        return gid
+
+    def add_user(self, username, **rep):
+        uid = f"u{next(self.ids)}"
+        self.users[uid] = dict(
+            {"id": uid, "username": username, "enabled": True, "groups": set(), "roles": set()}, **rep
+        )
+        return uid
+
+    def group_id(self, path):
+        return next(gid for gid, group in self.groups.items() if group["path"] == path)
+
+    def user_by_name(self, username):
+        return next(user for user in self.users.values() if user["username"] == username)
+
+    def group_rep(self, group):
+        children = [g for g in self.groups.values() if g["path"].rsplit("/", 1)[0] == group["path"]]
+        return dict(group, subGroupCount=len(children))
+
+    def user_rep(self, user):
+        return {key: value for key, value in user.items() if key not in ("groups", "roles")}
+
+    def role_by_id(self, role_id):
+        for role in self.realm_roles.values():
+            if role["id"] == role_id:
+                return None, role
+        for cid, roles in self.client_roles.items():
+            for role in roles.values():
+                if role["id"] == role_id:
+                    return cid, role
+
+    @staticmethod
+    def page(entries, query):
+        first = int(query.get("first", 0))
+        return entries[first : first + int(query.get("max", len(entries)))]
+
+    def route(self, method, path, query, body):
+        m = re.fullmatch(r"/groups(?:/(\w+)(/children|/role-mappings/realm|/role-mappings/clients/(\w+))?)?", path)
+        if m:
+            return self.route_group(method, m.group(1), m.group(2), m.group(3), query, body)
+        m = re.fullmatch(r"/users(?:/(\w+)(?:/groups(?:/(\w+))?|/role-mappings(/realm|/clients/\w+)?)?)?", path)
+        if m:
+            return self.route_user(method, path, m.group(1), m.group(2), query, body)
+        if path == "/clients":
+            return 200, self.page(list(self.clients.values()), query), None
+        if path == "/roles":
+            return 200, self.page(list(self.realm_roles.values()), query), None
+        m = re.fullmatch(r"/clients/(\w+)/roles", path)
+        if m:
+            return 200, list(self.client_roles[m.group(1)].values()), None
+        return 404, None, None
+
+    def route_group(self, method, gid, sub, cid, query, body):
+        if method == "GET":
+            parent = self.groups[gid]["path"] if gid else ""
+            children = [self.group_rep(g) for g in self.groups.values() if g["path"].rsplit("/", 1)[0] == parent]
+            return 200, self.page(children, query), None
+        if method == "POST" and sub in (None, "/children"):
+            parent = self.groups[gid]["path"] if gid else ""
+            return 201, None, f"/groups/{self.add_group(parent + '/' + body['name'], attributes=body['attributes'])}"
+        group = self.groups[gid]
+        if sub is None:
+            if method == "PUT":
+                group["attributes"] = body["attributes"]
+            else:
+                for child in [k for k, g in self.groups.items() if g["path"].startswith(group["path"] + "/")]:
+                    del self.groups[child]
+                del self.groups[gid]
+            return 204, None, None
+        for role in body:
+            if cid is None:
+                names = group["realmRoles"]
+            else:
+                names = group["clientRoles"].setdefault(self.clients[cid]["clientId"], [])
+            if method == "POST":
+                names.append(role["name"])
+            else:
+                names.remove(role["name"])
+        return 204, None, None
+
+    def route_user(self, method, path, uid, gid, query, body):
+        if uid is None:
+            if method == "POST":
+                return 201, None, f"/users/{self.add_user(**body)}"
+            return 200, self.page([self.user_rep(user) for user in self.users.values()], query), None
+        user = self.users[uid]
+        if path.endswith("/groups"):
+            return 200, self.page([self.groups[g] for g in sorted(user["groups"])], query), None
+        if gid is not None:
+            if method == "PUT":
+                user["groups"].add(gid)
+            else:
+                user["groups"].discard(gid)
+            return 204, None, None
+        if "/role-mappings" in path:
+            if method == "GET":
+                realm = [role for cid, role in map(self.role_by_id, sorted(user["roles"])) if cid is None]
+                clients = {}
+                for cid, role in map(self.role_by_id, sorted(user["roles"])):
+                    if cid is not None:
+                        client = clients.setdefault(self.clients[cid]["clientId"], {"id": cid, "mappings": []})
+                        client["mappings"].append(role)
+                return 200, {"realmMappings": realm, "clientMappings": clients}, None
+            for role in body:
+                if method == "POST":
+                    user["roles"].add(role["id"])
+                else:
+                    user["roles"].discard(role["id"])
+            return 204, None, None
+        if method == "PUT":
+            user.update(body)
+        else:
+            del self.users[uid]
+        return 204, None, None
+
+
+class TestKeycloakBulk(ModuleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.module = keycloak_bulk
+        self.server = StubKeycloak()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        a = self.server.add_group("/a", attributes={"team": ["a"]})
+        self.server.add_group("/old")
+        alice = self.server.add_user("alice", email="alice@example.org")
+        self.server.users[alice]["groups"].add(a)
+        self.server.users[alice]["roles"].update({"r-default-roles-myrealm", "r-old", "c1-viewer"})
+        self.server.add_user("carol")
+        self.server.add_user("service-account-app", serviceAccountClientId="app")
+
+        self.module_args = {
+            "auth_keycloak_url": self.server.url,
+            "token": "{{ access_token }}",
+            "realm": "myrealm",
+            "groups": [
+                {
+                    "path": "/a/b",
+                    "attributes": {"level": 2},
+                    "realm_roles": ["developer"],
+                    "client_roles": [{"client_id": "app", "roles": ["admin"]}],
+                },
+                {"path": "/old", "state": "absent"},
+            ],
+            "users": [
+                {
+                    "username": "alice",
+                    "email": "alice@example.com",
+                    "groups": ["/a/b"],
+                    "realm_roles": ["developer"],
+                    "client_roles": [{"client_id": "app", "roles": ["admin"]}],
+                },
+                {"username": "dave", "first_name": "Dave", "groups": ["/a/b"]},
+            ],
+            "purge_users": True,
+        }
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def run_module(self, **extra_args):
+        with set_module_args(dict(self.module_args, **extra_args)):
+            with self.assertRaises(AnsibleExitJson) as exec_info:
+                self.module.main()
+        return exec_info.exception.args[0]
+
+    def test_reconcile(self):
+        result = self.run_module(max_workers=3)
+
+        self.assertIs(result["changed"], True)
+        self.assertEqual(
+            result["changes"],
+            {
+                "groups_created": ["/a/b"],
+                "groups_updated": [],
+                "groups_deleted": ["/old"],
+                "users_created": ["dave"],
+                "users_updated": ["alice"],
+                "users_deleted": ["carol"],
+                "memberships_added": ["alice: /a/b", "dave: /a/b"],
+                "memberships_removed": ["alice: /a"],
+                "role_mappings_added": [
+                    "group /a/b: realm role developer",
+                    "group /a/b: client app role admin",
+                    "user alice: realm role developer",
+                    "user alice: client app role admin",
+                ],
+                "role_mappings_removed": ["user alice: realm role old", "user alice: client app role viewer"],
+            },
+        )
+        self.assertEqual(result["summary"]["role_mappings_added"], 4)
+
+        server = self.server
+        b = server.group_id("/a/b")
+        self.assertEqual(sorted(g["path"] for g in server.groups.values()), ["/a", "/a/b"])
+        self.assertEqual(server.groups[b]["attributes"], {"level": ["2"]})
+        self.assertEqual(server.groups[b]["realmRoles"], ["developer"])
+        self.assertEqual(server.groups[b]["clientRoles"], {"app": ["admin"]})
+        self.assertEqual(sorted(u["username"] for u in server.users.values()), ["alice", "dave", "service-account-app"])
+        alice = server.user_by_name("alice")
+        self.assertEqual(alice["email"], "alice@example.com")
+        self.assertEqual(alice["groups"], {b})
+        self.assertEqual(alice["roles"], {"r-default-roles-myrealm", "r-developer", "c1-admin"})
+        dave = server.user_by_name("dave")
+        self.assertEqual((dave["firstName"], dave["enabled"], dave["groups"]), ("Dave", True, {b}))
+
+        # A second run finds nothing to do, and only reads
+        del server.requests[:]
+        result = self.run_module()
+        self.assertIs(result["changed"], False)
+        self.assertEqual(set(method for method, path in server.requests), {"GET"})
+
+    def test_check_mode(self):
+        result = self.run_module(_ansible_check_mode=True)
+
+        self.assertIs(result["changed"], True)
+        self.assertEqual(result["summary"]["users_deleted"], 1)
+        self.assertEqual(set(method for method, path in self.server.requests), {"GET"})
+        self.assertEqual(sorted(g["path"] for g in self.server.groups.values()), ["/a", "/old"])
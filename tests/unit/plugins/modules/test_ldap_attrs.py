@@ -0,0 +1,175 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import re
+from unittest.mock import MagicMock
+
+import pytest
+
+ldap = pytest.importorskip("ldap")
+
+from ansible_collections.community.general.plugins.module_utils.ldap import LdapGeneric
+from ansible_collections.community.general.plugins.modules import ldap_attrs
+
+DN = "cn=john,dc=example,dc=com"
+
+SCHEMA = {
+    "attributeTypes": [
+        b"( 2.5.4.41 NAME 'name' EQUALITY caseIgnoreMatch SYNTAX 1.3.6.1.4.1.1466.115.121.1.15{32768} )",
+        b"( 2.5.4.3 NAME ( 'cn' 'commonName' ) SUP name )",
+        b"( 2.5.4.49 NAME 'distinguishedName' EQUALITY distinguishedNameMatch SYNTAX 1.3.6.1.4.1.1466.115.121.1.12 )",
+        b"( 2.5.4.31 NAME 'member' SUP distinguishedName )",
+        b"( 2.5.4.35 NAME 'userPassword' EQUALITY octetStringMatch SYNTAX 1.3.6.1.4.1.1466.115.121.1.40 )",
+        b"( 2.5.4.24 NAME 'x121Address' EQUALITY numericStringMatch SYNTAX 1.3.6.1.4.1.1466.115.121.1.36{15} )",
+        b"( 2.5.4.20 NAME 'telephoneNumber' EQUALITY telephoneNumberMatch SYNTAX 1.3.6.1.4.1.1466.115.121.1.50{32} )",
+        b"( 0.9.2342.19200300.100.1.3 NAME ( 'mail' 'rfc822Mailbox' ) EQUALITY caseIgnoreIA5Match "
+        b"SYNTAX 1.3.6.1.4.1.1466.115.121.1.26{256} )",
+        b"( 1.3.6.1.1.1.1.0 NAME 'uidNumber' EQUALITY integerMatch SYNTAX 1.3.6.1.4.1.1466.115.121.1.27 SINGLE-VALUE )",
+        b"( 1.3.6.1.1.1.1.3 NAME 'homeDirectory' EQUALITY caseExactIA5Match "
+        b"SYNTAX 1.3.6.1.4.1.1466.115.121.1.26 SINGLE-VALUE )",
+        b"( 1.3.6.1.4.1.99999.1 NAME 'testBoolean' EQUALITY booleanMatch SYNTAX 1.3.6.1.4.1.1466.115.121.1.7 )",
+        b"( 1.3.6.1.4.1.99999.2 NAME 'testExact' EQUALITY caseExactMatch SYNTAX 1.3.6.1.4.1.1466.115.121.1.15 )",
+        b"( 1.3.6.1.4.1.99999.3 NAME 'testOrdered' SUP name X-ORDERED 'VALUES' )",
+        b"( 1.3.6.1.4.1.99999.4 NAME 'testUUID' EQUALITY uuidMatch SYNTAX 1.3.6.1.1.16.1 )",
+    ]
+}
+
+
+class FakeConnection:
+    """Answers the searches of the module from a single entry, and compares values on the "server" exactly."""
+
+    def __init__(self, entry, schema):
+        self.entry = entry
+        self.schema = schema
+        self.filters = []
+
+    def search_subschemasubentry_s(self, dn):
+        return "cn=Subschema" if self.schema is not None else None
+
+    def read_subschemasubentry_s(self, dn):
+        return self.schema
+
+    def search_s(self, dn, scope, filterstr=None, attrlist=None):
+        if filterstr is None:
+            # like many servers, return the attributes under their schema name
+            return [(dn, dict(self.entry))]
+        self.filters.append(filterstr)
+        name, value = filterstr[1:-1].split("=", 1)
+        values = {re.sub(r"^\{\d+\}", "", v.decode()) for v in self.entry.get(name, [])}
+        return [(dn, {})] if re.sub(r"^\{\d+\}", "", value) in values else []
+
+
+@pytest.fixture
+def make_attrs(mocker):
+    def make_attrs(attributes, entry, state="present", schema=SCHEMA):
+        connection = FakeConnection(entry, schema)
+        mocker.patch.object(LdapGeneric, "_connect_to_ldap", return_value=connection)
+        module = MagicMock()
+        module.params = dict(
+            bind_dn=None,
+            bind_pw="",
+            ca_path=None,
+            referrals_chasing="anonymous",
+            server_uri="ldapi:///",
+            start_tls=False,
+            validate_certs=True,
+            sasl_class="external",
+            xorder_discovery="disable",
+            client_cert=None,
+            client_key=None,
+            dn=DN,
+            attributes=attributes,
+            state=state,
+            ordered=False,
+        )
+        return ldap_attrs.LdapAttrs(module), connection
+
+    return make_attrs
+
+
+MATCHING_RULE_CASES = [
+    ("booleanMatch", "testBoolean", [b"TRUE"], "true", True),
+    ("caseExactIA5Match", "homeDirectory", [b"/home/john"], "/home/john", True),
+    ("caseExactIA5Match", "homeDirectory", [b"/home/john"], "/home/John", False),
+    ("caseExactMatch", "testExact", [b"Foo  Bar"], "Foo Bar", True),
+    ("caseExactMatch", "testExact", [b"Foo Bar"], "foo bar", False),
+    ("caseIgnoreIA5Match", "mail", [b"John@Example.com"], "john@example.COM", True),
+    ("caseIgnoreMatch", "cn", [b"John Doe"], " john   DOE", True),
+    ("caseIgnoreMatch", "cn", [b"John Doe"], "Jane Doe", False),
+    ("distinguishedNameMatch", "member", [b"cn=A,dc=example,dc=com"], "CN=a,DC=Example,dc=com", True),
+    ("distinguishedNameMatch", "member", [b"cn=A,dc=example,dc=com"], "cn=b,dc=example,dc=com", False),
+    ("integerMatch", "uidNumber", [b"1000"], "01000", True),
+    ("integerMatch", "uidNumber", [b"1000"], "1001", False),
+    ("numericStringMatch", "x121Address", [b"123 456"], "123456", True),
+    ("octetStringMatch", "userPassword", [b"secret"], "secret", True),
+    ("octetStringMatch", "userPassword", [b"secret"], "Secret", False),
+    ("telephoneNumberMatch", "telephoneNumber", [b"+1 555-0100"], "+1 555 0100", True),
+]
+
+
+def test_matching_rule_cases_cover_all_rules():
+    assert {case[0] for case in MATCHING_RULE_CASES} == set(ldap_attrs.MATCHING_RULES)
+
+
+@pytest.mark.parametrize("rule, name, current, value, present", MATCHING_RULE_CASES)
+def test_matching_rules(make_attrs, rule, name, current, value, present):
+    attrs, connection = make_attrs({name: value}, {name: current})
+
+    modlist, old_attrs, new_attrs = attrs.add()
+
+    assert modlist == ([] if present else [(ldap.MOD_ADD, name, value.encode())])
+    # the values are compared in memory, without a search per value
+    assert connection.filters == []
+
+
+def test_absent(make_attrs):
+    attrs, connection = make_attrs({"mail": ["JOHN@example.com", "other@example.com"]}, {"mail": [b"john@example.com"]})
+
+    modlist, old_attrs, new_attrs = attrs.delete()
+
+    assert modlist == [(ldap.MOD_DELETE, "mail", b"JOHN@example.com")]
+    assert connection.filters == []
+
+
+@pytest.mark.parametrize("name", ["commonName", "CN", "2.5.4.3"])
+def test_attribute_returned_under_other_name(make_attrs, name):
+    attrs, connection = make_attrs({name: "john doe"}, {"cn": [b"John Doe"]})
+
+    modlist, old_attrs, new_attrs = attrs.add()
+
+    assert modlist == []
+    assert connection.filters == []
+
+
+def test_x_ordered_is_not_inherited_from_superior(make_attrs):
+    # testOrdered inherits caseIgnoreMatch from name, but its values carry an index
+    attrs, connection = make_attrs({"testOrdered": ["first", "Second"]}, {"testOrdered": [b"{0}first"]})
+
+    modlist, old_attrs, new_attrs = attrs.add()
+
+    assert attrs._matching_key("testOrdered") is None
+    assert attrs._matching_key("name") is not None
+    assert modlist == [(ldap.MOD_ADD, "testOrdered", b"Second")]
+    assert connection.filters == ["(testOrdered=first)", "(testOrdered=Second)"]
+
+
+def test_unknown_matching_rule_is_evaluated_on_server(make_attrs):
+    uuid = "597ae2f6-16a6-1027-98f4-d28b5365dc14"
+    attrs, connection = make_attrs({"testUUID": uuid}, {"testUUID": [uuid.encode()]})
+
+    modlist, old_attrs, new_attrs = attrs.add()
+
+    assert modlist == []
+    assert connection.filters == [f"(testUUID={uuid})"]
+
+
+def test_without_schema(make_attrs):
+    attrs, connection = make_attrs({"cn": "John Doe"}, {"cn": [b"John Doe"]}, schema=None)
+
+    modlist, old_attrs, new_attrs = attrs.add()
+
+    assert modlist == []
+    assert connection.filters == ["(cn=John Doe)"]
@@ -0,0 +1,152 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ansible_collections.community.general.plugins.plugin_utils.event_sender import BatchingEventSender
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers), body))
+            status = server.statuses.pop(0) if server.statuses else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class CollectorServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), CollectorHandler)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.statuses = []
+        self.connections = 0
+
+    def get_request(self):
+        self.connections += 1
+        return super().get_request()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/services/collector/event"
+
+
+@pytest.fixture
+def collector(monkeypatch):
+    monkeypatch.delenv("http_proxy", raising=False)
+    monkeypatch.delenv("HTTP_PROXY", raising=False)
+    server = CollectorServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def join_events(events, group):
+    return b"\n".join(events), {"Content-Type": "application/json", "X-Group": str(group)}
+
+
+def test_batches_and_keep_alive(collector):
+    sender = BatchingEventSender(collector.url, join_events, max_batch_size=10, flush_interval=60)
+    for i in range(25):
+        sender.send(b'{"event": %d}' % i)
+    sender.close()
+
+    bodies = [body for path, headers, body in collector.requests]
+    assert [len(body.split(b"\n")) for body in bodies] == [10, 10, 5]
+    assert b"\n".join(bodies) == b"\n".join(b'{"event": %d}' % i for i in range(25))
+    assert collector.requests[0][0] == "/services/collector/event"
+    assert collector.connections == 1
+    assert sender.sent_events == 25
+
+
+def test_groups(collector):
+    sender = BatchingEventSender(collector.url, join_events, flush_interval=60)
+    sender.send(b"a1", "a")
+    sender.send(b"b1", "b")
+    sender.send(b"a2", "a")
+    assert sender.flush(timeout=10)
+
+    assert sorted((headers["X-Group"], body) for path, headers, body in collector.requests) == [
+        ("a", b"a1\na2"),
+        ("b", b"b1"),
+    ]
+    sender.close()
+
+
+def test_flush_interval(collector):
+    sender = BatchingEventSender(collector.url, join_events, flush_interval=0.05)
+    sender.send(b"event")
+    for dummy in range(100):
+        if collector.requests:
+            break
+        threading.Event().wait(0.05)
+
+    assert [body for path, headers, body in collector.requests] == [b"event"]
+    sender.close()
+
+
+def test_retry(collector):
+    collector.statuses = [503, 503]
+    sender = BatchingEventSender(collector.url, join_events, retries=3, backoff=0.01)
+    sender.send(b"event")
+    sender.close()
+
+    assert len(collector.requests) == 3
+    assert sender.sent_events == 1
+    assert sender.failed_events == 0
+
+
+def test_give_up(collector, mocker):
+    warning = mocker.patch("ansible_collections.community.general.plugins.plugin_utils.event_sender.display.warning")
+    collector.statuses = [400]
+    sender = BatchingEventSender(collector.url, join_events, retries=3, backoff=0.01)
+    sender.send(b"event")
+    sender.close()
+
+    assert len(collector.requests) == 1
+    assert sender.failed_events == 1
+    assert "HTTP Error 400" in warning.call_args[0][0]
+
+
+def test_drop_when_queue_full(collector, mocker):
+    warning = mocker.patch("ansible_collections.community.general.plugins.plugin_utils.event_sender.display.warning")
+    delivering = threading.Event()
+    release = threading.Event()
+
+    def slow_request(events, group):
+        delivering.set()
+        release.wait(10)
+        return join_events(events, group)
+
+    sender = BatchingEventSender(collector.url, slow_request, max_batch_size=1, max_queue_size=2)
+    sender.send(b"e1")
+    assert delivering.wait(10)
+    for event in (b"e2", b"e3", b"e4"):
+        sender.send(event)
+    assert sender.dropped_events == 1
+
+    release.set()
+    sender.close()
+
+    assert [body for path, headers, body in collector.requests] == [b"e1", b"e2", b"e3"]
+    assert sender.sent_events == 3
+    assert "Could not send 1 event(s)" in warning.call_args[0][0]
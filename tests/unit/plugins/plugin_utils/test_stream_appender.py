@@ -0,0 +1,132 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import socket
+import socketserver
+import threading
+
+import pytest
+
+from ansible_collections.community.general.plugins.plugin_utils.stream_appender import BufferedStreamAppender
+
+
+class LineHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            with self.server.lock:
+                self.server.lines.append(line)
+
+
+class LineServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), LineHandler)
+        self.lock = threading.Lock()
+        self.lines = []
+        self.connections = 0
+
+    def get_request(self):
+        self.connections += 1
+        return super().get_request()
+
+    def connect(self):
+        return socket.create_connection(self.server_address, timeout=5)
+
+    def wait_for_lines(self, count):
+        for dummy in range(200):
+            with self.lock:
+                if len(self.lines) >= count:
+                    return list(self.lines)
+            threading.Event().wait(0.01)
+        return list(self.lines)
+
+
+@pytest.fixture
+def line_server():
+    server = LineServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_persistent_connection(line_server):
+    appender = BufferedStreamAppender(line_server.connect)
+    for i in range(100):
+        appender.put(b"record %d\n" % i)
+    appender.close()
+
+    assert line_server.wait_for_lines(100) == [b"record %d\n" % i for i in range(100)]
+    assert line_server.connections == 1
+    assert appender.sent_records == 100
+    assert appender.dropped_records == 0
+
+
+def test_drop_oldest_when_full():
+    connected = threading.Event()
+    release = threading.Event()
+    sent = []
+
+    class SlowSocket:
+        def sendall(self, data):
+            release.wait(5)
+            sent.append(data)
+
+        def close(self):
+            pass
+
+    def connect():
+        connected.set()
+        return SlowSocket()
+
+    appender = BufferedStreamAppender(connect, max_records=3)
+    appender.put(b"0\n")
+    assert connected.wait(5)
+    # the writer is now stuck on the first record
+    for i in range(1, 7):
+        appender.put(b"%d\n" % i)
+    release.set()
+    appender.close()
+
+    assert appender.dropped_records == 3
+    assert b"".join(sent) == b"0\n4\n5\n6\n"
+
+
+def test_reconnect(line_server):
+    attempts = []
+
+    def connect():
+        attempts.append(None)
+        if len(attempts) < 3:
+            raise ConnectionRefusedError("connection refused")
+        return line_server.connect()
+
+    appender = BufferedStreamAppender(connect, min_delay=0.01)
+    appender.put(b"a\n")
+    appender.put(b"b\n")
+    assert appender.flush(timeout=5)
+    appender.close()
+
+    assert line_server.wait_for_lines(2) == [b"a\n", b"b\n"]
+    assert appender.reconnects == 2
+    assert appender.last_error == "connection refused"
+
+
+def test_close_gives_up():
+    def connect():
+        raise ConnectionRefusedError("connection refused")
+
+    appender = BufferedStreamAppender(connect, min_delay=0.01, max_delay=0.01)
+    appender.put(b"a\n")
+    appender.close(timeout=0.1)
+
+    assert appender.sent_records == 0
+    assert appender.dropped_records == 1
+    with pytest.raises(ValueError):
+        appender.put(b"b\n")